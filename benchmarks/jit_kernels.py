@@ -0,0 +1,113 @@
+"""
+JIT Kernels Benchmark
+
+Compares the NumPy and Numba-compiled kernels applying small gates to large
+states of qudits of dimensions 3, 5, and 7
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import time
+
+import numpy as np
+
+from src.instruction.controlled import Controlled
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.gate import Gate
+from src.instruction.monomial_gate import MonomialGate
+from src.simulator.jit_kernels import JitKernels
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+def random_unitary(size: int, rng: np.random.Generator):
+    """
+    Creates a random unitary matrix from the QR decomposition of a complex
+    Gaussian matrix
+
+    :param size: The number of rows
+    :type size: int
+    :param rng: The random number generator
+    :type rng: np.random.Generator
+    :return: The unitary matrix
+    :rtype: np.ndarray
+    """
+    q, r = np.linalg.qr(rng.normal(size=(size, size))
+                        + 1j * rng.normal(size=(size, size)))
+    return q * (np.diagonal(r) / np.abs(np.diagonal(r)))
+
+
+def gates(dim: int, num_qudits: int, rng: np.random.Generator):
+    """
+    Creates one gate of each kind the JIT kernels apply, on qudits in the
+    middle of the register
+
+    :param dim: The dimension of the qudits
+    :type dim: int
+    :param num_qudits: The number of qudits
+    :type num_qudits: int
+    :param rng: The random number generator
+    :type rng: np.random.Generator
+    :return: The gates by name
+    :rtype: dict[str, Instruction]
+    """
+    a, b = num_qudits // 2 - 1, num_qudits // 2 + 1
+    return {
+        "dense 1q": Gate("U", random_unitary(dim, rng), 1, dim, [a]),
+        "dense 2q": Gate("V", random_unitary(dim ** 2, rng), 2, dim, [a, b]),
+        "diagonal 2q": DiagonalGate("D", np.exp(2j * np.pi * rng.random(
+            dim ** 2)), 2, dim, [a, b]),
+        "monomial 1q": MonomialGate.X("+1", dim, [a]),
+        "controlled": Controlled(random_unitary(dim, rng), [(a, 1)], [b],
+                                 dim=dim),
+    }
+
+
+def seconds(gate: object, state: np.ndarray, repeats: int):
+    """
+    Times applying a gate to a state
+
+    :param gate: The gate
+    :type gate: Instruction
+    :param state: The state tensor, which may be updated in place
+    :type state: np.ndarray
+    :param repeats: The number of times the gate is applied
+    :type repeats: int
+    :return: The mean number of seconds per application
+    :rtype: float
+    """
+    gate.apply(state, gate.qudits, inplace=True)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        state = gate.apply(state, gate.qudits, inplace=True)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    """Prints the time per gate of the NumPy and JIT kernels"""
+    if not JitKernels.available:
+        print("Numba is not installed, so only the NumPy kernels are timed")
+    rng = np.random.default_rng(0)
+    print("%-4s %-8s %-12s %10s %10s %8s"
+          % ("dim", "states", "gate", "numpy ms", "jit ms", "speedup"))
+    for dim, num_qudits in ((3, 13), (5, 9), (7, 7)):
+        state = rng.normal(size=(dim,) * num_qudits) \
+            + 1j * rng.normal(size=(dim,) * num_qudits)
+        for name, gate in gates(dim, num_qudits, rng).items():
+            JitKernels.enabled = False
+            numpy_seconds = seconds(gate, state.copy(), 5)
+            JitKernels.enabled = JitKernels.available
+            jit_seconds = seconds(gate, state.copy(), 5) \
+                if JitKernels.available else np.nan
+            print("%-4s %-8s %-12s %10.2f %10.2f %7.1fx"
+                  % (dim, state.size, name, 1e3 * numpy_seconds,
+                     1e3 * jit_seconds, numpy_seconds / jit_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Phase Gadget Reduction Benchmark
+
+Tracks the gate count, T-count, and depth reductions of the peephole and
+phase gadget optimizers on the repo's constructions
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import time
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+from src.instruction import Instruction
+from src.instruction.circuit import Circuit
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.gate import Gate
+from src.instruction.monomial_gate import MonomialGate
+from src.optimizer.peephole import PeepholeOptimizer
+from src.optimizer.phase_gadget import PhaseGadgetOptimizer
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+def r_construction():
+    """
+    Builds the R = diag(1,1,-1) gate tensor the identity in qutrit
+    Clifford+T as a nested circuit, following
+    qutrit_R_from_T/R_construction.py
+
+    :return: The named subcircuits of the construction, ending with R ⊗ I
+    :rtype: dict[str, Instruction]
+    """
+    def x(q):
+        return MonomialGate.X("+1", 3, [q])
+
+    def xdag(q):
+        return MonomialGate.X("+1", 3, [q]).inverse()
+
+    def h(q):
+        return Gate("H", QCM.H_gate(), 1, 3, [q])
+
+    def hdag(q):
+        return h(q).inverse()
+
+    def tau(gate, q):
+        return MonomialGate.X(gate, 3, [q])
+
+    def t(q):
+        return DiagonalGate.T([q])
+
+    def s(q):
+        return DiagonalGate.S([q])
+
+    def zww(q):
+        return DiagonalGate("zww", [1, np.exp(2j * np.pi / 3),
+                                    np.exp(2j * np.pi / 3)], 1, 3, [q])
+
+    cx = MonomialGate.CX([0, 1])
+    swap = MonomialGate.swap(3, [0, 1])
+    c = dict()
+    c["p9"] = Instruction("p9", [x(0), t(0), xdag(0)], 1, qudits=[1])
+    c["qubitCqutritZe"] = Instruction(
+        "qubitCqutritZe", [cx, c["p9"], cx, c["p9"], cx, c["p9"]], 2)
+    c["tcx"] = Instruction("tcx", [xdag(0), hdag(1), xdag(1),
+                                   c["qubitCqutritZe"], x(0), x(1), h(1)], 2)
+    c["ocx"] = Instruction("ocx", [xdag(0), c["tcx"], x(0)], 2)
+    c["socxs"] = Instruction("socxs", [swap, c["ocx"], swap], 2)
+    c["tau02_20"] = Instruction("tau02_20", [
+        swap, c["socxs"], c["ocx"], c["socxs"], c["ocx"], c["socxs"]], 2)
+    c["map21_22to02_20"] = Instruction("map21_22to02_20", [
+        swap, cx.inverse(), swap, tau("01", 1)], 2)
+    c["tctau1_2"] = Instruction("tctau1_2", [
+        c["map21_22to02_20"].inverse(), c["tau02_20"],
+        c["map21_22to02_20"]], 2)
+    c["tcsdagphase"] = Instruction("tcsdagphase", [
+        tau("01", 1), t(1), tau("01", 1), c["tcx"].inverse(),
+        tau("01", 1), t(1).inverse(), tau("01", 1), c["tcx"]], 2)
+    c["tczwwphase"] = Instruction("tczwwphase", [
+        tau("02", 1), c["tcsdagphase"], tau("02", 1)], 2)
+    c["tcmtau1_2"] = Instruction("tcmtau1_2", [
+        s(0).inverse(), zww(1), hdag(1), c["tczwwphase"], h(1), zww(1),
+        c["tczwwphase"], hdag(1), c["tczwwphase"], h(1), zww(1)], 2)
+    c["rtensorid"] = Circuit("rtensorid", [c["tcmtau1_2"], c["tctau1_2"]], 2)
+    return c
+
+
+def equivalent(circuit: Instruction, other: Instruction):
+    """
+    Checks if two circuits have the same matrix
+
+    :param circuit: A circuit
+    :type circuit: Instruction
+    :param other: Another circuit
+    :type other: Instruction
+    :return: If the circuits have the same matrix
+    :rtype: bool
+    """
+    return np.allclose(Misc.to_dense(circuit.to_matrix()),
+                       Misc.to_dense(other.to_matrix()))
+
+
+def main():
+    """Prints the reductions of each optimizer on each construction"""
+    constructions = r_construction()
+    assert np.allclose(Misc.to_dense(constructions["rtensorid"].to_matrix()),
+                       np.kron(np.diag([1, 1, -1]), np.identity(3)))
+    print("%-16s %-9s %7s %7s %7s %7s %7s %7s %8s %s"
+          % ("circuit", "optimizer", "gates", "->", "T", "->", "depth", "->",
+             "seconds", "equivalent"))
+    for name in ("tcx", "tcsdagphase", "tctau1_2", "tcmtau1_2", "rtensorid"):
+        circuit = constructions[name]
+        circuit = Circuit(name, [circuit], circuit.num_qudits)
+        for label, optimizer in (("peephole", PeepholeOptimizer()),
+                                 ("gadget", PhaseGadgetOptimizer())):
+            start = time.perf_counter()
+            optimized, report = optimizer.optimize(circuit)
+            seconds = time.perf_counter() - start
+            depth_before = report.get("depth_before", PeepholeOptimizer.depth(
+                circuit.flatten()))
+            depth_after = report.get("depth_after", PeepholeOptimizer.depth(
+                optimized.instructions))
+            print("%-16s %-9s %7s %7s %7s %7s %7s %7s %8.3f %s"
+                  % (name, label, report["gate_count_before"],
+                     report["gate_count_after"], report["t_count_before"],
+                     report["t_count_after"], depth_before, depth_after,
+                     seconds, equivalent(circuit, optimized)))
+
+
+if __name__ == "__main__":
+    main()
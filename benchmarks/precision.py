@@ -0,0 +1,120 @@
+"""
+Precision Benchmark
+
+Compares the memory and time of simulating random circuits on complex128
+and complex64 states of qudits of dimensions 3, 5, and 7
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import time
+
+import numpy as np
+
+from src.Precision import Precision
+from src.instruction.circuit import Circuit
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.gate import Gate
+from src.instruction.monomial_gate import MonomialGate
+from src.simulator.statevector import StateVectorSimulator
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+def random_unitary(size: int, rng: np.random.Generator):
+    """
+    Creates a random unitary matrix from the QR decomposition of a complex
+    Gaussian matrix
+
+    :param size: The number of rows
+    :type size: int
+    :param rng: The random number generator
+    :type rng: np.random.Generator
+    :return: The unitary matrix
+    :rtype: np.ndarray
+    """
+    q, r = np.linalg.qr(rng.normal(size=(size, size))
+                        + 1j * rng.normal(size=(size, size)))
+    return q * (np.diagonal(r) / np.abs(np.diagonal(r)))
+
+
+def random_circuit(dim: int, num_qudits: int, num_gates: int,
+                   rng: np.random.Generator):
+    """
+    Creates a circuit of random dense, diagonal, and monomial gates on one
+    or two qudits
+
+    :param dim: The dimension of the qudits
+    :type dim: int
+    :param num_qudits: The number of qudits
+    :type num_qudits: int
+    :param num_gates: The number of gates
+    :type num_gates: int
+    :param rng: The random number generator
+    :type rng: np.random.Generator
+    :return: The circuit
+    :rtype: Circuit
+    """
+    gates = list()
+    for i in range(num_gates):
+        a, b = (int(q) for q in rng.choice(num_qudits, 2, replace=False))
+        if i % 3 == 0:
+            gates.append(Gate("U", random_unitary(dim ** 2, rng), 2, dim,
+                              [a, b]))
+        elif i % 3 == 1:
+            gates.append(DiagonalGate("D", np.exp(2j * np.pi * rng.random(
+                dim ** 2)), 2, dim, [a, b]))
+        else:
+            gates.append(MonomialGate.X("+1", dim, [a]))
+    return Circuit("random", gates, num_qudits, dim)
+
+
+def seconds(simulator: StateVectorSimulator, circuit: Circuit,
+            repeats: int):
+    """
+    Times simulating a circuit
+
+    :param simulator: The simulator
+    :type simulator: StateVectorSimulator
+    :param circuit: The circuit
+    :type circuit: Circuit
+    :param repeats: The number of simulations
+    :type repeats: int
+    :return: The mean number of seconds per simulation
+    :rtype: float
+    """
+    simulator.evolve(circuit)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        simulator.evolve(circuit)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    """Prints the state size and time per circuit of each precision"""
+    rng = np.random.default_rng(0)
+    print("%-4s %-8s %-10s %10s %10s %8s %9s"
+          % ("dim", "states", "dtype", "state MB", "ms", "speedup",
+             "casts/run"))
+    for dim, num_qudits in ((3, 14), (5, 9), (7, 7)):
+        circuit = random_circuit(dim, num_qudits, 30, rng)
+        baseline = None
+        for dtype in (np.complex128, np.complex64):
+            simulator = StateVectorSimulator(num_qudits, dim, dtype=dtype)
+            Precision.reset()
+            elapsed = seconds(simulator, circuit, 3)
+            baseline = elapsed if baseline is None else baseline
+            print("%-4s %-8s %-10s %10.1f %10.1f %7.1fx %9d"
+                  % (dim, simulator.register.size, np.dtype(dtype).name,
+                     simulator.initial_state().nbytes / 2 ** 20,
+                     1e3 * elapsed, baseline / elapsed,
+                     sum(Precision.casts.values()) // 4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Workspace Benchmark
+
+Measures the time, the peak of new allocations, and the workspace size of
+simulating random circuits once a simulator's workspace is warmed up
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.precision import random_circuit, seconds
+from src.simulator.statevector import StateVectorSimulator
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+def main():
+    """Prints the state size, time, and allocations of each simulation"""
+    rng = np.random.default_rng(0)
+    print("%-4s %-8s %10s %10s %12s %14s %12s"
+          % ("dim", "states", "state MB", "ms", "traced MB",
+             "workspace MB", "allocations"))
+    for dim, num_qudits in ((3, 13), (5, 8), (7, 7)):
+        circuit = random_circuit(dim, num_qudits, 30, rng)
+        simulator = StateVectorSimulator(num_qudits, dim)
+        elapsed = seconds(simulator, circuit, 3)
+        allocations = simulator.workspace.allocations
+        tracemalloc.start()
+        simulator.evolve(circuit)
+        traced = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("%-4s %-8s %10.1f %10.1f %12.1f %14.1f %12d"
+              % (dim, simulator.register.size,
+                 simulator.initial_state().nbytes / 2 ** 20, 1e3 * elapsed,
+                 traced / 2 ** 20, simulator.workspace.peak_bytes / 2 ** 20,
+                 simulator.workspace.allocations - allocations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+## Verification of the gate, instruction, and simulator implementations
+# against their dense matrices from to_matrix
+
+# Python code created and maintained by Alex Lim (https://github.com/AlexLim-Pro)
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.Precision import Precision
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+from src.instruction import Instruction
+from src.instruction.circuit import Circuit
+from src.instruction.controlled import Controlled
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.fourier_gate import FourierGate
+from src.instruction.gate import Gate
+from src.instruction.monomial_gate import MonomialGate
+from src.simulator.channels import KrausChannel
+from src.simulator.density import DensityMatrixSimulator
+from src.simulator.jit_kernels import JitKernels
+from src.simulator.kernels import StateVectorKernels
+from src.simulator.sharded import ShardedStateVectorSimulator
+from src.simulator.statevector import StateVectorSimulator
+from src.simulator.trajectory import TrajectorySimulator
+
+rng = np.random.default_rng(0)
+w = np.exp(2 * np.pi * 1j / 3)  # 3rd root of unity
+
+## kets of every dtype a user may pass to apply: int, real, and complex
+kets = [np.array([0, 1, 0]),
+        np.array([1., 0, 0]),
+        rng.normal(size=3),
+        rng.normal(size=3) + 1j * rng.normal(size=3),
+        (rng.normal(size=3) + 1j * rng.normal(size=3)).astype(np.complex64)]
+x = np.array([[0, 0, 1],
+              [1, 0, 0],
+              [0, 1, 0]])  # X, i.e. tau(0 1 2)
+gates = [DiagonalGate.Z(3), DiagonalGate.T(), Gate("H", QCM.H_gate(3), 1),
+         MonomialGate.X("+1"), MonomialGate("xz", [2, 0, 1], [1, w, w ** 2]),
+         FourierGate.H(3), FourierGate.H_dagger(3), FourierGate("H^2", [2], 1)]
+
+## H† is the conjugate transpose of H and its cube, for qudits of any
+#  dimension, and X(a,b) = H Z(a,b) H† has the eigenvectors H|k⟩
+for dim in (2, 3, 5):
+    H = QCM.H_gate(dim)
+    assert(np.allclose(QCM.H_dagger_gate(dim), H.conj().T))
+    assert(np.allclose(QCM.H_dagger_gate(dim), np.linalg.matrix_power(H, 3)))
+    assert(np.allclose(np.dot(H, QCM.H_dagger_gate(dim)), np.identity(dim)))
+H = QCM.H_gate(3)
+for a, b in ((0, 0), (1, 2), (2, 1), (0, 1), (0.5, 1.5)):
+    X_phase = QCM.X_phase_gate(a, b)
+    assert(np.allclose(np.dot(X_phase, H), np.dot(H, QCM.Z_phase_gate(a, b))))
+    assert(np.allclose(np.dot(X_phase, X_phase.conj().T), np.identity(3)))
+assert(np.allclose(QCM.X_phase_gate(1, 2), x.T))  # H Z H† = X†
+assert(np.allclose(QCM.X_phase_gate(2, 1), x))
+
+## powers of Fourier gates equal the powers of H, and layers of them equal
+#  the Kronecker products of the powers of H
+for dim in (2, 3, 5):
+    H = QCM.H_gate(dim)
+    for k in range(-4, 6):
+        assert(np.allclose(FourierGate.H(dim).power(k).to_matrix(),
+                           np.linalg.matrix_power(H, k)))
+    assert(np.allclose(FourierGate.H_dagger(dim).to_matrix(),
+                       QCM.H_dagger_gate(dim)))
+    H_squared = np.linalg.matrix_power(H, 2)
+    assert(np.allclose(FourierGate.layer(range(2), 2, dim).to_matrix(),
+                       np.kron(H_squared, H_squared)))
+    assert(np.allclose(FourierGate("F", [1, 3], 2, dim).to_matrix(),
+                       np.kron(H, QCM.H_dagger_gate(dim))))
+
+## gates applied to kets equal their matrices times the kets, with or
+#  without the JIT kernels, complex gates upcast real and int kets, and
+#  the kets are only updated in place when asked to
+for enabled in (False, JitKernels.available):
+    JitKernels.enabled = enabled
+    for gate in gates:
+        for ket in kets:
+            original = ket.copy()
+            expected = np.dot(gate.to_matrix(), ket)
+            result = gate.apply(ket)
+            assert(result.shape == ket.shape)
+            assert(np.allclose(result, expected, atol=1e-5))
+            assert(np.array_equal(ket, original))
+            if np.iscomplexobj(ket):
+                result = gate.apply(ket.copy(), inplace=True)
+                assert(np.allclose(result, expected, atol=1e-5))
+assert(np.allclose(DiagonalGate.Z(3).apply(np.ones(3)), [1, w, w ** 2]))
+JitKernels.enabled = JitKernels.available
+
+## controlled instructions applied to real and complex two-qutrit states
+#  equal their matrices times the states, without changing the states
+controlled = [Controlled(QCM.H_gate(3), [(0, 1)], [1]),
+              Controlled(DiagonalGate.T(), [(1, 2)], [0]),
+              Controlled(MonomialGate.X("+1"), [(0, 0)], [1])]
+for enabled in (False, JitKernels.available):
+    JitKernels.enabled = enabled
+    for gate in controlled:
+        for state in (rng.normal(size=(3, 3)),
+                      rng.normal(size=(3, 3)) + 1j * rng.normal(size=(3, 3))):
+            original = state.copy()
+            expected = np.dot(gate.to_matrix(), state.reshape(-1))
+            result = gate.apply(state)
+            assert(np.allclose(result.reshape(-1), expected))
+            assert(np.array_equal(state, original))
+            result = gate.apply(state.copy(), inplace=True)
+            assert(np.allclose(result.reshape(-1), expected))
+JitKernels.enabled = JitKernels.available
+
+## powers of gates and circuits equal the powers of their matrices, the
+#  power 0 is the identity, the names carry the reduced power, and powers
+#  which are not integers are rejected
+circuit = Circuit("c", [Gate("H", QCM.H_gate(3), 1, 3, [0]),
+                        DiagonalGate.T([1]), MonomialGate.CX([0, 1])], 2, 3)
+for instruction in gates + [circuit]:
+    matrix = instruction.to_matrix()
+    for k in range(-2, 7):
+        power = instruction.power(k)
+        expected = np.linalg.matrix_power(matrix, k)
+        assert(np.allclose(power.to_matrix(), expected))
+assert(MonomialGate.X("+1").power(2).name == "X+1^2")
+assert(MonomialGate.X("+1").power(3).name == "X+1^0")
+assert(circuit.power(0).name == "c^0")
+for instruction in (circuit, Gate("H", QCM.H_gate(3), 1, 3),
+                    FourierGate.H(3), DiagonalGate.T([0]),
+                    MonomialGate.X("+1")):
+    try:
+        instruction.power(0.5)
+        assert(False)
+    except TypeError:
+        pass
+
+## controlled instructions equal the controlled matrices without adding
+#  gates, and only Clifford pairs which cancel are left uncontrolled
+hadamard = Gate("H", QCM.H_gate(3), 1, 3, [0])
+for instructions in ([hadamard, DiagonalGate.T([0]), hadamard.inverse()],
+                     [hadamard, DiagonalGate.T([1]), MonomialGate.CX([0, 1])],
+                     [hadamard, MonomialGate.CX([0, 1]), hadamard.inverse()]):
+    circuit = Circuit("c", instructions, 2, 3)
+    for control_value in range(3):
+        controlled = circuit.controlled(control_value)
+        projector = np.zeros((3, 3))
+        projector[control_value, control_value] = 1
+        expected = np.kron(np.eye(3) - projector, np.eye(9)) \
+            + np.kron(projector, circuit.to_matrix())
+        assert(np.allclose(controlled.to_matrix(), expected))
+        assert(len(controlled.instructions) == len(instructions))
+assert([instr.name for instr in Circuit(
+    "c", [hadamard, DiagonalGate.T([0]), hadamard.inverse()], 1, 3)
+    .controlled().instructions] == ["H", "C2(T)", "H†"])
+
+## gates of qudits of mixed dimensions are controlled by a control qudit of
+#  the dimension of their first qudit, or of the given dimension
+mixed = np.kron(QCM.X_gate("+1", 2), QCM.H_gate(3))
+for gate in (Gate("G", mixed, 2, (2, 3)),
+             DiagonalGate("D", np.arange(1, 7), 2, (2, 3))):
+    for control_dim in (None, 2, 3):
+        controlled = gate.controlled(control_dim=control_dim)
+        dim = 2 if control_dim is None else control_dim
+        projector = np.zeros((dim, dim))
+        projector[dim - 1, dim - 1] = 1
+        expected = np.kron(np.eye(dim) - projector, np.eye(6)) \
+            + np.kron(projector, Misc.to_dense(gate.to_matrix()))
+        assert(controlled.dim == (dim, 2, 3))
+        assert(np.allclose(Misc.to_dense(controlled.to_matrix()), expected))
+
+## gates with equal data share one read-only copy of it, which is
+#  independent of the array the gate was created from
+matrix = QCM.H_gate(3)
+hadamard = Gate("H", matrix, 1, 3, [0])
+assert(Gate("K", matrix.copy(), 1, 3, [1]).matrix is hadamard.matrix)
+assert(DiagonalGate.T([0]).diagonal is DiagonalGate.T([1]).diagonal)
+assert(MonomialGate.CX([0, 1]).permutation
+       is MonomialGate.CX([1, 2]).permutation)
+assert(not hadamard.matrix.flags.writeable)
+matrix[0, 0] = 0
+assert(np.allclose(hadamard.matrix, QCM.H_gate(3)))
+
+## the cached resources of a circuit follow changes to its gates
+first = DiagonalGate.T([0])
+second = DiagonalGate.T([0])
+circuit = Circuit("c", [first, second], 2, 3)
+assert(circuit.resources()["depth"] == 2)
+second.qudits = [1]
+resources = Circuit("c", [first, second], 2, 3).resources()
+assert(circuit.resources()["depth"] == resources["depth"] == 1)
+assert(circuit.resources()["width"] == resources["width"] == 2)
+
+## each compiled gate is cast to the simulator's dtype once per simulation,
+#  however often it is applied
+circuit = Circuit("c", [MonomialGate.X("+1", 3, [q % 3]) for q in range(9)]
+                  + [Gate("H", QCM.H_gate(3), 1, 3, [0])], 3, 3)
+for dtype in (np.complex64, np.complex128):
+    simulator = StateVectorSimulator(3, 3, dtype=dtype)
+    Precision.reset()
+    result = simulator.to_ket(simulator.evolve(circuit)).reshape(-1)
+    assert(np.allclose(result, circuit.to_matrix()[:, 0], atol=1e-6))
+    assert(sum(Precision.casts.values()) <= 2)
+
+## sparse gates are extended with sparse identities, e.g. a T gate on one
+#  of 8 qutrits stores only the diagonal of the extended matrix (scipy is an
+#  optional dependency, without which gates are always dense)
+T_sparse = DiagonalGate.T().to_matrix(sparse=True)
+if Misc.is_sparse(T_sparse):
+    extended = Instruction.extend_matrix(T_sparse, 8, 3, [0])
+    assert(Misc.is_sparse(extended) and extended.nnz == 3 ** 8)
+    assert(np.allclose(Instruction.extend_matrix(T_sparse, 3, 3, [1])
+                       .toarray(), np.kron(np.kron(np.identity(3),
+                                                   QCM.T_gate()),
+                                           np.identity(3))))
+
+## the name index of a circuit follows renamed instructions and is not
+#  shared with copies of the circuit
+first = DiagonalGate.T([0])
+circuit = Circuit("c", [first, DiagonalGate.S([1])], 2, 3)
+assert(circuit.count("T") == 1)
+first.name = "Tx"
+assert(circuit.count("Tx") == 1 and circuit.count("T") == 0)
+copied = circuit.on((1, 0))
+copied.append(DiagonalGate.T([1]))
+assert(circuit.count("T") == 0 and copied.count("T") == 1)
+
+## noise channels only follow gates on the qudits of their dimension, and
+#  channels which fit no qudit are rejected
+noise = KrausChannel.depolarizing(0.1, 3)
+simulator = DensityMatrixSimulator(3, (2, 3, 3), noise)
+assert([axes for _, axes in simulator.gate_noise(None, (0, 1, 2))]
+       == [(1,), (2,)])
+circuit = Circuit("c", [Gate("H", QCM.H_gate(3), 1, 3, [1]),
+                        Gate("X", np.array([[0, 1], [1, 0]]), 1, 2, [0])],
+                  3, (2, 3, 3))
+assert(np.isclose(np.trace(simulator.to_matrix(simulator.evolve(circuit))), 1))
+for noise in (KrausChannel.depolarizing(0.1, 5),
+              KrausChannel.depolarizing(0.1, 3, 2)):
+    try:
+        DensityMatrixSimulator(3, (2, 3, 3), noise)
+        assert(False)
+    except ValueError:
+        pass
+
+## the state vector simulator, with or without scheduling, fusing, and
+#  merging diagonals, and the noiseless density matrix and trajectory
+#  simulators give the states of the circuit's matrix, with or without the
+#  JIT kernels, from real and complex kets
+circuit = Circuit("c", [FourierGate.layer(range(3)), DiagonalGate.T([0]),
+                        Gate("H", QCM.H_gate(3), 1, 3, [1]),
+                        MonomialGate.CX([0, 2]),
+                        Controlled(MonomialGate.X("+1"), [(1, 2)], [2]),
+                        DiagonalGate("D", np.exp(2j * np.pi * rng.random(9)),
+                                     2, 3, [1, 2]),
+                        FourierGate("F", [3, 1], 2, 3, [2, 0])], 3, 3)
+matrix = circuit.to_matrix()
+options = [dict(), dict(schedule=True), dict(fuse_max_qudits=2),
+           dict(merge_diagonals=False), dict(schedule=True, fuse_max_qudits=2),
+           dict(dtype=np.complex64)]
+for enabled in (False, JitKernels.available):
+    JitKernels.enabled = enabled
+    for ket in (rng.normal(size=27),
+                rng.normal(size=27) + 1j * rng.normal(size=27)):
+        ket = ket / np.linalg.norm(ket)
+        expected = np.dot(matrix, ket)
+        for option in options:
+            simulator = StateVectorSimulator(3, 3, **option)
+            result = simulator.run(circuit, ket).reshape(-1)
+            assert(np.allclose(result, expected, atol=1e-5))
+        density = DensityMatrixSimulator(3, 3)
+        result = density.to_matrix(density.evolve(circuit, ket))
+        assert(np.allclose(result, np.outer(expected, expected.conj())))
+        trajectory = TrajectorySimulator(3, 3, batch_size=2, workers=1)
+        for result in trajectory.evolve(circuit, 2, rng, ket):
+            assert(np.allclose(result.reshape(-1), expected))
+JitKernels.enabled = JitKernels.available
+
+## gates applied to the chunks of a state by several threads write into
+#  the output without changing the state, on adjacent, descending, and
+#  distant axes of qudits of mixed dimensions
+StateVectorKernels.configure(threads=4, chunk_states=9)
+JitKernels.enabled = False
+state = rng.normal(size=(3, 2, 3, 3, 2, 3)) \
+    + 1j * rng.normal(size=(3, 2, 3, 3, 2, 3))
+original = state.copy()
+for axes in ((0,), (5,), (0, 1), (3, 2), (1, 4), (2, 3, 4)):
+    size = int(np.prod([state.shape[axis] for axis in axes]))
+    matrix = rng.normal(size=(size, size)) + 1j * rng.normal(size=(size, size))
+    permutation = rng.permutation(size)
+    phases = np.exp(2j * np.pi * rng.random(size))
+    monomial = np.zeros((size, size), dtype=complex)
+    monomial[permutation, np.arange(size)] = phases
+    for gate_matrix, result in (
+            (matrix, StateVectorKernels.apply_matrix(state, matrix, axes)),
+            (monomial, StateVectorKernels.apply_monomial(
+                state, permutation, phases, axes))):
+        moved = np.moveaxis(state, axes, range(len(axes)))
+        expected = np.dot(gate_matrix, moved.reshape(size, -1))
+        expected = np.moveaxis(expected.reshape(moved.shape),
+                               range(len(axes)), axes)
+        assert(np.allclose(result, expected))
+    assert(np.array_equal(state, original))
+StateVectorKernels.configure(threads=1, chunk_states=3 ** 9)
+JitKernels.enabled = JitKernels.available
+
+## the sharded simulator applies layers on every qudit, which are split
+#  into gates that fit in the local axes, e.g. of 2 local qudits out of 5
+#  (the worker processes need the main guard on platforms which spawn them)
+if __name__ == "__main__":
+    layer = Circuit("layer", [FourierGate.layer(range(5)),
+                              DiagonalGate("D", np.exp(2j * np.pi * rng.random(
+                                  3 ** 5)), 5, 3),
+                              FourierGate("F", [1, 2, 3, 1, 2], 5, 3)], 5, 3)
+    ket = np.zeros(3 ** 5)
+    ket[7] = 1
+    expected = np.dot(layer.to_matrix(), ket)
+    for shard_qudits in (1, 3):
+        sharded = ShardedStateVectorSimulator(5, 3, shard_qudits, workers=2)
+        assert(np.allclose(sharded.run(layer, ket).reshape(-1), expected))
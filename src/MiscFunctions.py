@@ -9,10 +9,20 @@ Date of Initial Creation: October 21, 2021
 
 """
 
+import math
+from fractions import Fraction
 from warnings import catch_warnings, simplefilter
 
 import numpy as np
 
+from src.Precision import Precision
+from src.Workspace import Workspace
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # scipy is an optional dependency
+    sp = None
+
 __author__      = "Alex Lim"
 __credits__     = "Alex Lim"
 __maintainer__  = "Alex Lim"
@@ -20,6 +30,13 @@ __maintainer__  = "Alex Lim"
 
 class MiscFunctions:
     """Miscellaneous useful functions"""
+    sparse_fill_ratio = 0.1
+    """The largest fraction of nonzero entries for which a matrix is
+    automatically stored in sparse (CSR) form"""
+    chain_slots = ("chain", "chain'")
+    """The pair of workspace slots of the intermediate products of dot and
+    kron"""
+
     @staticmethod
     def ket_basis(dim: int = 3):
         """
@@ -74,19 +91,20 @@ class MiscFunctions:
             i += 1
 
     @staticmethod
-    def real_to_complex_matrix(real_matrix: np.ndarray):
+    def real_to_complex_matrix(real_matrix: np.ndarray,
+                               dtype: np.dtype = None):
         """
-        Converts a real number matrix to a complex number matrix
+        Converts a real number matrix to a complex number matrix.\n
+        * Note: The cast is counted in Precision.casts.
 
         :param real_matrix: A real number matrix
         :type real_matrix: np.ndarray
+        :param dtype: The complex dtype, defaults to Precision.dtype
+        :type dtype: np.dtype
         :return: A complex number matrix
         :rtype: np.ndarray
         """
-        if real_matrix.dtype == np.complex_:
-            return real_matrix
-        else:
-            return np.array(real_matrix, dtype=np.complex_)
+        return Precision.cast(real_matrix, Precision.state_dtype(dtype))
 
     @staticmethod
     def complex_to_real_matrix(complex_matrix: np.ndarray,
@@ -105,14 +123,14 @@ class MiscFunctions:
         :return: A real number matrix
         :rtype: np.ndarray
         """
-        if complex_matrix.dtype != np.complex_:
+        if not np.iscomplexobj(complex_matrix):
             return complex_matrix
-        else:
-            if show_warnings:
-                return np.array(complex_matrix, dtype=np.float_)
-            with catch_warnings():
-                simplefilter("ignore")
-                return np.array(complex_matrix, dtype=np.float_)
+        dtype = np.finfo(complex_matrix.dtype).dtype
+        if show_warnings:
+            return Precision.cast(complex_matrix, dtype)
+        with catch_warnings():
+            simplefilter("ignore")
+            return Precision.cast(complex_matrix, dtype)
 
     @staticmethod
     def T(matrix: np.ndarray):
@@ -129,15 +147,197 @@ class MiscFunctions:
     @staticmethod
     def dot(*argv: np.ndarray):
         """
-        Computes the dot product of matrices in order
+        Computes the dot product of matrices in order.\n
+        * Note: The product of sparse matrices stays sparse, and the product
+        has the dtype of the matrices rather than being upcast, e.g. stays
+        complex64. If a Workspace is active, the intermediate products of
+        dense matrices are written into its chain slots, so only the final
+        product is allocated.
 
         :param argv: Matrices
-        :type argv: np.ndarray
+        :type argv: np.ndarray or sp.spmatrix
         :return: The dot products of matrices
-        :rtype: np.ndarray
+        :rtype: np.ndarray or sp.spmatrix
+        """
+        workspace = Workspace.current()
+        result = None
+        for args in argv:
+            if result is None:
+                result = args
+            elif MiscFunctions.is_sparse(args) \
+                    or MiscFunctions.is_sparse(result):
+                result = result @ args
+            elif workspace is not None and np.ndim(result) == 2 \
+                    and np.ndim(args) == 2:
+                result, args = np.asarray(result), np.asarray(args)
+                out = workspace.output(
+                    (result.shape[0], args.shape[1]),
+                    np.result_type(result, args), result,
+                    MiscFunctions.chain_slots)
+                result = np.dot(result, args, out=out)
+            else:
+                result = np.dot(result, args)
+        if result is None:
+            return 1
+        if workspace is not None and workspace.owns(result):
+            return result.copy()
+        return result
+
+    @staticmethod
+    def phase_order(phases: np.ndarray, max_order: int = 64):
+        """
+        Finds the smallest positive power which maps all phases to 1
+
+        :param phases: Unit complex numbers
+        :type phases: np.ndarray
+        :param max_order: The largest power to consider, defaults to 64
+        :type max_order: int
+        :return: The order of the phases, or None if it exceeds max_order
+        :rtype: int
         """
-        result = 1
+        order = 1
+        for turns in np.angle(np.ravel(phases)) / (2 * np.pi):
+            fraction = Fraction(float(turns)).limit_denominator(max_order)
+            if not np.isclose(float(fraction), turns,
+                              *Precision.tolerance(phases)):
+                return None
+            order = order * fraction.denominator \
+                // math.gcd(order, fraction.denominator)
+            if order > max_order:
+                return None
+        if not Precision.allclose(np.power(phases, order), 1):
+            return None
+        return order
+
+    @staticmethod
+    def kron(*argv: np.ndarray, sparse: bool = None):
+        """
+        Computes the Kronecker product of matrices in order.\n
+        * Note: If a Workspace is active, the intermediate products of dense
+        matrices are written into its chain slots by broadcasting, so only
+        the final product is allocated.
+
+        :param argv: Matrices
+        :type argv: np.ndarray or sp.spmatrix
+        :param sparse: Whether to return a sparse matrix, defaults to
+            returning a sparse matrix only if any of the matrices are sparse;
+            always dense if scipy is not installed
+        :type sparse: bool
+        :return: The Kronecker product of matrices
+        :rtype: np.ndarray or sp.spmatrix
+        """
+        if sp is None:
+            sparse = False
+        if sparse is None:
+            sparse = any([MiscFunctions.is_sparse(args) for args in argv])
+        if sparse:
+            result = 1
+            for args in argv:
+                result = sp.kron(result, args, format="csr")
+            return result
+        workspace = Workspace.current()
+        result = None
         for args in argv:
-            result = np.dot(result, args)
+            args = np.asarray(MiscFunctions.to_dense(args))
+            if result is None:
+                result = args
+            elif workspace is not None and result.ndim == 2 \
+                    and args.ndim == 2:
+                (m, n), (p, q) = result.shape, args.shape
+                out = workspace.output(
+                    (m * p, n * q), np.result_type(result, args), result,
+                    MiscFunctions.chain_slots)
+                np.multiply(result[:, np.newaxis, :, np.newaxis],
+                            args[np.newaxis, :, np.newaxis, :],
+                            out=out.reshape(m, p, n, q))
+                result = out
+            else:
+                result = np.kron(result, args)
+        if result is None:
+            return 1
+        if result is argv[0] or workspace is not None \
+                and workspace.owns(result):
+            return np.array(result)
         return result
 
+    @staticmethod
+    def is_sparse(matrix: object):
+        """
+        Checks if matrix is a scipy sparse matrix
+
+        :param matrix: An object
+        :type matrix: object
+        :return: If matrix is a scipy sparse matrix
+        :rtype: bool
+        """
+        return sp is not None and sp.issparse(matrix)
+
+    @staticmethod
+    def fill_ratio(matrix: np.ndarray):
+        """
+        Gets the fraction of entries of a matrix which are nonzero
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :return: The fraction of nonzero entries
+        :rtype: float
+        """
+        size = np.prod(matrix.shape)
+        if size == 0:
+            return 0.
+        if MiscFunctions.is_sparse(matrix):
+            return matrix.count_nonzero() / size
+        return np.count_nonzero(matrix) / size
+
+    @staticmethod
+    def to_sparse(matrix: np.ndarray):
+        """
+        Converts a matrix to a sparse (CSR) matrix
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :raises ImportError: scipy is not installed
+        :return: A sparse (CSR) matrix
+        :rtype: sp.csr_matrix
+        """
+        if sp is None:
+            raise ImportError("sparse matrices require scipy to be installed")
+        if sp.isspmatrix_csr(matrix):
+            return matrix
+        return sp.csr_matrix(matrix)
+
+    @staticmethod
+    def to_dense(matrix: np.ndarray):
+        """
+        Converts a matrix to a dense matrix
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :return: A dense matrix
+        :rtype: np.ndarray
+        """
+        if MiscFunctions.is_sparse(matrix):
+            return matrix.toarray()
+        return matrix
+
+    @staticmethod
+    def auto_format(matrix: np.ndarray, sparse: bool = None):
+        """
+        Converts a matrix to either sparse or dense form.\n
+        * Note: If scipy is not installed, matrices are always kept dense
+        unless sparse is True.
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :param sparse: Whether to return a sparse matrix, defaults to choosing
+            by comparing the fill ratio to MiscFunctions.sparse_fill_ratio
+        :type sparse: bool
+        :return: The matrix in the chosen form
+        :rtype: np.ndarray or sp.spmatrix
+        """
+        if sparse is None:
+            sparse = sp is not None and MiscFunctions.fill_ratio(matrix) \
+                     <= MiscFunctions.sparse_fill_ratio
+        if sparse:
+            return MiscFunctions.to_sparse(matrix)
+        return MiscFunctions.to_dense(matrix)
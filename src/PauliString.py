@@ -0,0 +1,186 @@
+"""
+Pauli String
+
+Tensor products of powers of the qudit Pauli X and Z gates
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class PauliString(object):
+    """A tensor product :math:`\\bigotimes_k X^{x_k} Z^{z_k}` of powers of
+    the Pauli gates :math:`X|j⟩ = |j+1⟩` and :math:`Z|j⟩ = ω^j|j⟩`, stored as
+    the exponents of each qudit, e.g. Z⊗X^2⊗I has x = (0, 2, 0) and
+    z = (1, 0, 0). The exponents are reduced modulo the dimension of each
+    qudit when the string acts on a state."""
+    __slots__ = ("_x", "_z")
+
+    tokens = re.compile(r"^(?:I|(?:X(?:\^(\d+))?)?(?:Z(?:\^(\d+))?)?)$")
+    """The factor of a single qudit, e.g. "I", "X", "Z^2", or "XZ^2\""""
+
+    def __init__(self, x: Iterable[int], z: Iterable[int]):
+        """
+        Creates a new Pauli string
+
+        :param x: The exponent of X of each qudit
+        :type x: Iterable[int]
+        :param z: The exponent of Z of each qudit
+        :type z: Iterable[int]
+        :raises ValueError: The exponents have different lengths
+        """
+        x = tuple(int(a) for a in x)
+        z = tuple(int(b) for b in z)
+        if len(x) != len(z):
+            raise ValueError("got %s X exponents but %s Z exponents"
+                             % (len(x), len(z)))
+        self._x = x
+        self._z = z
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def parse(label: str):
+        """
+        Parses a Pauli string. The factors of the qudits are separated by
+        spaces or "⊗", each of "I", "X^a", "Z^b", or "X^aZ^b" with the
+        exponents optional, e.g. "Z ⊗ X^2 ⊗ I". A label of only the letters
+        I, X, and Z has one factor per letter, e.g. "ZXI".\n
+        * Note: Parsed Pauli strings are cached since they are immutable.
+
+        :param label: The Pauli string
+        :type label: str
+        :raises SyntaxError: The label is invalid
+        :return: The Pauli string
+        :rtype: PauliString
+        """
+        factors = [f for f in re.split(r"[\s⊗]+", label) if f]
+        if len(factors) == 1 and re.fullmatch(r"[IXZ]+", factors[0]):
+            factors = list(factors[0])
+        x, z = list(), list()
+        for factor in factors:
+            match = PauliString.tokens.match(factor)
+            if match is None:
+                raise SyntaxError("invalid syntax. \"%s\" has invalid factor "
+                                  "\"%s\"" % (label, factor))
+            a, b = match.groups()
+            x.append(0 if "X" not in factor else int(a or 1))
+            z.append(0 if "Z" not in factor else int(b or 1))
+        return PauliString(x, z)
+
+    @staticmethod
+    def from_any(pauli: object):
+        """
+        Gets a Pauli string from a Pauli string or its label
+
+        :param pauli: A Pauli string or its label
+        :type pauli: PauliString or str
+        :raises TypeError: The argument is not a Pauli string
+        :return: The Pauli string
+        :rtype: PauliString
+        """
+        if isinstance(pauli, PauliString):
+            return pauli
+        if isinstance(pauli, str):
+            return PauliString.parse(pauli)
+        raise TypeError("expected a PauliString or str, not %s"
+                        % type(pauli).__name__)
+
+    @property
+    def x(self):
+        """
+        Gets the exponent of X of each qudit
+
+        :return: The exponents of X
+        :rtype: tuple[int]
+        """
+        return self._x
+
+    @property
+    def z(self):
+        """
+        Gets the exponent of Z of each qudit
+
+        :return: The exponents of Z
+        :rtype: tuple[int]
+        """
+        return self._z
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return len(self._x)
+
+    def reduce(self, dims: Iterable[int]):
+        """
+        Gets the exponents reduced modulo the dimension of each qudit
+
+        :param dims: The dimension of each qudit
+        :type dims: Iterable[int]
+        :return: The reduced exponents of X and of Z
+        :rtype: tuple[tuple[int], tuple[int]]
+        """
+        dims = tuple(dims)
+        if len(dims) != self.num_qudits:
+            raise ValueError("%s acts on %s qudits, not %s"
+                             % (self, self.num_qudits, len(dims)))
+        return tuple(a % d for a, d in zip(self._x, dims)), \
+            tuple(b % d for b, d in zip(self._z, dims))
+
+    def matrix(self, dim: int = 3):
+        """
+        Gets the matrix of the Pauli string
+
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit, defaults to 3
+        :type dim: int or Iterable[int]
+        :return: The matrix
+        :rtype: np.ndarray
+        """
+        dims = (dim,) * self.num_qudits if isinstance(dim, (int, np.integer)) \
+            else tuple(dim)
+        x, z = self.reduce(dims)
+        return Misc.kron(*[
+            np.linalg.matrix_power(QCM.X_gate("+1", d), a)
+            @ np.linalg.matrix_power(QCM.Z_gate(d), b)
+            for a, b, d in zip(x, z, dims)])
+
+    def __len__(self):
+        return self.num_qudits
+
+    def __eq__(self, other):
+        return isinstance(other, PauliString) \
+               and self._x == other.x and self._z == other.z
+
+    def __hash__(self):
+        return hash((self._x, self._z))
+
+    def __str__(self):
+        factors = list()
+        for a, b in zip(self._x, self._z):
+            factor = ("X" if a == 1 else "X^%s" % a if a else "") \
+                + ("Z" if b == 1 else "Z^%s" % b if b else "")
+            factors.append(factor or "I")
+        return "⊗".join(factors)
+
+    def __repr__(self):
+        return "PauliString(%s)" % self
@@ -0,0 +1,388 @@
+"""
+Permutation
+
+Permutations of the standard basis states of a qudit
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import re
+from functools import lru_cache
+from itertools import permutations
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc, sp
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class Permutation(object):
+    """A permutation of the standard basis states of a qudit of any
+    dimension, stored as the array of images of the basis states so that
+    composition, inversion, and powers each take O(d) time"""
+    __slots__ = ("_image",)
+
+    tokens = re.compile(r"\s*(?:([+-])\s*(\d+)|\(([^()]*)\)"
+                        r"|(\d+(?:\s*[,\s]\s*\d+)*))\s*")
+    """A term of a permutation spec: a cyclic shift, a cycle, or a chain of
+    basis states"""
+
+    def __init__(self, image: Iterable[int]):
+        """
+        Creates a new permutation
+
+        :param image: The standard basis state each standard basis state is
+            sent to, i.e. :math:`|j⟩ \\mapsto |image[j]⟩`
+        :type image: Iterable[int]
+        :raises ValueError: The image is not a permutation
+        """
+        image = np.array(image, dtype=np.intp).reshape(-1)
+        seen = np.zeros(len(image), dtype=bool)
+        if len(image) and (image.min() < 0 or image.max() >= len(image)):
+            raise ValueError("%s is not a permutation" % image.tolist())
+        seen[image] = True
+        if not seen.all():
+            raise ValueError("%s is not a permutation" % image.tolist())
+        image.setflags(write=False)
+        self._image = image
+
+    @property
+    def image(self):
+        """
+        Gets the images of the standard basis states
+
+        :return: The images of the standard basis states
+        :rtype: np.ndarray
+        """
+        return self._image
+
+    @property
+    def order(self):
+        """
+        Gets the order of the standard basis states, i.e. the standard basis
+        state sent to each standard basis state, as returned by
+        QuantumCircuitMatrix.gate_perm_order
+
+        :return: The order of the standard basis states
+        :rtype: list[int]
+        """
+        return self.inverse().image.tolist()
+
+    @property
+    def dim(self):
+        """
+        Gets the dimension of the qudit
+
+        :return: The dimension of the qudit
+        :rtype: int
+        """
+        return len(self._image)
+
+    @staticmethod
+    def identity(dim: int = 3):
+        """
+        Creates the identity permutation
+
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The identity permutation
+        :rtype: Permutation
+        """
+        return Permutation(np.arange(dim))
+
+    @staticmethod
+    def shift(shift: int, dim: int = 3):
+        """
+        Creates the cyclic shift :math:`|k⟩ \\mapsto |k+shift⟩` where the
+        addition is taken modulo :math:`d`
+
+        :param shift: The amount to shift by
+        :type shift: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The cyclic shift
+        :rtype: Permutation
+        """
+        return Permutation((np.arange(dim) + shift) % dim)
+
+    @staticmethod
+    def transposition(a: int, b: int, dim: int = 3):
+        """
+        Creates the transposition of two standard basis states, which is the
+        identity if they are the same
+
+        :param a: A standard basis state
+        :type a: int
+        :param b: A standard basis state
+        :type b: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :raises IndexError: A standard basis state is invalid
+        :return: The transposition
+        :rtype: Permutation
+        """
+        return Permutation.from_cycles([(a, b)] if a != b else [(a,)], dim)
+
+    @staticmethod
+    def from_cycles(cycles: Iterable[Iterable[int]], dim: int = 3):
+        """
+        Creates a permutation from disjoint cycles, where each cycle
+        :math:`(a\\ b\\ c)` sends :math:`|a⟩` to :math:`|b⟩`, :math:`|b⟩` to
+        :math:`|c⟩`, and :math:`|c⟩` to :math:`|a⟩`
+
+        :param cycles: The disjoint cycles
+        :type cycles: Iterable[Iterable[int]]
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :raises ValueError: The cycles are not disjoint
+        :raises IndexError: A cycle contains an invalid standard basis state
+        :return: The permutation
+        :rtype: Permutation
+        """
+        image = np.arange(dim)
+        moved = np.zeros(dim, dtype=bool)
+        for cycle in cycles:
+            cycle = np.array(list(cycle), dtype=np.intp)
+            if len(cycle) and (cycle.min() < 0 or cycle.max() >= dim):
+                raise IndexError("list index out of range. %s is not a cycle "
+                                 "of %s states" % (cycle.tolist(), dim))
+            if moved[cycle].any() or len(np.unique(cycle)) != len(cycle):
+                raise ValueError("the cycles are not disjoint")
+            moved[cycle] = True
+            image[cycle] = np.roll(cycle, -1)
+        return Permutation(image)
+
+    @staticmethod
+    def symmetric_group(dim: int = 3, nontrivial: bool = False):
+        """
+        Lazily enumerates the permutations of the standard basis states in
+        lexicographic order of their images
+
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param nontrivial: Whether to skip the identity, defaults to False
+        :type nontrivial: bool
+        :return: The permutations
+        :rtype: Iterator[Permutation]
+        """
+        perms = permutations(range(dim))
+        if nontrivial:
+            next(perms)
+        return (Permutation(perm) for perm in perms)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def parse(gate: str, dim: int = 3):
+        """
+        Parses a permutation of the standard basis states. The terms of the
+        spec act on the basis states in the order they are written, each of:\n
+        * "+num" or "-num": the cyclic shift :math:`|k⟩ \\mapsto |k±num⟩`\n
+        * "num,num,...,num": the transpositions of each consecutive pair of
+        states, e.g. "0,2" swaps :math:`|0⟩` and :math:`|2⟩`; spaces may be
+        used instead of commas\n
+        * "(num num ... num)": a cycle, e.g. "(0 1 2)(3 4)"\n
+        For dimensions below 10 a spec of only digits is read as pairs of
+        single digit transpositions, e.g. "0112" is "0,1" followed by "1,2".\n
+        * Note: Parsed permutations are cached since they are immutable.
+
+        :param gate: The permutation of the standard basis states
+        :type gate: str
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :raises SyntaxError: The spec is invalid
+        :raises IndexError: The spec contains an invalid standard basis state
+        :return: The permutation
+        :rtype: Permutation
+        """
+        if dim < 10 and gate.isdigit():
+            if len(gate) % 2 != 0:
+                raise SyntaxError("invalid syntax. \"%s\" "
+                                  "does not contain a valid operator" % gate)
+            return Permutation.compose_terms(
+                [Permutation.transposition(int(gate[i]), int(gate[i + 1]), dim)
+                 for i in range(0, len(gate), 2)], dim)
+        terms = list()
+        position = 0
+        while position < len(gate):
+            match = Permutation.tokens.match(gate, position)
+            if match is None or match.end() == position:
+                raise SyntaxError("invalid syntax. \"%s\" has invalid "
+                                  "character \"%s\" at index %s"
+                                  % (gate, gate[position], position))
+            sign, shift, cycle, chain = match.groups()
+            if sign is not None:
+                terms.append(Permutation.shift(
+                    int(shift) if sign == "+" else -int(shift), dim))
+            elif cycle is not None:
+                states = [int(s) for s in re.split(r"[\s,]+", cycle.strip())
+                          if s]
+                terms.append(Permutation.from_cycles([states], dim))
+            else:
+                states = [int(s) for s in re.split(r"[\s,]+", chain)]
+                if len(states) < 2:
+                    raise SyntaxError("invalid syntax. \"%s\" does not "
+                                      "contain a valid operator" % gate)
+                terms.extend(Permutation.transposition(a, b, dim)
+                             for a, b in zip(states, states[1:]))
+            position = match.end()
+        return Permutation.compose_terms(terms, dim)
+
+    @staticmethod
+    def compose_terms(terms: Iterable['Permutation'], dim: int = 3):
+        """
+        Composes permutations which act on the standard basis states in order
+
+        :param terms: The permutations in the order they act
+        :type terms: Iterable[Permutation]
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The composed permutation
+        :rtype: Permutation
+        """
+        image = np.arange(dim)
+        for term in terms:
+            image = term.image[image]
+        return Permutation(image)
+
+    def compose(self, other: 'Permutation'):
+        """
+        Composes two permutations, applying other first and then self
+
+        :param other: The permutation to apply first
+        :type other: Permutation
+        :return: The composed permutation
+        :rtype: Permutation
+        """
+        if self.dim != other.dim:
+            raise ValueError("cannot compose permutations of %s and %s states"
+                             % (self.dim, other.dim))
+        return Permutation(self._image[other.image])
+
+    def inverse(self):
+        """
+        Gets the inverse permutation
+
+        :return: The inverse permutation
+        :rtype: Permutation
+        """
+        inverse = np.empty_like(self._image)
+        inverse[self._image] = np.arange(self.dim)
+        return Permutation(inverse)
+
+    def power(self, exponent: int):
+        """
+        Raises the permutation to an integer power by rotating each of its
+        cycles
+
+        :param exponent: The exponent, which may be negative
+        :type exponent: int
+        :return: The permutation to the power of the exponent
+        :rtype: Permutation
+        """
+        image = np.arange(self.dim)
+        for cycle in self.cycles():
+            cycle = np.array(cycle, dtype=np.intp)
+            image[cycle] = np.roll(cycle, -(exponent % len(cycle)))
+        return Permutation(image)
+
+    def cycles(self, include_fixed: bool = False):
+        """
+        Gets the disjoint cycles of the permutation, each starting from its
+        smallest standard basis state
+
+        :param include_fixed: Whether to include the fixed standard basis
+            states as cycles of length one, defaults to False
+        :type include_fixed: bool
+        :return: The disjoint cycles
+        :rtype: list[tuple[int]]
+        """
+        image = self._image.tolist()
+        visited = [False] * self.dim
+        cycles = list()
+        for start in range(self.dim):
+            if visited[start]:
+                continue
+            cycle = [start]
+            visited[start] = True
+            state = image[start]
+            while state != start:
+                cycle.append(state)
+                visited[state] = True
+                state = image[state]
+            if include_fixed or len(cycle) > 1:
+                cycles.append(tuple(cycle))
+        return cycles
+
+    def isidentity(self):
+        """
+        Checks if the permutation is the identity
+
+        :return: If the permutation is the identity
+        :rtype: bool
+        """
+        return bool((self._image == np.arange(self.dim)).all())
+
+    def matrix(self, sparse: bool = False):
+        """
+        Gets the permutation matrix, which sends :math:`|j⟩` to
+        :math:`|image[j]⟩`
+
+        :param sparse: Whether to return a sparse matrix, defaults to False;
+            None chooses by fill ratio; always dense if scipy is not installed
+        :type sparse: bool
+        :return: The permutation matrix
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        if sp is None:
+            sparse = False
+        columns = np.arange(self.dim)
+        if sparse is not False and sp is not None:
+            return Misc.auto_format(sp.csr_matrix(
+                (np.ones(self.dim, dtype=int), (self._image, columns)),
+                shape=(self.dim, self.dim)), sparse)
+        matrix = np.zeros((self.dim, self.dim), dtype=int)
+        matrix[self._image, columns] = 1
+        return Misc.auto_format(matrix, sparse) if sparse else matrix
+
+    def __call__(self, state: int):
+        return int(self._image[state])
+
+    def __mul__(self, other: 'Permutation'):
+        return self.compose(other)
+
+    def __pow__(self, exponent: int):
+        return self.power(exponent)
+
+    def __len__(self):
+        return self.dim
+
+    def __iter__(self):
+        return iter(self._image.tolist())
+
+    def __eq__(self, other):
+        return isinstance(other, Permutation) \
+               and np.array_equal(self._image, other.image)
+
+    def __hash__(self):
+        return hash(self._image.tobytes())
+
+    def __str__(self):
+        return "".join("(%s)" % " ".join(map(str, cycle))
+                       for cycle in self.cycles()) or "()"
+
+    def __repr__(self):
+        return "Permutation(%s)" % self._image.tolist()
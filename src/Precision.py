@@ -0,0 +1,207 @@
+"""
+Precision
+
+The dtype policy of states and gates, with explicit counted casts and
+comparisons whose tolerances follow the precision in use
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from collections import Counter
+
+import numpy as np
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class Precision(object):
+    """The dtype policy of states and gates. States are created with dtype,
+    complex128 by default or complex64 to halve the memory and bandwidth of
+    large simulations. Gate operands are cast to the dtype of the state
+    they are applied to rather than upcasting it, integer-valued gate data
+    is stored in the smallest integer dtype, and every cast is counted in
+    casts, keyed by the dtypes it converts from and to."""
+    dtypes = (np.dtype(np.complex64), np.dtype(np.complex128))
+    """The supported state dtypes"""
+    dtype = np.dtype(np.complex128)
+    """The dtype of new states, see configure"""
+    tolerances = {np.dtype(np.float32): (1e-3, 1e-5),
+                  np.dtype(np.float64): (1e-5, 1e-8)}
+    """The relative and absolute tolerances of comparisons by the precision
+    of their real parts"""
+    casts = Counter()
+    """The number of casts by the dtypes they convert from and to"""
+
+    @classmethod
+    def configure(cls, dtype: np.dtype = None):
+        """
+        Sets the dtype of new states, e.g. complex64 for single precision
+
+        :param dtype: The dtype of new states, defaults to the current dtype
+        :type dtype: np.dtype
+        :raises ValueError: The dtype is not supported
+        """
+        if dtype is not None:
+            cls.dtype = Precision.state_dtype(dtype)
+
+    @classmethod
+    def reset(cls):
+        """Clears the cast counts"""
+        cls.casts.clear()
+
+    @staticmethod
+    def state_dtype(dtype: np.dtype = None):
+        """
+        Checks the dtype of a state
+
+        :param dtype: The dtype, defaults to Precision.dtype
+        :type dtype: np.dtype
+        :raises ValueError: The dtype is not supported
+        :return: The dtype
+        :rtype: np.dtype
+        """
+        if dtype is None:
+            return Precision.dtype
+        dtype = np.dtype(dtype)
+        if dtype not in Precision.dtypes:
+            raise ValueError("states must be %s, not %s" % (
+                " or ".join(str(d) for d in Precision.dtypes), dtype))
+        return dtype
+
+    @staticmethod
+    def tolerance(*arrays: np.ndarray):
+        """
+        Gets the tolerances of comparing arrays, from the least precise of
+        Precision.dtype and the dtypes of the inexact arrays
+
+        :param arrays: The compared arrays
+        :type arrays: np.ndarray or sp.spmatrix
+        :return: The relative and absolute tolerances
+        :rtype: tuple[float, float]
+        """
+        eps = np.finfo(Precision.dtype).eps
+        for array in arrays:
+            dtype = getattr(array, "dtype", None)
+            if dtype is not None and np.issubdtype(dtype, np.inexact):
+                eps = max(eps, np.finfo(dtype).eps)
+        for precision in sorted(Precision.tolerances,
+                                key=lambda d: np.finfo(d).eps):
+            if eps <= np.finfo(precision).eps:
+                return Precision.tolerances[precision]
+        return Precision.tolerances[np.dtype(np.float32)]
+
+    @staticmethod
+    def allclose(a: np.ndarray, b: np.ndarray):
+        """
+        Checks if two arrays are equal within the tolerance of their
+        precision
+
+        :param a: An array
+        :type a: np.ndarray
+        :param b: An array or scalar
+        :type b: np.ndarray
+        :return: If the arrays are equal within the tolerance
+        :rtype: bool
+        """
+        rtol, atol = Precision.tolerance(a, b)
+        return bool(np.allclose(a, b, rtol=rtol, atol=atol))
+
+    @staticmethod
+    def isclose(a: np.ndarray, b: np.ndarray):
+        """
+        Compares two arrays elementwise within the tolerance of their
+        precision
+
+        :param a: An array
+        :type a: np.ndarray
+        :param b: An array or scalar
+        :type b: np.ndarray
+        :return: Where the arrays are equal within the tolerance
+        :rtype: np.ndarray
+        """
+        rtol, atol = Precision.tolerance(a, b)
+        return np.isclose(a, b, rtol=rtol, atol=atol)
+
+    @staticmethod
+    def cast(array: np.ndarray, dtype: np.dtype):
+        """
+        Casts an array to a dtype, counting the cast in Precision.casts
+
+        :param array: An array
+        :type array: np.ndarray or sp.spmatrix
+        :param dtype: The dtype
+        :type dtype: np.dtype
+        :return: The array, or a copy of it if its dtype differs
+        :rtype: np.ndarray or sp.spmatrix
+        """
+        dtype = np.dtype(dtype)
+        if array.dtype == dtype:
+            return array
+        Precision.casts[(array.dtype.name, dtype.name)] += 1
+        return array.astype(dtype)
+
+    @staticmethod
+    def match(operand: np.ndarray, state: np.ndarray):
+        """
+        Casts a gate operand, e.g. a matrix, diagonal, or phases, to the
+        dtype of a complex state it is applied to if it would otherwise
+        upcast the state, e.g. a complex128 or int64 matrix applied to a
+        complex64 state. Real and integer states are never downcast to, so
+        they are upcast by complex operands instead of losing their phases.
+
+        :param operand: The gate operand
+        :type operand: np.ndarray or sp.spmatrix
+        :param state: The state tensor
+        :type state: np.ndarray
+        :return: The operand, cast if needed
+        :rtype: np.ndarray or sp.spmatrix
+        """
+        if not np.issubdtype(state.dtype, np.complexfloating) \
+                or np.result_type(operand.dtype, state.dtype) == state.dtype:
+            return operand
+        return Precision.cast(operand, state.dtype)
+
+    @staticmethod
+    def index_dtype(size: int):
+        """
+        Gets the smallest integer dtype which indexes size states, e.g. uint8
+        for the permutations of gates of at most 256 states
+
+        :param size: The number of states
+        :type size: int
+        :return: The dtype
+        :rtype: np.dtype
+        """
+        return np.min_scalar_type(max(size - 1, 0))
+
+    @staticmethod
+    def compact(array: np.ndarray):
+        """
+        Stores an array of integer values in the smallest signed integer
+        dtype which holds them, e.g. int8 for the phases ±1 of a permutation
+
+        :param array: An array
+        :type array: np.ndarray
+        :return: The array, cast if its values are integers which fit in a
+            smaller dtype
+        :rtype: np.ndarray
+        """
+        array = np.asarray(array)
+        if array.size == 0 or not (
+                np.issubdtype(array.dtype, np.integer)
+                or np.issubdtype(array.dtype, np.floating)
+                and np.all(np.mod(array, 1) == 0)):
+            return array
+        low, high = array.min(), array.max()
+        for dtype in (np.int8, np.int16, np.int32, np.int64):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                if np.dtype(dtype).itemsize >= array.dtype.itemsize:
+                    return array
+                return Precision.cast(array, dtype)
+        return array
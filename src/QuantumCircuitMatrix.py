@@ -10,12 +10,16 @@ Date of Initial Creation: October 19, 2021
 """
 
 import math
-from itertools import permutations
 from numbers import Real
 from typing import Iterable, Union
 
 import numpy as np
 
+from src.MiscFunctions import MiscFunctions as Misc, sp
+from src.Permutation import Permutation
+from src.Precision import Precision
+from src.QuditRegister import QuditRegister
+
 __author__      = "Alex Lim"
 __credits__     = "Alex Lim"
 __maintainer__  = "Alex Lim"
@@ -76,8 +80,7 @@ class QuantumCircuitMatrix(object):
                         bra = np.kron(two_bra, bra)
                     else:
                         num_qutrits = 1
-                        while QuantumCircuitMatrix.\
-                                qutrits_to_bits(num_qutrits) < argv:
+                        while QuditRegister.uniform(num_qutrits).size <= argv:
                             num_qutrits += 1
                         bra = np.kron(
                             QuantumCircuitMatrix.
@@ -169,14 +172,14 @@ class QuantumCircuitMatrix(object):
         omega_squared_ket =\
             (zero_ket + (o ** 2) * one_ket + o * two_ket) / np.sqrt(3)
         """:math:`|ω^2⟩ := (|0⟩ + ω|1⟩^2 + ω|2⟩)/\\sqrt{3}`"""
-        ket = 1
+        kets = list()
         if len(args) != 0:
             for argv in args[::-1]:
                 if isinstance(argv, np.ndarray):
-                    ket = np.kron(argv, ket)
+                    kets.insert(0, argv)
                 elif isinstance(argv, str):
-                    ket_temp = QuantumCircuitMatrix.get_ket(qutrit_string=argv)
-                    ket = np.kron(ket_temp, ket)
+                    kets.insert(0, QuantumCircuitMatrix.get_ket(
+                        qutrit_string=argv))
                 elif not isinstance(argv, int):
                     try:
                         argv = int(argv)
@@ -186,20 +189,19 @@ class QuantumCircuitMatrix(object):
                         continue
                 if isinstance(argv, int):
                     if argv == 0:
-                        ket = np.kron(zero_ket, ket)
+                        kets.insert(0, zero_ket)
                     elif argv == 1:
-                        ket = np.kron(one_ket, ket)
+                        kets.insert(0, one_ket)
                     elif argv == 2:
-                        ket = np.kron(two_ket, ket)
+                        kets.insert(0, two_ket)
                     else:
                         num_qutrits = 1
-                        while QuantumCircuitMatrix. \
-                                qutrits_to_bits(num_qutrits) < argv:
+                        while QuditRegister.uniform(num_qutrits).size <= argv:
                             num_qutrits += 1
-                        ket = np.kron(QuantumCircuitMatrix.
-                                      get_qutrit_vector(num_qutrits, argv), ket)
+                        kets.insert(0, QuantumCircuitMatrix.
+                                    get_qutrit_vector(num_qutrits, argv))
         if len(qutrit_string) != 0:
-            ket_temp = 1
+            string_kets = list()
             for i in range(len(qutrit_string)):
                 q = qutrit_string[i]
                 if q == "0":
@@ -222,14 +224,11 @@ class QuantumCircuitMatrix(object):
                     raise ValueError("get_ket does not support \"%s\". "
                                      "Please try get_qutrit_vector "
                                      "or directly use numpy ndarrays." % q)
-                ket_temp = np.kron(q_ket, ket_temp)
-            if isinstance(ket, int) and ket == 1:
-                ket = ket_temp
-            else:
-                ket = np.kron(ket_temp, ket)
-        if isinstance(ket, int) and ket == 1:
+                string_kets.insert(0, q_ket)
+            kets = string_kets + kets
+        if len(kets) == 0:
             return zero_ket
-        return ket
+        return Misc.kron(*kets)
 
     @staticmethod
     def ket_basis(dim: int = 3):
@@ -277,19 +276,29 @@ class QuantumCircuitMatrix(object):
         :return: An ordered list of converted qudit shorthands
         :rtype: list[int]
         """
-        return [q[0] for q in qudits].index(1)
+        ones = np.flatnonzero(np.asarray(qudits).reshape(-1) == 1)
+        if len(ones) == 0:
+            raise ValueError("1 is not in qudits")
+        return int(ones[0])
 
     @staticmethod
-    def identity_gate(num_qutrits: int = 1):
+    def identity_gate(num_qutrits: int = 1, sparse: bool = False):
         """
         Creates the identity gate using outer products.\n
         The identity gate is the identity matrix.
 
         :param num_qutrits: The number of qutrits, defaults to 1
         :type num_qutrits: int
+        :param sparse: Whether to return a sparse matrix, defaults to False;
+            None chooses by fill ratio
+        :type sparse: bool
         :return: The identity gate
-        :rtype: np.ndarray
+        :rtype: np.ndarray or sp.csr_matrix
         """
+        if sparse is not False and sp is not None:
+            return Misc.auto_format(
+                sp.identity(3 ** num_qutrits, dtype=int, format="csr"),
+                sparse)
         return sum(QuantumCircuitMatrix.identity_gate_helper(num_qutrits))
 
     @staticmethod
@@ -315,7 +324,8 @@ class QuantumCircuitMatrix(object):
         states
 
         :param gate: The permutation of the standard basis states in format:
-            "+num", "-num", or "num,num,...,num"
+            "+num", "-num", "num,num,...,num", or "(num num ... num)", see
+            Permutation.parse
         :type gate: str
         :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
             defaults to 3
@@ -323,79 +333,12 @@ class QuantumCircuitMatrix(object):
         :param gate_name: The name of the gate
         :type gate_name: str
         :returns: The specified gate permutation for a single qudit
-        :rtype: np.ndarray
+        :rtype: list[int]
         """
-        accepted_operators = ["+", "-", ",", " "]
-        accepted_numbers = [str(i) for i in range(0, 10)]
-        basis_order = list(range(dim))
-        if dim < 10 and not any([op in gate for op in accepted_operators]):
-            if len(gate) % 2 == 0:
-                for i in range(0, len(gate), 2):
-                    basis_order[int(gate[i])] ^= basis_order[int(gate[i + 1])]
-                    basis_order[int(gate[i + 1])] ^= basis_order[int(gate[i])]
-                    basis_order[int(gate[i])] ^= basis_order[int(gate[i + 1])]
-            else:
-                raise SyntaxError("invalid syntax. \"%s\" "
-                                  "does not contain a valid operator"
-                                  % gate)
-        k = -1
-        for i in range(len(gate)):
-            error = False
-            if gate[i] == "+":
-                j = i + 1
-                while j < len(gate) and not gate[j] in accepted_operators:
-                    if not gate[j] in accepted_numbers:
-                        raise SyntaxError("invalid syntax. \"%s\" "
-                                          "has invalid character \"%s\" "
-                                          "at index %s"
-                                          % (gate, gate[j], str(j)))
-                    j += 1
-                for cycle in range(int(int(gate[i + 1:j]) % dim)):
-                    basis_order = basis_order[dim - 1:] + basis_order[:-1]
-            elif gate[i] == "-":
-                j = i + 1
-                while j < len(gate) and not gate[j] in accepted_operators:
-                    if not gate[j] in accepted_numbers:
-                        raise SyntaxError("invalid syntax. \"%s\" "
-                                          "has invalid character \"%s\" "
-                                          "at index %s"
-                                          % (gate, gate[j], str(j)))
-                    j += 1
-                for cycle in range(int(int(gate[i + 1:j]) % dim)):
-                    basis_order = basis_order[1:] + basis_order[:1]
-            elif (gate[i] == "," or gate[i] == " ") and k != -1:
-                j = i + 1
-                while j < len(gate) and gate[j] == " ":
-                    j += 1
-                while j < len(gate) and not gate[j] in accepted_operators:
-                    if not gate[j] in accepted_numbers:
-                        raise SyntaxError("invalid syntax. \"%s\" "
-                                          "has invalid character \"%s\" "
-                                          "at index %s"
-                                          % (gate, gate[j], str(j)))
-                    j += 1
-                if int(gate[k:i]) > dim or int(gate[i:j]) > dim:
-                    raise IndexError("list index out of range. \"%s\" "
-                                     "has invalid operands \"%s\" and \"%s\""
-                                     % (gate, gate[k:i], gate[i:j]))
-                basis_order[int(gate[k:i])] ^= basis_order[int(gate[i:j])]
-                basis_order[int(gate[i:j])] ^= basis_order[int(gate[k:i])]
-                basis_order[int(gate[k:i])] ^= basis_order[int(gate[i:j])]
-                k = -1
-            elif gate[i] in accepted_numbers:
-                if k == -1:
-                    k = i
-            else:
-                error = True
-            if error:
-                raise SyntaxError("invalid syntax. \"%s\" "
-                                  "has invalid character \"%s\" "
-                                  "at index %s"
-                                  % (gate, gate[i], str(i)))
-        return basis_order
+        return Permutation.parse(gate, dim).order
 
     @staticmethod
-    def X_gate(gate: str = "", dim: int = 3):
+    def X_gate(gate: str = "", dim: int = 3, sparse: bool = False):
         """
         Creates the Pauli-X gate:
         :math:`X|k⟩ = |k+1⟩`\n
@@ -440,31 +383,26 @@ class QuantumCircuitMatrix(object):
                [1, 0, 0]])
 
         :param gate: The permutation of the standard basis states in format:
-            "+num", "-num", or "num,num,...,num"
+            "+num", "-num", "num,num,...,num", or "(num num ... num)", see
+            Permutation.parse
         :type gate: str
         :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
             defaults to 3
         :type dim: int
+        :param sparse: Whether to return sparse matrices, defaults to False;
+            None chooses by fill ratio; always dense if scipy is not installed
+        :type sparse: bool
         :returns: The specified Pauli-X gate for a single qudit, or all
             non-trivial permutations of the standard basis states if none
             specified thereof
-        :rtype: np.ndarray or list[np.ndarray]
+        :rtype: np.ndarray or sp.csr_matrix or list[np.ndarray]
         """
-        kets = QuantumCircuitMatrix.ket_basis(dim)
+        if sp is None:
+            sparse = False
         if len(gate) == 0:
-            basis_states = list()
-            for permutation in list(permutations(range(dim))):
-                if permutation != tuple(range(dim)):
-                    basis_state = kets[permutation[0]]
-                    for elem_order in permutation[1:]:
-                        basis_state = np.concatenate(
-                            [basis_state, kets[elem_order]], axis=1)
-                    basis_states.append(basis_state)
-            return basis_states
-        basis_order = QuantumCircuitMatrix.\
-            gate_perm_order(gate=gate, dim=dim, gate_name="Pauli_X_gate")
-        return np.concatenate([basis for order, basis in
-                               sorted(zip(basis_order, kets))], 1).astype(int)
+            return [permutation.matrix(sparse) for permutation in
+                    Permutation.symmetric_group(dim, nontrivial=True)]
+        return Permutation.parse(gate, dim).matrix(sparse)
 
     @staticmethod
     def Z_gate(dim: int = 3):
@@ -483,10 +421,22 @@ class QuantumCircuitMatrix(object):
         :return: Pauli-Z gate for a single qudit
         :rtype: np.ndarray
         """
+        return np.diag(QuantumCircuitMatrix.Z_diagonal(dim))
+
+    @staticmethod
+    def Z_diagonal(dim: int = 3):
+        """
+        The diagonal of the Pauli-Z gate:
+        :math:`(1, ω, ..., ω^{d-1})`
+
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The diagonal of the Pauli-Z gate for a single qudit
+        :rtype: np.ndarray
+        """
         omega = np.e ** (2 * np.pi * 1j / dim)
-        kets = QuantumCircuitMatrix.ket_basis(dim)
-        return np.concatenate([(omega ** k) * ket
-                               for ket, k in zip(kets, range(dim))], 1)
+        return omega ** np.arange(dim)
 
     # TODO: add Clifford unitaries (Definition 2.3 on pg 3)
 
@@ -503,12 +453,24 @@ class QuantumCircuitMatrix(object):
         :return: The Z phase shift gate for a single qutrit
         :rtype: np.ndarray
         """
+        return np.diag(QuantumCircuitMatrix.Z_phase_diagonal(a, b))
+
+    @staticmethod
+    def Z_phase_diagonal(a: Real, b: Real):
+        """
+        The diagonal of the Z phase shift gate for a single qutrit:\n
+        :math:`(1, ω^a, ω^b)`
+
+        :param a: A power to raise ω
+        :type a: Real
+        :param b: A power to raise ω
+        :type b: Real
+        :return: The diagonal of the Z phase shift gate for a single qutrit
+        :rtype: np.ndarray
+        """
         dim = 3
         omega = np.e ** (2 * np.pi * 1j / dim)
-        kets = QuantumCircuitMatrix.ket_basis(dim)
-        return np.concatenate(kets[:1] +
-                              [np.power(omega, k) * ket
-                               for ket, k in zip(kets[1:], [a, b])], 1)
+        return np.power(omega, np.array([0, a, b]))
 
     @staticmethod
     def S_gate():
@@ -521,31 +483,35 @@ class QuantumCircuitMatrix(object):
         return QuantumCircuitMatrix.Z_phase_gate(0, 1)
 
     @staticmethod
-    def H_gate():
+    def H_gate(dim: int = 3):
         """
-        The Hadamard gate for a single qutrit\n
-        maps :math:`|0⟩ ⟼ |+⟩, |0⟩ ⟼ |ω⟩, and |2⟩ ⟼ |ω^2⟩`
+        The Hadamard gate for a single qudit, i.e. the quantum Fourier
+        transform :math:`H|k⟩ = \\frac{1}{\\sqrt{d}}\\sum_j ω^{jk}|j⟩`,
+        which maps :math:`|0⟩ ⟼ |+⟩, |1⟩ ⟼ |ω⟩, and |2⟩ ⟼ |ω^2⟩` for qutrits
 
-        :return: The Hadamard gate for a single qutrit
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The Hadamard gate for a single qudit
         :rtype: np.ndarray
         """
-        dim = 3
         omega = np.e ** (2 * np.pi * 1j / dim)
-        o = omega
-        return np.array([[1, 1,    1   ],
-                         [1, o,    o**2],
-                         [1, o**2, o   ]]) / np.sqrt(3)
+        digits = np.arange(dim)
+        return omega ** (np.outer(digits, digits) % dim) / np.sqrt(dim)
 
     @staticmethod
-    def H_dagger_gate():
+    def H_dagger_gate(dim: int = 3):
         """
-        The inverse Hadamard gate or :math:`H^†` for a single qutrit\n
+        The inverse Hadamard gate or :math:`H^†` for a single qudit\n
         :math:`H^† = H^3`
 
-        :return: The Hadamard gate for a single qutrit
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The inverse Hadamard gate for a single qudit
         :rtype: np.ndarray
         """
-        return QuantumCircuitMatrix.H_gate() ** 3
+        return Misc.T(QuantumCircuitMatrix.H_gate(dim))
 
     @staticmethod
     def X_phase_gate(a: Real, b: Real):
@@ -566,20 +532,70 @@ class QuantumCircuitMatrix(object):
         return np.dot(np.dot(H, Z_phase(a, b)), H_dag)
 
     @staticmethod
-    def CX_gate():
+    def CX_gate(sparse: bool = False):
         """
         The qutrit CX is the two-qutrit gate defined by
         :math:`CX |i, j⟩ = |i, i + j⟩`
         where the addition is taken modulo 3.\n
         :math:`CX = Λ(X_{+1})`
 
+        :param sparse: Whether to return a sparse matrix, defaults to False;
+            None chooses by fill ratio
+        :type sparse: bool
         :return: The qutrit CX gate
-        :rtype: np.ndarray
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        return QuantumCircuitMatrix.c_gate(
+            QuantumCircuitMatrix.X_gate("+1", sparse=sparse), sparse=sparse)
+
+    @staticmethod
+    def swap_gate(dim: int = 3, sparse: bool = False):
         """
-        return QuantumCircuitMatrix.c_gate(QuantumCircuitMatrix.X_gate("+1"))
+        The two-qudit SWAP gate:
+        :math:`SWAP |i, j⟩ = |j, i⟩`
+
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param sparse: Whether to return a sparse matrix, defaults to False;
+            None chooses by fill ratio
+        :type sparse: bool
+        :return: The SWAP gate
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        i, j = np.divmod(np.arange(dim ** 2), dim)
+        if sparse is not False and sp is not None:
+            return Misc.auto_format(sp.csr_matrix(
+                (np.ones(dim ** 2, dtype=int), (j * dim + i, i * dim + j)),
+                shape=(dim ** 2, dim ** 2)), sparse)
+        gate = np.zeros([dim ** 2, dim ** 2], dtype=int)
+        gate[j * dim + i, i * dim + j] = 1
+        return gate
 
     @staticmethod
-    def two_ket_c_gate(U: np.ndarray):
+    def controlled_blocks(blocks: list, sparse: bool = False):
+        """
+        Creates a gate which applies blocks[c] to the last qudits when the
+        first qudit is in the state |c⟩:\n
+        :math:`Σ_c |c⟩⟨c| ⊗ blocks[c]`
+
+        :param blocks: The unitary to apply for each control state
+        :type blocks: list[np.ndarray or sp.spmatrix]
+        :param sparse: Whether to return a sparse matrix, defaults to False;
+            None chooses by fill ratio
+        :type sparse: bool
+        :return: The controlled gate
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        if sparse is not False and sp is not None:
+            return Misc.auto_format(
+                sp.block_diag(blocks, format="csr"), sparse)
+        kets = QuantumCircuitMatrix.ket_basis(len(blocks))
+        return sum([np.kron(np.kron(ket, Misc.T(ket)), Misc.to_dense(block))
+                    for ket, block in zip(kets, blocks)])
+
+    @staticmethod
+    def two_ket_c_gate(U: np.ndarray, sparse: bool = False):
         """
         Creates |2⟩-controlled gates where U is implemented on the last qutrits
         if and only if the first qutrit is in the |2⟩ state\n
@@ -588,44 +604,34 @@ class QuantumCircuitMatrix(object):
         |2⟩ ⊗ |ψ⟩ ⟼ |2⟩ ⊗ U|ψ⟩
 
         :param U: A qutrit unitary
-        :type U: np.ndarray
+        :type U: np.ndarray or sp.spmatrix
+        :param sparse: Whether to return a sparse matrix, defaults to False;
+            None chooses by fill ratio
+        :type sparse: bool
         :return: The |2⟩-U gate
-        :rtype: np.ndarray
+        :rtype: np.ndarray or sp.csr_matrix
         """
-        get_prod = QuantumCircuitMatrix.get_prod
-        zero_prod = get_prod(0, 0)  # |0⟩⟨0|
-        one_prod = get_prod(1, 1)   # |1⟩⟨1|
-        two_prod = get_prod(2, 2)   # |2⟩⟨2|
-        gate = np.kron(zero_prod, zero_prod)\
-               + np.kron(zero_prod, one_prod)\
-               + np.kron(zero_prod, two_prod)\
-               + np.kron(one_prod, zero_prod)\
-               + np.kron(one_prod, one_prod)\
-               + np.kron(one_prod, two_prod)\
-               + np.kron(two_prod, U)
-        return gate
+        identity = np.identity(U.shape[0], dtype=int)
+        return QuantumCircuitMatrix.controlled_blocks(
+            [identity, identity, U], sparse)
 
     @staticmethod
-    def c_gate(U: np.ndarray):
+    def c_gate(U: np.ndarray, sparse: bool = False):
         """
         Creates a controlled gate\n
         :math:`Λ(U)|c⟩|t⟩ := |c⟩ ⊗ (U^c|t⟩).`
 
         :param U: A qutrit unitary
-        :type U: np.ndarray
+        :type U: np.ndarray or sp.spmatrix
+        :param sparse: Whether to return a sparse matrix, defaults to False;
+            None chooses by fill ratio
+        :type sparse: bool
         :return: The |2⟩-U gate
-        :rtype: np.ndarray
+        :rtype: np.ndarray or sp.csr_matrix
         """
-        get_prod = QuantumCircuitMatrix.get_prod
-        zero_prod = get_prod(0, 0)  # |0⟩⟨0|
-        one_prod = get_prod(1, 1)   # |1⟩⟨1|
-        two_prod = get_prod(2, 2)   # |2⟩⟨2|
-        gate = np.kron(zero_prod, zero_prod)\
-               + np.kron(zero_prod, one_prod)\
-               + np.kron(zero_prod, two_prod)\
-               + np.kron(one_prod, U)\
-               + np.kron(two_prod, np.dot(U, U))
-        return gate
+        identity = np.identity(U.shape[0], dtype=int)
+        return QuantumCircuitMatrix.controlled_blocks(
+            [identity, U, Misc.dot(U, U)], sparse)
 
     @staticmethod
     def T_gate():
@@ -684,8 +690,8 @@ class QuantumCircuitMatrix(object):
         :return: The square matrix for qutrits
         :rtype: np.ndarray
         """
-        num_bits = QuantumCircuitMatrix.qutrits_to_bits(num_qutrits)
-        qutrit_matrix = np.zeros([num_bits, num_bits])
+        size = QuditRegister.uniform(num_qutrits).size
+        qutrit_matrix = np.zeros([size, size])
         for argv in args:
             qutrit_matrix[argv, argv] = 1
         if len(args) == 0:
@@ -704,8 +710,8 @@ class QuantumCircuitMatrix(object):
         :return: The column vector for qutrits
         :rtype: np.ndarray
         """
-        num_bits = QuantumCircuitMatrix.qutrits_to_bits(num_qutrits)
-        qutrit_matrix = np.zeros([1, num_bits])
+        size = QuditRegister.uniform(num_qutrits).size
+        qutrit_matrix = np.zeros([1, size])
         for argv in args:
             qutrit_matrix[0, argv] = 1
         if len(args) == 0:
@@ -713,16 +719,35 @@ class QuantumCircuitMatrix(object):
         return qutrit_matrix.T
 
     @staticmethod
-    def invert_matrix(matrix):
+    def invert_matrix(matrix, unitary: bool = None):
         """
-        Calculates the inverse of a matrix
+        Calculates the inverse of a matrix.\n
+        Monomial (e.g. permutation and diagonal) matrices are inverted in
+        closed form and unitary matrices by their conjugate transpose, so
+        numpy.linalg.inv is only used for other matrices.
 
         :param matrix: A square matrix
         :type matrix: np.ndarray
+        :param unitary: Whether the matrix is unitary, defaults to checking
+        :type unitary: bool
         :return: The inverse of matrix
         :rtype np.ndarray:
         """
         from numpy.linalg import inv
+        nonzero = matrix != 0
+        if np.all(nonzero.sum(axis=0) == 1) \
+                and np.all(nonzero.sum(axis=1) == 1):
+            rows = nonzero.argmax(axis=0)
+            columns = np.arange(len(rows))
+            inverse = np.zeros(matrix.shape, dtype=np.result_type(
+                matrix.dtype, float))
+            inverse[columns, rows] = 1 / matrix[rows, columns]
+            return inverse
+        if unitary is None:
+            unitary = Precision.allclose(np.dot(matrix, Misc.T(matrix)),
+                                         np.identity(len(matrix)))
+        if unitary:
+            return Misc.T(matrix)
         return inv(matrix)
 
     @staticmethod
@@ -0,0 +1,237 @@
+"""
+Qudit Register
+
+Labels the standard basis states of registers of qudits of mixed dimensions
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class QuditRegister(object):
+    """A register of qudits of mixed dimensions, e.g. (3, 3, 2) for two
+    qutrits and a qubit. The standard basis states are labelled by their
+    dits, with qudit 0 the most significant as in the Kronecker product,
+    and are encoded to and decoded from their indices in the state vector
+    with precomputed strides."""
+    __slots__ = ("_dims", "_strides")
+
+    def __init__(self, dims: Iterable[int]):
+        """
+        Creates a new qudit register
+
+        :param dims: The dimension of each qudit (ie: qubit=2 and qutrit=3)
+        :type dims: Iterable[int]
+        :raises ValueError: A dimension is less than 1
+        """
+        dims = tuple(int(d) for d in dims)
+        if any(d < 1 for d in dims):
+            raise ValueError("qudit dimensions must be positive, not %s"
+                             % list(dims))
+        self._dims = dims
+        strides = np.ones(len(dims), dtype=np.int64)
+        if len(dims) > 1:
+            strides[:-1] = np.cumprod(dims[:0:-1])[::-1]
+        strides.setflags(write=False)
+        self._strides = strides
+
+    @staticmethod
+    def uniform(num_qudits: int, dim: int = 3):
+        """
+        Creates a register of qudits of the same dimension
+
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The qudit register
+        :rtype: QuditRegister
+        """
+        return QuditRegister((dim,) * num_qudits)
+
+    @property
+    def dims(self):
+        """
+        Gets the dimension of each qudit
+
+        :return: The dimension of each qudit
+        :rtype: tuple[int]
+        """
+        return self._dims
+
+    @property
+    def shape(self):
+        """
+        Gets the shape of state tensors of the register
+
+        :return: The shape of state tensors
+        :rtype: tuple[int]
+        """
+        return self._dims
+
+    @property
+    def strides(self):
+        """
+        Gets the index stride of each qudit
+
+        :return: The index stride of each qudit
+        :rtype: np.ndarray
+        """
+        return self._strides
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return len(self._dims)
+
+    @property
+    def size(self):
+        """
+        Gets the number of standard basis states
+
+        :return: The number of standard basis states
+        :rtype: int
+        """
+        return int(np.prod(self._dims, dtype=np.int64))
+
+    def encode(self, dits: np.ndarray):
+        """
+        Encodes the dits of standard basis states as their indices
+
+        :param dits: The dits of one or more standard basis states, with the
+            qudits along the last axis
+        :type dits: np.ndarray
+        :raises ValueError: A dit is out of range for its qudit
+        :return: The indices of the standard basis states
+        :rtype: np.ndarray or int
+        """
+        dits = np.asarray(dits, dtype=np.int64)
+        if dits.shape[-1:] != (self.num_qudits,):
+            raise ValueError("expected %s dits per state, not shape %s"
+                             % (self.num_qudits, dits.shape))
+        if ((dits < 0) | (dits >= self._dims)).any():
+            raise ValueError("dits out of range for dimensions %s"
+                             % list(self._dims))
+        indices = dits @ self._strides
+        return int(indices) if indices.ndim == 0 else indices
+
+    def decode(self, indices: np.ndarray, dtype: np.dtype = np.int64):
+        """
+        Decodes the indices of standard basis states into their dits
+
+        :param indices: The indices of one or more standard basis states
+        :type indices: np.ndarray or int
+        :param dtype: The integer type of the dits, e.g. np.uint8 to decode
+            many samples in little memory, defaults to np.int64
+        :type dtype: np.dtype
+        :raises ValueError: An index is out of range
+        :return: The dits of the standard basis states, with the qudits along
+            the last axis
+        :rtype: np.ndarray
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if ((indices < 0) | (indices >= self.size)).any():
+            raise ValueError("indices out of range for %s states" % self.size)
+        dits = np.empty(indices.shape + (self.num_qudits,), dtype=dtype)
+        quotients = indices.astype(np.min_scalar_type(self.size))
+        for i in range(self.num_qudits - 1, -1, -1):
+            quotients, dits[..., i] = np.divmod(quotients, self._dims[i])
+        return dits
+
+    def dit_dtype(self):
+        """
+        Gets the smallest unsigned integer type which holds every dit
+
+        :return: The integer type
+        :rtype: np.dtype
+        """
+        return np.min_scalar_type(max(self._dims, default=1) - 1)
+
+    def labels(self):
+        """
+        Gets the dits of every standard basis state in order
+
+        :return: The dits, with one row per standard basis state
+        :rtype: np.ndarray
+        """
+        return self.decode(np.arange(self.size))
+
+    def label(self, index: int):
+        """
+        Gets the label of a standard basis state, e.g. "012"
+
+        :param index: The index of the standard basis state
+        :type index: int
+        :return: The label
+        :rtype: str
+        """
+        return "".join(map(str, self.decode(index).tolist()))
+
+    def permute(self, axes: Iterable[int]):
+        """
+        Gets the register with its qudits reordered
+
+        :param axes: The qudit of this register at each position of the new
+            register, as in np.transpose
+        :type axes: Iterable[int]
+        :return: The reordered register
+        :rtype: QuditRegister
+        """
+        return QuditRegister(self._dims[a] for a in axes)
+
+    def permutation(self, axes: Iterable[int]):
+        """
+        Gets the indices of this register's standard basis states in the
+        order of the reordered register, so that state[permutation] is the
+        state vector of the reordered register
+
+        :param axes: The qudit of this register at each position of the new
+            register, as in np.transpose
+        :type axes: Iterable[int]
+        :return: The indices
+        :rtype: np.ndarray
+        """
+        axes = list(axes)
+        return np.arange(self.size).reshape(self._dims).transpose(axes)\
+            .reshape(-1)
+
+    def ket(self, dits: Iterable[int]):
+        """
+        Gets the ket of a standard basis state
+
+        :param dits: The dits of the standard basis state
+        :type dits: Iterable[int]
+        :return: The ket
+        :rtype: np.ndarray
+        """
+        ket = np.zeros([self.size, 1])
+        ket[self.encode(list(dits)), 0] = 1
+        return ket
+
+    def __len__(self):
+        return self.num_qudits
+
+    def __eq__(self, other):
+        return isinstance(other, QuditRegister) and self._dims == other.dims
+
+    def __hash__(self):
+        return hash(self._dims)
+
+    def __repr__(self):
+        return "QuditRegister(%s)" % (self._dims,)
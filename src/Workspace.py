@@ -0,0 +1,219 @@
+"""
+Workspace
+
+Reusable aligned buffers for the intermediate states and matrix products
+of simulation and composition loops
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import threading
+from typing import Iterable
+
+import numpy as np
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class Workspace(object):
+    """Hands out reusable aligned buffers from named slots. Each slot keeps
+    one block of memory which only grows, so once a planner has reserved
+    the slots for the largest arrays of a loop, e.g. a simulator for its
+    state tensor, the loop makes no new large allocations. Kernels write
+    their results into whichever of a pair of slots does not hold their
+    input (ping-pong buffering), so the arrays they return are only valid
+    until the next result written to the same slot. A workspace is
+    activated for the current thread with a with statement, and kernels
+    only use the workspace active in their own thread."""
+    alignment = 64
+    """The alignment of the buffers in bytes, e.g. a cache line"""
+    state_slots = ("ping", "pong")
+    """The pair of slots of state tensors"""
+    local = threading.local()
+    """The active workspace of each thread"""
+
+    def __init__(self):
+        """
+        Creates a new empty workspace
+        """
+        self.slots = dict()
+        self.allocations = 0
+        self.peak_bytes = 0
+        self.previous = list()
+
+    @staticmethod
+    def current():
+        """
+        Gets the workspace active in the current thread
+
+        :return: The active workspace, or None if there is none
+        :rtype: Workspace
+        """
+        return getattr(Workspace.local, "workspace", None)
+
+    @staticmethod
+    def aligned(nbytes: int, alignment: int = None):
+        """
+        Allocates a block of memory whose start is aligned
+
+        :param nbytes: The size of the block in bytes
+        :type nbytes: int
+        :param alignment: The alignment in bytes, defaults to
+            Workspace.alignment
+        :type alignment: int
+        :return: The block of memory
+        :rtype: np.ndarray
+        """
+        if alignment is None:
+            alignment = Workspace.alignment
+        raw = np.empty(nbytes + alignment, dtype=np.uint8)
+        offset = -raw.ctypes.data % alignment
+        return raw[offset:offset + nbytes]
+
+    @property
+    def nbytes(self):
+        """
+        Gets the total size of the slots in bytes
+
+        :return: The size of the slots
+        :rtype: int
+        """
+        return sum(block.nbytes for block in self.slots.values())
+
+    def reserve(self, shape: tuple[int], dtype: np.dtype,
+                slots: Iterable[str] = None):
+        """
+        Grows slots so that each holds an array, e.g. so that a simulator's
+        ping-pong slots and scratch slot hold its state tensor
+
+        :param shape: The shape of the array
+        :type shape: tuple[int]
+        :param dtype: The dtype of the array
+        :type dtype: np.dtype
+        :param slots: The slots, defaults to the state slots and "scratch"
+        :type slots: Iterable[str]
+        """
+        if slots is None:
+            slots = Workspace.state_slots + ("scratch",)
+        for slot in slots:
+            self.buffer(slot, shape, dtype)
+
+    def buffer(self, slot: str, shape: tuple[int], dtype: np.dtype):
+        """
+        Gets an array in a slot, growing the slot if it is too small.\n
+        * Note: The array is uninitialized and shares the slot's memory with
+        every other array handed out from the slot.
+
+        :param slot: The name of the slot
+        :type slot: str
+        :param shape: The shape of the array
+        :type shape: tuple[int]
+        :param dtype: The dtype of the array
+        :type dtype: np.dtype
+        :return: The array
+        :rtype: np.ndarray
+        """
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        block = self.slots.get(slot)
+        if block is None or block.nbytes < nbytes:
+            block = Workspace.aligned(nbytes)
+            self.slots[slot] = block
+            self.allocations += 1
+            self.peak_bytes = max(self.peak_bytes, self.nbytes)
+        return block[:nbytes].view(dtype).reshape(shape)
+
+    def output(self, shape: tuple[int], dtype: np.dtype, source: np.ndarray,
+               slots: tuple[str, str] = None):
+        """
+        Gets an array for the result of an operation in whichever of a pair
+        of slots does not hold its source
+
+        :param shape: The shape of the result
+        :type shape: tuple[int]
+        :param dtype: The dtype of the result
+        :type dtype: np.dtype
+        :param source: The source array of the operation
+        :type source: np.ndarray
+        :param slots: The pair of slots, defaults to the state slots
+        :type slots: tuple[str, str]
+        :return: The array
+        :rtype: np.ndarray
+        """
+        if slots is None:
+            slots = Workspace.state_slots
+        slot = slots[1] if self.holds(slots[0], source) else slots[0]
+        return self.buffer(slot, shape, dtype)
+
+    def holds(self, slot: str, array: np.ndarray):
+        """
+        Checks if an array may share memory with a slot
+
+        :param slot: The name of the slot
+        :type slot: str
+        :param array: An array
+        :type array: np.ndarray
+        :return: If the array may share memory with the slot
+        :rtype: bool
+        """
+        block = self.slots.get(slot)
+        return block is not None and isinstance(array, np.ndarray) \
+            and np.may_share_memory(block, array)
+
+    def owns(self, array: np.ndarray):
+        """
+        Checks if an array may share memory with any slot, in which case it
+        must be copied before the workspace is reused
+
+        :param array: An array
+        :type array: np.ndarray
+        :return: If the array may share memory with a slot
+        :rtype: bool
+        """
+        return any(self.holds(slot, array) for slot in self.slots)
+
+    def detach(self, array: np.ndarray, target: np.ndarray = None):
+        """
+        Copies an array out of the slots, e.g. the final state of a loop, so
+        that the workspace may be reused
+
+        :param array: An array
+        :type array: np.ndarray
+        :param target: An array outside the slots of the same shape and dtype
+            to copy into, e.g. the initial state of the loop, defaults to a
+            new array
+        :type target: np.ndarray
+        :return: The array, or its copy if it shares memory with a slot
+        :rtype: np.ndarray
+        """
+        if not self.owns(array):
+            return array
+        if target is None or target.shape != array.shape \
+                or target.dtype != array.dtype or self.owns(target):
+            return array.copy()
+        np.copyto(target, array)
+        return target
+
+    def release(self):
+        """
+        Frees the slots
+        """
+        self.slots = dict()
+
+    def __enter__(self):
+        self.previous.append(Workspace.current())
+        Workspace.local.workspace = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        Workspace.local.workspace = self.previous.pop()
+
+    def __repr__(self):
+        return "Workspace(%s slots, %s bytes, peak %s bytes, %s allocations)" \
+               % (len(self.slots), self.nbytes, self.peak_bytes,
+                  self.allocations)
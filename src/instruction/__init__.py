@@ -7,13 +7,18 @@ Author: Alex Lim
 
 """
 
-from itertools import product
+import hashlib
+import weakref
+from copy import copy
 from typing import Iterable
 
 import numpy as np
 import pandas as pd
 
-from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+from src.MiscFunctions import MiscFunctions as Misc, sp
+from src.Precision import Precision
+from src.QuditRegister import QuditRegister
+from src.simulator.kernels import StateVectorKernels
 
 __author__      = "Alex Lim"
 __credits__     = "Alex Lim"
@@ -22,9 +27,14 @@ __maintainer__  = "Alex Lim"
 
 class Instruction(object):
     """Enables instruction functionality for the BitOQutritSim package."""
+    __slots__ = ("_name", "_instructions", "_num_qudits", "_dim", "_qudits",
+                 "_version")
+    interned = weakref.WeakValueDictionary()
+
     def __init__(self, name: str = None,
                  instructions: tuple['Instruction'] = None,
-                 num_qudits: int = None, dim: int = 3):
+                 num_qudits: int = None, dim: int = 3,
+                 qudits: Iterable[int] = None):
         """
         Creates a new instruction
 
@@ -34,16 +44,23 @@ class Instruction(object):
         :type instructions: Instruction
         :param num_qudits: The number of qudits
         :type num_qudits: int
-        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit for qudits of mixed dimensions,
             defaults to 3
-        :type dim: int
+        :type dim: int or Iterable[int]
+        :param qudits: The qudits of the enclosing instruction that this
+            instruction acts on, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
         """
         self._name = name
         self._instructions = None
         self._num_qudits = None
-        self._dim = dim
+        self._dim = Instruction.normalize_dim(dim)
+        self._qudits = None
+        self._version = 0
         self.instructions = instructions
         self.num_qudits = num_qudits
+        self.qudits = qudits
 
     def __str__(self):
         """
@@ -100,11 +117,23 @@ class Instruction(object):
         """
         Gets the dimension of the qudit (ie: qubit=2 and qutrit=3)
 
-        :return: The qudit's dimension
-        :rtype: int
+        :return: The qudit's dimension, or the dimension of each qudit for
+            qudits of mixed dimensions
+        :rtype: int or tuple[int]
         """
         return self._dim
 
+    @property
+    def dims(self):
+        """
+        Gets the dimension of each qudit
+
+        :return: The dimension of each qudit, or None if the number of qudits
+            is unknown
+        :rtype: tuple[int]
+        """
+        return Instruction.qudit_dims(self.dim, self.num_qudits)
+
     @property
     def num_qudits(self):
         """
@@ -115,6 +144,29 @@ class Instruction(object):
         """
         return self._num_qudits
 
+    @property
+    def qudits(self):
+        """
+        Gets the qudits of the enclosing instruction that this instruction
+        acts on
+
+        :return: The qudits, or None for the first num_qudits qudits
+        :rtype: tuple[int]
+        """
+        return self._qudits
+
+    @property
+    def version(self):
+        """
+        Gets the number of times the instruction's name, instructions, dim,
+        number of qudits, or qudits have been changed, which identifies the
+        state of the instruction for caches
+
+        :return: The version of the instruction
+        :rtype: int
+        """
+        return self._version
+
     @name.setter
     def name(self, name: str):
         """
@@ -124,6 +176,7 @@ class Instruction(object):
         :type name: str
         """
         self._name = name
+        self._version += 1
 
     @instructions.setter
     def instructions(
@@ -137,23 +190,30 @@ class Instruction(object):
         if instructions is None:
             self._instructions = None
         elif self.isinstruction(instructions):
+            if isinstance(instructions, np.ndarray):
+                instructions = Instruction.intern(instructions)
             self._instructions = tuple([instructions])
         elif all([self.isinstruction(instr) for instr in instructions]):
-            self._instructions = tuple(instructions)
+            self._instructions = tuple(
+                Instruction.intern(instr) if isinstance(instr, np.ndarray)
+                else instr for instr in instructions)
         else:
             raise ValueError("'%s' objects cannot be used as instructions"
                              % type(instructions))
+        self._version += 1
 
     @dim.setter
     def dim(self, dim: int = 3):
         """
         Sets the dimension of the qudit (ie: qubit=2 and qutrit=3)
 
-        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit for qudits of mixed dimensions,
             defaults to 3
-        :type dim: int
+        :type dim: int or Iterable[int]
         """
-        self._dim = dim
+        self._dim = Instruction.normalize_dim(dim)
+        self._version += 1
 
     @num_qudits.setter
     def num_qudits(self, num_qudits: int = None):
@@ -164,7 +224,444 @@ class Instruction(object):
             of required qudits
         :type num_qudits: int
         """
+        if num_qudits is None and isinstance(self.dim, tuple):
+            num_qudits = len(self.dim)
         self._num_qudits = num_qudits
+        self._version += 1
+
+    @qudits.setter
+    def qudits(self, qudits: Iterable[int] = None):
+        """
+        Sets the qudits of the enclosing instruction that this instruction
+        acts on
+
+        :param qudits: The qudits, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
+        """
+        if qudits is None:
+            self._qudits = None
+            self._version += 1
+            return
+        qudits = tuple(int(q) for q in qudits)
+        if len(set(qudits)) != len(qudits):
+            raise ValueError("%s acts on repeated qudits %s"
+                             % (str(self), str(qudits)))
+        if self.num_qudits is not None and len(qudits) != self.num_qudits:
+            raise ValueError("%s acts on %s qudits but was given qudits %s"
+                             % (str(self), self.num_qudits, str(qudits)))
+        self._qudits = qudits
+        self._version += 1
+
+    def resolved_qudits(self):
+        """
+        Gets the qudits of the enclosing instruction that this instruction
+        acts on, resolving the default to the first num_qudits qudits
+
+        :return: The qudits, or None if the number of qudits is unknown
+        :rtype: tuple[int]
+        """
+        if self.qudits is not None:
+            return self.qudits
+        if self.num_qudits is not None:
+            return tuple(range(self.num_qudits))
+        return None
+
+    @staticmethod
+    def intern(array: np.ndarray):
+        """
+        Gets the shared read-only copy of an array of gate data, so that gates
+        with equal matrices, diagonals, or permutations store them once. The
+        arrays are keyed by their dtype, shape, and a hash of their values,
+        and are dropped once no gate uses them.
+
+        :param array: A matrix, diagonal, permutation, or phases of a gate
+        :type array: np.ndarray
+        :return: The shared copy of the array, or the array itself if its
+            dtype cannot be compared by value
+        :rtype: np.ndarray
+        """
+        if array.dtype.kind not in "biufc":
+            return array
+        array = np.ascontiguousarray(array)
+        key = (array.dtype.str, array.shape,
+               hashlib.blake2b(array.data, digest_size=16).digest())
+        shared = Instruction.interned.get(key)
+        if shared is not None and np.array_equal(shared, array):
+            return shared
+        if shared is not None:
+            return array
+        shared = array.copy()
+        shared.setflags(write=False)
+        Instruction.interned[key] = shared
+        return shared
+
+    @staticmethod
+    def normalize_dim(dim: int or Iterable[int]):
+        """
+        Normalizes the dimension of qudits, where qudits of mixed dimensions
+        have the tuple of the dimension of each qudit
+
+        :param dim: The dimension of the qudits, or of each qudit
+        :type dim: int or Iterable[int]
+        :return: The dimension of the qudits, or of each qudit
+        :rtype: int or tuple[int]
+        """
+        if dim is None or isinstance(dim, (int, np.integer)):
+            return dim
+        return tuple(int(d) for d in dim)
+
+    @staticmethod
+    def qudit_dims(dim: int or Iterable[int], num_qudits: int = None):
+        """
+        Gets the dimension of each qudit
+
+        :param dim: The dimension of the qudits, or of each qudit
+        :type dim: int or Iterable[int]
+        :param num_qudits: The number of qudits, required if dim is an int
+        :type num_qudits: int
+        :return: The dimension of each qudit, or None if the number of qudits
+            is unknown
+        :rtype: tuple[int]
+        """
+        if dim is not None and not isinstance(dim, (int, np.integer)):
+            return tuple(int(d) for d in dim)
+        if dim is None or num_qudits is None:
+            return None
+        return (int(dim),) * num_qudits
+
+    @staticmethod
+    def controlled_dim(dim: int or Iterable[int], num_qudits: int,
+                       control_dim: int = None):
+        """
+        Gets the dimension of the qudits of an instruction controlled by a new
+        control qudit 0 followed by the instruction's qudits
+
+        :param dim: The dimension of the instruction's qudits, or of each
+            qudit
+        :type dim: int or Iterable[int]
+        :param num_qudits: The number of qudits of the instruction
+        :type num_qudits: int
+        :param control_dim: The dimension of the control qudit, defaults to
+            the dimension of the instruction's first qudit
+        :type control_dim: int
+        :return: The dimension of the qudits, or of each qudit for qudits of
+            mixed dimensions
+        :rtype: int or tuple[int]
+        :raises ValueError: The control qudit has less than two states
+        """
+        dims = Instruction.qudit_dims(dim, num_qudits)
+        if control_dim is None:
+            control_dim = dims[0]
+        if control_dim < 2:
+            raise ValueError("a control qudit needs at least 2 states, not %s"
+                             % (control_dim,))
+        if isinstance(dim, (int, np.integer)) and control_dim == dim:
+            return int(dim)
+        return (int(control_dim),) + dims
+
+    @staticmethod
+    def num_states(dim: int or Iterable[int], num_qudits: int = None):
+        """
+        Gets the number of standard basis states of qudits
+
+        :param dim: The dimension of the qudits, or of each qudit
+        :type dim: int or Iterable[int]
+        :param num_qudits: The number of qudits, required if dim is an int
+        :type num_qudits: int
+        :return: The number of standard basis states
+        :rtype: int
+        """
+        return int(np.prod(Instruction.qudit_dims(dim, num_qudits),
+                           dtype=np.int64))
+
+    @staticmethod
+    def infer_num_qudits(dim: int or Iterable[int], num_states: int):
+        """
+        Infers the number of qudits from the number of standard basis states
+
+        :param dim: The dimension of the qudits, or of each qudit
+        :type dim: int or Iterable[int]
+        :param num_states: The number of standard basis states
+        :type num_states: int
+        :return: The number of qudits
+        :rtype: int
+        """
+        if not isinstance(dim, (int, np.integer)):
+            return len(tuple(dim))
+        return int(round(np.log(num_states) / np.log(dim)))
+
+    def iscontainer(self):
+        """
+        Checks if the instruction only groups other instructions, so that it
+        is equivalent to its instructions
+
+        :return: If the instruction only groups other instructions
+        :rtype: bool
+        """
+        return type(self) is Instruction
+
+    def flatten(self):
+        """
+        Gets the gates of the instruction in matrix product order, with all
+        nested groups of instructions expanded and each gate acting on the
+        instruction's own qudits
+
+        :return: The gates of the instruction
+        :rtype: list[Instruction]
+        """
+        from src.instruction.compiled import CompiledCircuit
+        return CompiledCircuit(self).gates()
+
+    def on(self, qudits: Iterable[int]):
+        """
+        Returns a shallow copy of the instruction acting on other qudits of
+        the enclosing instruction
+
+        :param qudits: The qudits
+        :type qudits: Iterable[int]
+        :return: A shallow copy of the instruction
+        :rtype: Instruction
+        """
+        instruction = copy(self)
+        instruction.qudits = qudits
+        return instruction
+
+    def inverse(self):
+        """
+        Returns the inverse of the instruction, i.e. its instructions reversed
+        and inverted
+
+        :return: The inverse of the instruction
+        :rtype: Instruction
+        """
+        instruction = copy(self)
+        instruction.instructions = [
+            instr.inverse() if isinstance(instr, Instruction)
+            else Misc.T(instr) for instr in reversed(self.instructions)]
+        instruction.name = Instruction.inverse_name(self.name)
+        return instruction
+
+    def astype(self, dtype: np.dtype):
+        """
+        Returns a copy of the instruction whose matrices are cast to the dtype
+        of the complex states it is applied to, which the kernels would
+        otherwise cast them to on every application. Nested instructions are
+        not cast.
+
+        :param dtype: The dtype of the states
+        :type dtype: np.dtype
+        :return: The instruction, or a copy of it if any matrix was cast
+        :rtype: Instruction
+        """
+        if self.instructions is None \
+                or not np.issubdtype(dtype, np.complexfloating):
+            return self
+        instructions = tuple(
+            instr if isinstance(instr, Instruction)
+            else Precision.cast(instr, dtype) for instr in self.instructions)
+        if all(new is old for new, old in zip(instructions,
+                                              self.instructions)):
+            return self
+        instruction = copy(self)
+        instruction.instructions = instructions
+        return instruction
+
+    @staticmethod
+    def inverse_name(name: str):
+        """
+        Gets the name of the inverse of an instruction
+
+        :param name: The name of the instruction
+        :type name: str
+        :return: The name of the inverse of the instruction
+        :rtype: str
+        """
+        if name is None:
+            return None
+        if name.endswith("†"):
+            return name[:-1]
+        return name + "†"
+
+    def controlled(self, control_value: int = None, control_dim: int = None):
+        """
+        Returns the controlled version of the instruction, acting on a new
+        control qudit 0 followed by the instruction's qudits. Each instruction
+        is controlled separately, except for pairs of Clifford gates which
+        cancel (commuting them past Clifford gates on other qudits), which are
+        left uncontrolled as they are the identity when the control is off,
+        e.g. the Clifford gates A and A† of A·B·A† are never controlled.
+
+        :param control_value: The state of the control qudit for which the
+            instruction is applied, defaults to control_dim - 1 (ie: |2⟩ for
+            qutrits)
+        :type control_value: int
+        :param control_dim: The dimension of the control qudit, defaults to
+            the dimension of the instruction's first qudit
+        :type control_dim: int
+        :return: The controlled instruction
+        :rtype: Instruction
+        :raises ValueError: The control value is not a state of the control
+            qudit
+        """
+        from src.instruction.gate import Gate
+        if self.resolved_qudits() is None:
+            raise ValueError("%s.controlled() requires num_qudits to be set"
+                             % str(self))
+        dim = Instruction.controlled_dim(self.dim, len(self.resolved_qudits()),
+                                         control_dim)
+        control_dim = Instruction.qudit_dims(dim, 1)[0]
+        if control_value is None:
+            control_value = control_dim - 1
+        if not 0 <= control_value < control_dim:
+            raise ValueError("control value %s is not a valid state of a "
+                             "%s-dimensional qudit"
+                             % (control_value, control_dim))
+        instructions = list()
+        remaining = list()
+        cancelled = set()
+        for instr in self.instructions:
+            if not isinstance(instr, Instruction):
+                instr = Gate(None, instr, dim=self.dim)
+            instr = instr.on(tuple(q + 1 for q in instr.resolved_qudits()))
+            instructions.append(instr)
+            if not isinstance(instr, Gate) or not instr.is_clifford():
+                continue
+            for i in range(len(remaining) - 1, -1, -1):
+                index, other = remaining[i]
+                if other.isinverse(instr):
+                    cancelled.update((index, len(instructions) - 1))
+                    del remaining[i]
+                    break
+                if set(other.qudits) & set(instr.qudits):
+                    remaining.append((len(instructions) - 1, instr))
+                    break
+            else:
+                remaining.append((len(instructions) - 1, instr))
+        instructions = [instr if index in cancelled
+                        else instr.controlled(control_value, control_dim).on(
+                            (0,) + instr.qudits)
+                        for index, instr in enumerate(instructions)]
+        instruction = copy(self)
+        instruction.name = "C%s(%s)" % (control_value, self.name)
+        instruction.instructions = instructions
+        instruction.qudits = None
+        instruction.dim = dim
+        instruction.num_qudits = len(self.resolved_qudits()) + 1
+        return instruction
+
+    def order(self, max_order: int = 64):
+        """
+        Finds the smallest positive power of the instruction which is the
+        identity, if it is known without building the instruction's matrix
+
+        :param max_order: The largest order to consider, defaults to 64
+        :type max_order: int
+        :return: The order of the instruction, or None if it is unknown
+        :rtype: int
+        """
+        if len(self) == 1 and isinstance(self[0], Instruction) \
+                and self[0].resolved_qudits() in (None, self.resolved_qudits()):
+            return self[0].order(max_order)
+        return None
+
+    def power(self, k: int):
+        """
+        Raises the instruction to the power k by repeating its instructions,
+        after reducing k modulo the order of the instruction if it is known.
+        Negative powers repeat the inverse of the instruction, and the power
+        0 is the identity gate on the instruction's qudits.
+
+        :param k: The power
+        :type k: int
+        :raises TypeError: If k is not an integer
+        :raises ValueError: If k is 0 and the number of qudits is unknown
+        :return: The instruction to the power k
+        :rtype: Instruction
+        """
+        if not isinstance(k, (int, np.integer)):
+            raise TypeError("%s.power() needs an integer power, not %r"
+                            % (str(self), k))
+        if k < 0:
+            return self.inverse().power(-k)
+        order = self.order()
+        if order is not None:
+            k %= order
+        if k == 0:
+            return self.identity()
+        if k == 1:
+            return self
+        instruction = copy(self)
+        instruction.instructions = list(self.instructions) * k
+        instruction.name = Instruction.power_name(self.name, k)
+        return instruction
+
+    def identity(self):
+        """
+        Gets the identity gate on the instruction's qudits, e.g. its power 0
+
+        :raises ValueError: If the number of qudits is unknown
+        :return: The identity gate
+        :rtype: DiagonalGate
+        """
+        from src.instruction.diagonal_gate import DiagonalGate
+        if self.num_qudits is None:
+            raise ValueError("%s.identity() needs a number of qudits"
+                             % str(self))
+        return DiagonalGate(Instruction.power_name(self.name, 0),
+                            np.ones(Instruction.num_states(self.dims),
+                                    dtype=np.int8),
+                            self.num_qudits, self.dim, self.qudits)
+
+    @staticmethod
+    def power_name(name: str, k: int):
+        """
+        Gets the name of a power of an instruction
+
+        :param name: The name of the instruction
+        :type name: str
+        :param k: The power
+        :type k: int
+        :return: The name of the power of the instruction
+        :rtype: str
+        """
+        if name is None or k == 1:
+            return name
+        return "%s^%s" % (name, k)
+
+    def isinverse(self, other: 'Instruction'):
+        """
+        Checks if the instruction is exactly the inverse of another
+        instruction of the same enclosing instruction
+
+        :param other: Another instruction
+        :type other: Instruction
+        :return: If the product of the instructions is the identity
+        :rtype: bool
+        """
+        if not isinstance(other, Instruction) \
+                or self.resolved_qudits() != other.resolved_qudits() \
+                or self.dim != other.dim:
+            return False
+        product_matrix = Misc.to_dense(
+            Misc.dot(self.to_matrix(), other.to_matrix()))
+        return Precision.allclose(product_matrix,
+                                  np.identity(len(product_matrix)))
+
+    def local_axes(self, axes: tuple[int]):
+        """
+        Maps the axes of the enclosing instruction's state onto the axes this
+        instruction acts on
+
+        :param axes: The state axes of the enclosing instruction's qudits
+        :type axes: tuple[int]
+        :return: The state axes of this instruction's qudits
+        :rtype: tuple[int]
+        """
+        if self.qudits is not None:
+            return tuple(axes[q] for q in self.qudits)
+        if self.num_qudits is not None:
+            return tuple(axes[:self.num_qudits])
+        return tuple(axes)
 
     @classmethod
     def isinstruction(cls, obj: object):
@@ -176,7 +673,17 @@ class Instruction(object):
         :return: If obj is a valid instruction instance
         :rtype: bool
         """
-        return isinstance(obj, Instruction) or isinstance(obj, np.ndarray)
+        return isinstance(obj, Instruction) or isinstance(obj, np.ndarray) \
+            or Misc.is_sparse(obj)
+
+    def register(self):
+        """
+        Gets the register of the instruction's qudits
+
+        :return: The qudit register
+        :rtype: QuditRegister
+        """
+        return QuditRegister(self.dims)
 
     # TODO: implement choosing to switch which qudits are controls and targets
     # TODO: implement truth table to still function if matrix does not include all qudits
@@ -187,11 +694,11 @@ class Instruction(object):
         :return: The truth table
         :rtype: pd.DataFrame
         """
-        matrix_instr = self.to_matrix()
-        tbl_input = list(product(range(self.dim), repeat=self.num_qudits))
-        tbl_input = list(np.concatenate(tbl_input).flat)
-        data = [[inp, QCM.qudit_int(np.dot(matrix_instr, QCM.get_ket(inp)))]
-                for inp in tbl_input]
+        matrix_instr = Misc.to_dense(self.to_matrix())
+        register = self.register()
+        outputs = (np.abs(matrix_instr) > 1e-9).argmax(axis=0)
+        data = np.concatenate([register.labels(), register.decode(outputs)],
+                              axis=1)
         df = pd.DataFrame(data, columns=pd.MultiIndex.from_product(
             [['Input', 'Output'], list(range(self.num_qudits))],
             names=['', 'Qudit:']))
@@ -200,26 +707,58 @@ class Instruction(object):
         print(df)
         return df
 
-    def to_matrix(self):
+    def to_matrix(self, sparse: bool = None):
         """
-        Converts the instructions into matrix form
+        Converts the instructions into matrix form.\n
+        * Note: Products of sparse matrices are kept sparse, and the matrix of
+        every distinct subcircuit is only computed once.
 
+        :param sparse: Whether to return a sparse matrix, defaults to a dense
+            matrix if all instructions are dense and otherwise choosing by
+            fill ratio
+        :type sparse: bool
         :return: The instructions in matrix form
-        :rtype: np.ndarray
+        :rtype: np.ndarray or sp.csr_matrix
         """
         if len(self) == 0:
             raise TypeError("%s.to_matrix() missing 1 required instruction"
                             % str(self))
-        matrix_instr = 1
-        for instr in self.instructions:
-            if not isinstance(instr, np.ndarray):
-                instr = instr.to_matrix()
-            matrix_instr = np.dot(matrix_instr, instr)
-        return matrix_instr
+        from src.instruction.compiled import CompiledCircuit
+        return CompiledCircuit(self).unitary(sparse=sparse)
+
+    def apply(self, state: np.ndarray, axes: tuple[int] = None,
+              inplace: bool = False):
+        """
+        Applies the instructions to a state tensor of shape
+        (d_0, ..., d_{n-1}).\n
+        * Note: Instructions are stored in matrix product order, so the last
+        instruction is applied to the state first.
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param axes: The state axes of the instruction's qudits, defaults to
+            all axes
+        :type axes: tuple[int]
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        if axes is None:
+            axes = tuple(range(state.ndim))
+        for instr in reversed(self.instructions):
+            if isinstance(instr, Instruction):
+                state = instr.apply(state, instr.local_axes(axes), inplace)
+            else:
+                state = StateVectorKernels.apply_matrix(state, instr, axes,
+                                                        inplace=inplace)
+        return state
 
-    # TODO: implement this
     @staticmethod
-    def extend_gate(gate: 'Gate' or np.ndarray, num_qudits: int, dim: int = 3):
+    def extend_gate(gate: 'Gate' or np.ndarray, num_qudits: int, dim: int = 3,
+                    qudits: Iterable[int] = None):
         """
         Extends a quantum gate to have identity gates for all qudits that the
             quantum gate is not interacting with
@@ -231,30 +770,70 @@ class Instruction(object):
         :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
             defaults to 3
         :type dim: int
+        :param qudits: The qudits the gate acts on, defaults to the gate's
+            qudits or else the first qudits
+        :type qudits: Iterable[int]
         :return: The extended quantum gate
         :rtype: Gate or np.ndarray
         """
-        if isinstance(gate, np.ndarray):
-            return Instruction.extend_matrix(gate, num_qudits, dim)
+        if isinstance(gate, Instruction):
+            from src.instruction.gate import Gate
+            if qudits is None:
+                qudits = gate.qudits
+            if qudits is None:
+                qudits = range(gate.num_qudits)
+            return Gate(gate.name, Instruction.extend_matrix(
+                gate.to_matrix(), num_qudits, dim, qudits), num_qudits, dim)
+        return Instruction.extend_matrix(gate, num_qudits, dim, qudits)
 
-    # TODO: implement this
     @staticmethod
-    def extend_matrix(gate_matrix: np.ndarray, num_qudits: int, dim: int = 3):
+    def extend_matrix(gate_matrix: np.ndarray, num_qudits: int, dim: int = 3,
+                      qudits: Iterable[int] = None):
         """
         Extends a quantum gate matrix to have identity gates for all qudits
         that the quantum gate is not interacting with
 
         :param gate_matrix: The quantum gate matrix to be extended
-        :type gate_matrix: np.ndarray
+        :type gate_matrix: np.ndarray or sp.spmatrix
         :param num_qudits: The total number of qudits to extend the gate to
         :type num_qudits: int
-        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
-            defaults to 3
-        :type dim: int
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each of the num_qudits qudits, defaults to 3
+        :type dim: int or Iterable[int]
+        :param qudits: The qudits the gate acts on, defaults to the first
+            qudits
+        :type qudits: Iterable[int]
         :return: The extended quantum gate
-        :rtype: np.ndarray
-        """
-        pass
+        :rtype: np.ndarray or sp.spmatrix
+        """
+        dims = Instruction.qudit_dims(dim, num_qudits)
+        if qudits is None:
+            sizes = np.cumprod((1,) + dims)
+            if gate_matrix.shape[0] not in sizes:
+                raise ValueError("a gate of %s states cannot act on the "
+                                 "first qudits of %s" % (gate_matrix.shape[0],
+                                                         str(list(dims))))
+            qudits = range(int(np.flatnonzero(
+                sizes == gate_matrix.shape[0])[0]))
+        qudits = list(qudits)
+        gate_states = int(np.prod([dims[q] for q in qudits], dtype=np.int64))
+        if gate_states != gate_matrix.shape[0]:
+            raise ValueError("a gate of %s states cannot act on qudits %s"
+                             % (gate_matrix.shape[0], str(qudits)))
+        rest = [q for q in range(num_qudits) if q not in qudits]
+        if rest:
+            size = int(np.prod([dims[q] for q in rest], dtype=np.int64))
+            if Misc.is_sparse(gate_matrix):
+                identity = sp.identity(size, dtype=int, format="csr")
+            else:
+                identity = np.identity(size, dtype=int)
+            gate_matrix = Misc.kron(gate_matrix, identity)
+        order = qudits + rest
+        if order == list(range(num_qudits)):
+            return gate_matrix
+        perm = np.arange(gate_matrix.shape[0]).reshape(
+            [dims[q] for q in order]).transpose(np.argsort(order)).ravel()
+        return gate_matrix[perm][:, perm]
 
     # TODO: implement this method to display the quantum instructions like in Qiskit
     def display(self):
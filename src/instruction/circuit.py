@@ -12,6 +12,7 @@ Date of Initial Creation: January 4, 2022
 from typing import Iterable, overload
 
 from src.instruction import Instruction
+from src.instruction.name_index import NameIndex
 
 __author__      = "Alex Lim"
 __credits__     = "Alex Lim"
@@ -20,6 +21,8 @@ __maintainer__  = "Alex Lim"
 
 class Circuit(Instruction):
     """Creates quantum circuit objects"""
+    __slots__ = ("_resources", "_name_index")
+
     @overload
     def __init__(self, circuit: 'Circuit'):
         """
@@ -29,11 +32,12 @@ class Circuit(Instruction):
         :type circuit: Circuit
         """
         Instruction.__init__(self, circuit.name, circuit.instructions,
-                             circuit.num_qudits, circuit.dim)
+                             circuit.num_qudits, circuit.dim, circuit.qudits)
 
     def __init__(self, name: str = None,
                  instructions: tuple['Instruction'] = None,
-                 num_qudits: int = None, dim: int = 3):
+                 num_qudits: int = None, dim: int = 3,
+                 qudits: Iterable[int] = None):
         """
         Creates a new circuit
 
@@ -46,8 +50,59 @@ class Circuit(Instruction):
         :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
             defaults to 3
         :type dim: int
+        :param qudits: The qudits of the enclosing instruction that this
+            circuit acts on, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
+        """
+        Instruction.__init__(self, name, instructions, num_qudits, dim, qudits)
+
+    def __copy__(self):
+        """
+        Returns a shallow copy of the circuit, which does not share the
+        circuit's cached name index and resources, as they are updated in
+        place
+
+        :return: A shallow copy of the circuit
+        :rtype: Circuit
         """
-        Instruction.__init__(self, name, instructions, num_qudits, dim)
+        circuit = object.__new__(type(self))
+        for name in Instruction.__slots__:
+            setattr(circuit, name, getattr(self, name))
+        return circuit
+
+    def iscontainer(self):
+        """
+        Checks if the instruction only groups other instructions, which is
+        always the case for circuits
+
+        :return: True
+        :rtype: bool
+        """
+        return True
+
+    def resources(self):
+        """
+        Estimates the resources of the circuit from its compiled instruction
+        stream, see ResourceEstimator.estimate.\n
+        * Note: The estimate is cached until the circuit or any instruction
+        nested in it is changed, e.g. a gate's qudits or matrix.
+
+        :return: The gate count, gates by class and by number of controls,
+            T-count, Clifford count, depth, qudit width, and the estimated
+            bytes and FLOPs of each backend
+        :rtype: dict
+        """
+        from src.instruction.compiled import CompiledCircuit
+        from src.instruction.resources import ResourceEstimator
+        cached = getattr(self, "_resources", None)
+        if cached is not None and all(
+                instr.version == version for instr, version in cached[0]):
+            return cached[1]
+        compiled = CompiledCircuit(self)
+        resources = ResourceEstimator.estimate(compiled)
+        self._resources = ([(instr, instr.version) for instr in
+                            compiled.containers + compiled.leaves], resources)
+        return resources
 
     def clear(self):
         """Removes all instructions from the circuit"""
@@ -70,11 +125,18 @@ class Circuit(Instruction):
         :type instruction: Instruction
         """
         if isinstance(instruction, Instruction):
+            name_index = self.cached_name_index()
             instructions = list()
             if isinstance(self.instructions, Iterable):
                 instructions.extend(self.instructions)
             instructions.append(instruction)
             self._instructions = tuple(instructions)
+            self._version += 1
+            if name_index is not None:
+                name_index.add(self.instruction_name(instruction), len(self) - 1)
+                versions = self._name_index[2]
+                versions.append(self.instruction_version(instruction))
+                self._name_index = (self.version, name_index, versions)
         else:
             raise ValueError("'%s' objects cannot be used as instructions"
                              % type(instruction))
@@ -99,12 +161,21 @@ class Circuit(Instruction):
         :rtype: Instruction
         """
         if index is None:
-            index = len(self)
+            index = -1
+        name_index = self.cached_name_index()
         instructions = list()
         if isinstance(self.instructions, Iterable):
             instructions.extend(self.instructions)
         removed_instruction = instructions.pop(index)
         self.instructions = tuple(instructions)
+        if name_index is not None:
+            index %= len(instructions) + 1
+            name_index.discard(self.instruction_name(removed_instruction),
+                               index)
+            name_index.shift(index + 1, -1)
+            versions = self._name_index[2]
+            del versions[index]
+            self._name_index = (self.version, name_index, versions)
         return removed_instruction
 
     def index(self, name: str, case_sensitive: bool = True):
@@ -117,29 +188,95 @@ class Circuit(Instruction):
         :param case_sensitive: If the name is case-sensitive, defaults to True
         :type case_sensitive: bool
         """
-        for i in range(len(self)):
-            if str(self[i]) == name or \
-                    (not case_sensitive and (self[i]).lower() == name.lower()):
-                return i
-        raise ValueError("%s.index(%s): %s not in %s"
-                         % (str(self), name, name, str(self)))
+        positions = self.name_index().positions(name, case_sensitive)
+        if not positions:
+            raise ValueError("%s.index(%s): %s not in %s"
+                             % (str(self), name, name, str(self)))
+        return positions[0]
 
     def count(self, name: str, case_sensitive: bool = True):
         """
-        Returns the index of the first instruction in the circuit with a
-        matching name
+        Returns the number of instructions in the circuit with a matching name
 
         :param name: The name of the instruction
         :type name: str
         :param case_sensitive: If the name is case-sensitive, defaults to True
         :type case_sensitive: bool
         """
-        num_occurrences = 0
-        for i in range(len(self)):
-            if str(self[i]) == name or \
-                    (not case_sensitive and (self[i]).lower() == name.lower()):
-                num_occurrences += 1
-        return num_occurrences
+        return len(self.name_index().positions(name, case_sensitive))
+
+    def find(self, prefix: str, case_sensitive: bool = True):
+        """
+        Returns the indices of the instructions in the circuit whose name
+        starts with a prefix, e.g. "tcx" for every tcx* block
+
+        :param prefix: The prefix of the names of the instructions
+        :type prefix: str
+        :param case_sensitive: If the prefix is case-sensitive, defaults to
+            True
+        :type case_sensitive: bool
+        :return: The indices of the instructions
+        :rtype: list[int]
+        """
+        return self.name_index().prefix_positions(prefix, case_sensitive)
+
+    @staticmethod
+    def instruction_name(instruction: Instruction):
+        """
+        Gets the name of an instruction of a circuit
+
+        :param instruction: An instruction
+        :type instruction: Instruction or np.ndarray
+        :return: The name of the instruction, or None if it has no name
+        :rtype: str
+        """
+        return getattr(instruction, "name", None)
+
+    @staticmethod
+    def instruction_version(instruction: Instruction):
+        """
+        Gets the version of an instruction of a circuit
+
+        :param instruction: An instruction
+        :type instruction: Instruction or np.ndarray
+        :return: The version of the instruction, or None if it has none
+        :rtype: int
+        """
+        return getattr(instruction, "version", None)
+
+    def cached_name_index(self):
+        """
+        Gets the name index of the circuit if it is up to date, i.e. neither
+        the circuit nor any of its instructions, e.g. their names, changed
+        since it was built
+
+        :return: The name index, or None if it is missing or out of date
+        :rtype: NameIndex
+        """
+        cached = getattr(self, "_name_index", None)
+        if cached is None or cached[0] != self.version or any(
+                self.instruction_version(instr) != version for instr, version
+                in zip(self.instructions or (), cached[2])):
+            return None
+        return cached[1]
+
+    def name_index(self):
+        """
+        Gets the index from the names of the circuit's instructions to their
+        positions, which is updated by append, insert, pop, and reverse and
+        rebuilt if the instructions are replaced or any of them is changed
+
+        :return: The name index
+        :rtype: NameIndex
+        """
+        name_index = self.cached_name_index()
+        if name_index is None:
+            name_index = NameIndex(self.instruction_name(instr)
+                                   for instr in self.instructions or ())
+            self._name_index = (self.version, name_index, [
+                self.instruction_version(instr)
+                for instr in self.instructions or ()])
+        return name_index
 
     def insert(self, index: int, instruction: Instruction):
         """
@@ -151,11 +288,21 @@ class Circuit(Instruction):
         :type instruction: Instruction
         """
         if isinstance(instruction, Instruction):
+            name_index = self.cached_name_index()
             instructions = list()
             if isinstance(self.instructions, Iterable):
                 instructions.extend(self.instructions)
             instructions.insert(index, instruction)
             self.instructions = tuple(instructions)
+            if name_index is not None:
+                size = len(instructions) - 1
+                index = min(index, size) if index >= 0 \
+                    else max(index + size, 0)
+                name_index.shift(index, 1)
+                name_index.add(self.instruction_name(instruction), index)
+                versions = self._name_index[2]
+                versions.insert(index, self.instruction_version(instruction))
+                self._name_index = (self.version, name_index, versions)
         else:
             raise ValueError("'%s' objects cannot be used as instructions"
                              % type(instruction))
@@ -173,9 +320,13 @@ class Circuit(Instruction):
 
     def reverse(self):
         """Reverses the order of the instruction in the circuit"""
-        self.instructions = list(self.instructions)
-        self.instructions.reverse()
-        self.instructions = tuple(self.instructions)
+        name_index = self.cached_name_index()
+        self.instructions = tuple(reversed(self.instructions))
+        if name_index is not None:
+            name_index.reverse(len(self))
+            versions = self._name_index[2]
+            versions.reverse()
+            self._name_index = (self.version, name_index, versions)
 
     # TODO: implement this method to display the quantum circuit like in Qiskit
     def display(self):
@@ -0,0 +1,465 @@
+"""
+Compiled Circuit
+
+Compiles nested instructions into a flat stream of gate records, interning
+identical gates and subcircuits so their unitaries are computed once
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from itertools import chain
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.Precision import Precision
+from src.Workspace import Workspace
+from src.instruction import Instruction
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class CompiledCircuit(object):
+    """Compiles an instruction into a compact stream of gate records in
+    matrix product order, stored as a struct of arrays: the opcode of each
+    record (its node in the node table), its qudit targets packed into one
+    array with offsets, and the index of its gate data in a deduplicated
+    parameter table. Nested instructions are traversed with an explicit
+    stack, so arbitrarily deep circuits never hit the recursion limit.
+    Identical gates and subcircuits (e.g. every occurrence of tcx,
+    tczwwphase, and ocx in the R construction) are interned as one node of
+    the node table, so their unitaries and fused gates are computed once."""
+    def __init__(self, instruction: Instruction, fuse_max_qudits: int = 0,
+                 num_qudits: int = None, dtype: np.dtype = None):
+        """
+        Compiles an instruction
+
+        :param instruction: The instruction to compile
+        :type instruction: Instruction
+        :param fuse_max_qudits: The largest number of qudits of a subcircuit
+            that is recorded as a single fused gate instead of its gates,
+            defaults to 0 (never fuse)
+        :type fuse_max_qudits: int
+        :param num_qudits: The number of qudits, defaults to the instruction's
+            number of qudits
+        :type num_qudits: int
+        :param dtype: The dtype of the states the gates are applied to, to
+            which their matrices are cast once per node, defaults to None
+            (never cast)
+        :type dtype: np.dtype
+        """
+        if num_qudits is None:
+            num_qudits = instruction.num_qudits
+        self.instruction = instruction
+        self.num_qudits = num_qudits
+        self.fuse_max_qudits = fuse_max_qudits
+        self.dtype = dtype
+        self.nodes = list()
+        self.children = list()
+        self.parameters = list()
+        self.node_parameters = list()
+        self.containers = list()
+        self.leaves = list()
+        self._unitaries = dict()
+        self.workspace = Workspace()
+        self._fused = dict()
+        self._cast = dict()
+        self._records = None
+        self.root = self.intern(instruction)
+
+    @property
+    def records(self):
+        """
+        Gets the gate records, flattening the node table on first use
+
+        :return: The opcodes, target offsets, packed targets, and parameter
+            indices of the records in matrix product order
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        """
+        if self._records is None:
+            self._records = self.flatten_records()
+        return self._records
+
+    @property
+    def opcodes(self):
+        """
+        Gets the opcode of each record, i.e. the id of its node
+
+        :return: The opcodes, as uint16 unless there are more than 65536 nodes
+        :rtype: np.ndarray
+        """
+        return self.records[0]
+
+    @property
+    def offsets(self):
+        """
+        Gets the offsets of each record's qudit targets in the packed targets,
+        ending with the total number of targets
+
+        :return: The offsets
+        :rtype: np.ndarray
+        """
+        return self.records[1]
+
+    @property
+    def targets(self):
+        """
+        Gets the qudit targets of all records packed into one array
+
+        :return: The packed targets
+        :rtype: np.ndarray
+        """
+        return self.records[2]
+
+    @property
+    def params(self):
+        """
+        Gets the index of each record's gate data in the parameter table
+
+        :return: The parameter indices, or -1 for fused subcircuits
+        :rtype: np.ndarray
+        """
+        return self.records[3]
+
+    @property
+    def nbytes(self):
+        """
+        Gets the number of bytes of the record arrays
+
+        :return: The number of bytes
+        :rtype: int
+        """
+        return sum(array.nbytes for array in self.records)
+
+    def __len__(self):
+        """
+        Returns the number of gate records when the length is queried
+
+        :return: The number of gate records
+        :rtype: int
+        """
+        return len(self.opcodes)
+
+    def __iter__(self):
+        """
+        Iterates over the gates and their qudit targets in matrix product order
+
+        :return: The gates and their qudit targets
+        :rtype: Iterable[tuple[Instruction, tuple[int]]]
+        """
+        return self.iterate(range(len(self)))
+
+    def __reversed__(self):
+        """
+        Iterates over the gates and their qudit targets in the order they act
+        on the state
+
+        :return: The gates and their qudit targets
+        :rtype: Iterable[tuple[Instruction, tuple[int]]]
+        """
+        return self.iterate(range(len(self) - 1, -1, -1))
+
+    def iterate(self, indices: Iterable[int]):
+        """
+        Iterates over the gates and qudit targets of the given records
+
+        :param indices: The indices of the records
+        :type indices: Iterable[int]
+        :return: The gates and their qudit targets
+        :rtype: Iterable[tuple[Instruction, tuple[int]]]
+        """
+        opcodes = self.opcodes.tolist()
+        offsets = self.offsets.tolist()
+        targets = self.targets.tolist()
+        for i in indices:
+            yield self.gate(opcodes[i]), \
+                tuple(targets[offsets[i]:offsets[i + 1]])
+
+    @staticmethod
+    def gate_data(gate: Instruction):
+        """
+        Gets the data of a gate, i.e. its matrix, diagonal, or permutation and
+        phases, as a hashable key
+
+        :param gate: A gate
+        :type gate: Instruction
+        :return: The data of the gate, or None if it is not stored in arrays
+        :rtype: tuple
+        """
+        data = list()
+        for value in (gate.instructions or ()) \
+                + (getattr(gate, "_permutation", None),):
+            if value is None:
+                continue
+            if not isinstance(value, np.ndarray):
+                if not Misc.is_sparse(value):
+                    return None
+                value = value.toarray()
+            data.append((value.dtype.str, value.shape, value.tobytes()))
+        return tuple(data)
+
+    def add_node(self, instruction: Instruction, children: list = None,
+                 parameter: int = -1):
+        """
+        Adds a node to the node table
+
+        :param instruction: The instruction of the node
+        :type instruction: Instruction
+        :param children: The child nodes and the qudits they act on, or None
+            for a gate
+        :type children: list[tuple[int, tuple[int]]]
+        :param parameter: The index of the node's gate data in the parameter
+            table, defaults to -1 (none)
+        :type parameter: int
+        :return: The id of the node
+        :rtype: int
+        """
+        self.nodes.append(instruction)
+        self.children.append(children)
+        self.node_parameters.append(parameter)
+        return len(self.nodes) - 1
+
+    def intern(self, instruction: Instruction):
+        """
+        Adds an instruction and everything nested in it to the node table,
+        sharing one node between identical gates and between identical
+        subcircuits
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :return: The id of the instruction's node
+        :rtype: int
+        """
+        from src.instruction.gate import Gate
+        ids = dict()
+        keys = dict()
+        parameters = dict()
+        matrices = dict()
+        stack = [(instruction, False)]
+        while stack:
+            instr, expanded = stack.pop()
+            if id(instr) in ids:
+                continue
+            if not instr.iscontainer():
+                data = self.gate_data(instr)
+                if data is None:
+                    key, parameter = (type(instr), id(instr)), -1
+                else:
+                    key = (type(instr), instr.name, instr.num_qudits,
+                           instr.dim, data)
+                    if data not in parameters:
+                        parameters[data] = len(self.parameters)
+                        self.parameters.append(instr.instructions)
+                    parameter = parameters[data]
+                if key not in keys:
+                    keys[key] = self.add_node(instr, None, parameter)
+                ids[id(instr)] = keys[key]
+                self.leaves.append(instr)
+                continue
+            if not expanded:
+                self.containers.append(instr)
+                stack.append((instr, True))
+                for child in instr.instructions:
+                    if not isinstance(child, Instruction):
+                        child = matrices.setdefault(
+                            id(child), Gate(None, child, dim=instr.dim))
+                    if id(child) not in ids:
+                        stack.append((child, False))
+                continue
+            children = list()
+            for child in instr.instructions:
+                qudits = None
+                if not isinstance(child, Instruction):
+                    child = matrices[id(child)]
+                else:
+                    qudits = child.resolved_qudits()
+                children.append((ids[id(child)], qudits))
+            key = (instr.num_qudits, instr.dim, tuple(children))
+            if key not in keys:
+                keys[key] = self.add_node(instr, children)
+            ids[id(instr)] = keys[key]
+        return ids[id(instruction)]
+
+    def isfused(self, node: int):
+        """
+        Checks if a node is recorded as a single gate
+
+        :param node: The id of a node
+        :type node: int
+        :return: If the node is a gate or a fused subcircuit
+        :rtype: bool
+        """
+        instruction = self.nodes[node]
+        return self.children[node] is None \
+            or (instruction.num_qudits is not None
+                and instruction.num_qudits <= self.fuse_max_qudits)
+
+    def flatten_records(self):
+        """
+        Flattens the node table into gate records with an explicit stack
+
+        :return: The opcodes, target offsets, packed targets, and parameter
+            indices of the records in matrix product order
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        """
+        opcodes = list()
+        targets = list()
+        stack = [(self.root, tuple(range(self.num_qudits or 0)))]
+        while stack:
+            node, qudits = stack.pop()
+            if self.isfused(node):
+                opcodes.append(node)
+                targets.append(qudits)
+                continue
+            for child, child_qudits in reversed(self.children[node]):
+                if child_qudits is None:
+                    child_num_qudits = self.nodes[child].num_qudits
+                    mapped = qudits if child_num_qudits is None \
+                        else qudits[:child_num_qudits]
+                else:
+                    mapped = tuple(qudits[q] for q in child_qudits)
+                stack.append((child, mapped))
+        opcodes = np.array(opcodes, dtype=np.uint16 if len(self.nodes)
+                           <= np.iinfo(np.uint16).max + 1 else np.uint32)
+        offsets = np.zeros(len(targets) + 1, dtype=np.int64)
+        np.cumsum([len(qudits) for qudits in targets], out=offsets[1:])
+        targets = np.fromiter(chain.from_iterable(targets), dtype=np.int32,
+                              count=offsets[-1])
+        params = np.array(self.node_parameters, dtype=np.int32)[opcodes]
+        return opcodes, offsets, targets, params
+
+    def unitary(self, node: int = None, sparse: bool = None):
+        """
+        Gets the unitary of a node on its own qudits, computing the unitary of
+        every distinct subcircuit once.\n
+        * Note: The intermediate products are written into the active
+        Workspace, or else the compiled circuit's own workspace.
+
+        :param node: The id of the node, defaults to the compiled instruction
+        :type node: int
+        :param sparse: Whether to return a sparse matrix, defaults to a dense
+            matrix if all gates are dense and otherwise choosing by fill ratio
+        :type sparse: bool
+        :return: The unitary
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        if node is None:
+            node = self.root
+        with Workspace.current() or self.workspace:
+            self.compute_unitaries(node, sparse)
+        return self._unitaries[(node, sparse)]
+
+    def compute_unitaries(self, node: int, sparse: bool = None):
+        """
+        Computes the unitaries of a node and all its descendants which are
+        not yet computed, children first
+
+        :param node: The id of the node
+        :type node: int
+        :param sparse: Whether to compute sparse matrices, see unitary
+        :type sparse: bool
+        """
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if (current, sparse) in self._unitaries:
+                continue
+            instruction = self.nodes[current]
+            children = self.children[current]
+            if children is None:
+                self._unitaries[(current, sparse)] = \
+                    instruction.to_matrix(sparse)
+                continue
+            if not expanded:
+                stack.append((current, True))
+                stack.extend((child, False) for child, qudits in children
+                             if (child, sparse) not in self._unitaries)
+                continue
+            if len(children) == 0:
+                raise TypeError("%s.to_matrix() missing 1 required "
+                                "instruction" % str(instruction))
+            matrices = list()
+            for child, qudits in children:
+                matrix = self._unitaries[(child, sparse)]
+                if instruction.num_qudits is not None and qudits is not None \
+                        and qudits != tuple(range(instruction.num_qudits)):
+                    matrix = Instruction.extend_matrix(
+                        matrix, instruction.num_qudits, instruction.dim,
+                        qudits)
+                matrices.append(matrix)
+            matrix = Misc.dot(*matrices)
+            if sparse is not None or Misc.is_sparse(matrix):
+                matrix = Misc.auto_format(matrix, sparse)
+            self._unitaries[(current, sparse)] = matrix
+
+    def gate(self, node: int):
+        """
+        Gets the gate of a gate record, fusing a subcircuit into a single
+        gate and casting it to the compiled dtype once
+
+        :param node: The id of the node
+        :type node: int
+        :return: The gate, acting on the node's own qudits
+        :rtype: Instruction
+        """
+        if self.dtype is None:
+            return self.fused_gate(node)
+        if node not in self._cast:
+            self._cast[node] = self.fused_gate(node).astype(self.dtype)
+        return self._cast[node]
+
+    def fused_gate(self, node: int):
+        """
+        Gets the gate of a gate record, fusing a subcircuit into a single
+        gate once
+
+        :param node: The id of the node
+        :type node: int
+        :return: The gate, acting on the node's own qudits
+        :rtype: Instruction
+        """
+        if self.children[node] is None:
+            return self.nodes[node]
+        if node not in self._fused:
+            from src.instruction.diagonal_gate import DiagonalGate
+            from src.instruction.fourier_gate import FourierGate
+            from src.instruction.gate import Gate
+            from src.instruction.monomial_gate import MonomialGate
+            instruction = self.nodes[node]
+            matrix = Misc.to_dense(self.unitary(node, sparse=False))
+            matrix = np.where(Precision.isclose(matrix, 0), 0, matrix)
+            if DiagonalGate.isdiagonal(matrix):
+                gate = DiagonalGate.from_matrix(instruction.name, matrix,
+                                                instruction.dim)
+            elif MonomialGate.ismonomial(matrix):
+                gate = MonomialGate.from_matrix(instruction.name, matrix,
+                                                instruction.dim)
+            elif FourierGate.isfourier(matrix, instruction.dims):
+                gate = FourierGate.from_matrix(instruction.name, matrix,
+                                               instruction.dim)
+            else:
+                gate = Gate(instruction.name, matrix, instruction.num_qudits,
+                            instruction.dim)
+            self._fused[node] = gate
+        return self._fused[node]
+
+    def gates(self):
+        """
+        Gets the gates of the records in matrix product order, each acting on
+        its qudit targets
+
+        :return: The gates
+        :rtype: list[Instruction]
+        """
+        gates = list()
+        for gate, targets in self:
+            if gate.resolved_qudits() != targets:
+                gate = gate.on(targets)
+            gates.append(gate)
+        return gates
@@ -0,0 +1,317 @@
+"""
+Controlled
+
+Creates multi-controlled quantum instruction objects
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc, sp
+from src.instruction import Instruction
+from src.instruction.gate import Gate
+from src.simulator.jit_kernels import JitKernels
+from src.simulator.kernels import StateVectorKernels
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class Controlled(Instruction):
+    """Creates multi-controlled quantum instruction objects. The controlled
+    instruction is applied to the target qudits if and only if every control
+    qudit is in its control value, so it is simulated on that slice of the
+    state only and never built as a block matrix."""
+    __slots__ = ("_controls", "_target")
+
+    def __init__(self, U: Instruction or np.ndarray,
+                 controls: Iterable[tuple[int, int]],
+                 target: Iterable[int], name: str = None, dim: int = 3):
+        """
+        Creates a new controlled instruction
+
+        :param U: The instruction applied to the target qudits
+        :type U: Instruction or np.ndarray
+        :param controls: The control qudits of the enclosing instruction and
+            their control values as (qudit, value) pairs
+        :type controls: Iterable[tuple[int, int]]
+        :param target: The target qudits of the enclosing instruction
+        :type target: Iterable[int]
+        :param name: The name of the instruction, defaults to "C(U)" prefixed
+            with the control values
+        :type name: str
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each of the control qudits followed by the
+            target qudits for qudits of mixed dimensions, defaults to 3
+        :type dim: int or Iterable[int]
+        """
+        controls = tuple((int(q), int(v)) for q, v in controls)
+        target = tuple(target)
+        dims = Instruction.qudit_dims(dim, len(controls) + len(target))
+        if len(dims) != len(controls) + len(target):
+            raise ValueError("%s qudit dimensions were given for %s qudits"
+                             % (len(dims), len(controls) + len(target)))
+        if not isinstance(U, Instruction):
+            U = Gate(None, U, dim=dim if isinstance(dim, int)
+                     else dims[len(controls):])
+        for (q, v), d in zip(controls, dims):
+            if not 0 <= v < d:
+                raise ValueError("control value %s of qudit %s is not a "
+                                 "valid state of a %s-dimensional qudit"
+                                 % (v, q, d))
+        if U.num_qudits is not None and U.num_qudits != len(target):
+            raise ValueError("%s acts on %s qudits but was given targets %s"
+                             % (str(U), U.num_qudits, str(target)))
+        if name is None:
+            name = "C%s(%s)" % ("".join(str(v) for q, v in controls),
+                                "U" if U.name is None else U.name)
+        self._controls = controls
+        self._target = target
+        Instruction.__init__(self, name, U, len(controls) + len(target), dim,
+                             tuple(q for q, v in controls) + target)
+
+    @property
+    def U(self):
+        """
+        Gets the instruction applied to the target qudits
+
+        :return: The controlled instruction
+        :rtype: Instruction
+        """
+        return self.instructions[0]
+
+    @property
+    def controls(self):
+        """
+        Gets the control qudits and their control values
+
+        :return: The (qudit, value) pairs of the controls
+        :rtype: tuple[tuple[int, int]]
+        """
+        return self._controls
+
+    @property
+    def control_values(self):
+        """
+        Gets the control values
+
+        :return: The control values in the order of the controls
+        :rtype: tuple[int]
+        """
+        return tuple(v for q, v in self.controls)
+
+    @property
+    def target(self):
+        """
+        Gets the target qudits
+
+        :return: The target qudits
+        :rtype: tuple[int]
+        """
+        return self._target
+
+    def on(self, qudits: Iterable[int]):
+        """
+        Returns a copy of the controlled instruction acting on other qudits of
+        the enclosing instruction
+
+        :param qudits: The control qudits followed by the target qudits
+        :type qudits: Iterable[int]
+        :return: A copy of the controlled instruction
+        :rtype: Controlled
+        """
+        qudits = tuple(qudits)
+        num_controls = len(self.controls)
+        return Controlled(self.U, zip(qudits[:num_controls],
+                                      self.control_values),
+                          qudits[num_controls:], self.name, self.dim)
+
+    def astype(self, dtype: np.dtype):
+        """
+        Returns a copy of the controlled instruction whose instruction on the
+        target qudits is cast to the dtype of the states it is applied to
+
+        :param dtype: The dtype of the states
+        :type dtype: np.dtype
+        :return: The controlled instruction, or a copy of it if the
+            instruction was cast
+        :rtype: Controlled
+        """
+        U = self.U.astype(dtype)
+        if U is self.U:
+            return self
+        return Controlled(U, self.controls, self.target, self.name, self.dim)
+
+    def inverse(self):
+        """
+        Returns the inverse of the controlled instruction, i.e. the inverse of
+        the instruction applied to the target qudits, with the same controls
+
+        :return: The inverse of the controlled instruction
+        :rtype: Controlled
+        """
+        return Controlled(self.U.inverse(), self.controls, self.target,
+                          Instruction.inverse_name(self.name), self.dim)
+
+    def order(self, max_order: int = 64):
+        """
+        Finds the order of the controlled instruction, which is the order of
+        the instruction applied to the target qudits
+
+        :param max_order: The largest order to consider, defaults to 64
+        :type max_order: int
+        :return: The order of the controlled instruction, or None if unknown
+        :rtype: int
+        """
+        return self.U.order(max_order)
+
+    def power(self, k: int):
+        """
+        Raises the controlled instruction to the power k, i.e. controls the
+        power k of the instruction applied to the target qudits
+
+        :param k: The power
+        :type k: int
+        :return: The controlled instruction to the power k
+        :rtype: Controlled
+        """
+        return Controlled(self.U.power(k), self.controls, self.target,
+                          Instruction.power_name(self.name, k), self.dim)
+
+    def controlled(self, control_value: int = None, control_dim: int = None):
+        """
+        Returns the controlled version of the controlled instruction, with a
+        new control qudit 0 followed by the instruction's qudits
+
+        :param control_value: The state of the new control qudit for which the
+            instruction is applied, defaults to control_dim - 1 (ie: |2⟩ for
+            qutrits)
+        :type control_value: int
+        :param control_dim: The dimension of the new control qudit, defaults
+            to the dimension of the instruction's first qudit
+        :type control_dim: int
+        :return: The controlled instruction
+        :rtype: Controlled
+        :raises ValueError: The control value is not a state of the control
+            qudit
+        """
+        dim = Instruction.controlled_dim(self.dim, self.num_qudits,
+                                         control_dim)
+        if control_value is None:
+            control_value = Instruction.qudit_dims(dim, 1)[0] - 1
+        return Controlled(self.U, [(0, control_value)]
+                          + [(i + 1, v) for i, v in
+                             enumerate(self.control_values)],
+                          range(len(self.controls) + 1, self.num_qudits + 1),
+                          dim=dim)
+
+    @classmethod
+    def powers(cls, U: Instruction or np.ndarray, control: int,
+               target: Iterable[int], dim: int = 3):
+        """
+        Creates the controlled gate
+        :math:`Λ(U)|c⟩|t⟩ := |c⟩ ⊗ (U^c|t⟩)`
+        of QuantumCircuitMatrix.c_gate for qudits of any dimension, as one
+        controlled instruction per nontrivial control value
+
+        :param U: The instruction applied to the target qudits
+        :type U: Instruction or np.ndarray
+        :param control: The control qudit
+        :type control: int
+        :param target: The target qudits
+        :type target: Iterable[int]
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The controlled gate
+        :rtype: Circuit
+        """
+        from src.instruction.circuit import Circuit
+        if isinstance(U, Instruction):
+            U = U.to_matrix()
+        U = Misc.to_dense(U)
+        target = tuple(target)
+        qudits = (control,) + target
+        return Circuit("Λ", [cls(np.linalg.matrix_power(U, c),
+                                 [(0, c)], range(1, len(qudits)), dim=dim)
+                             for c in range(1, dim)],
+                       len(qudits), dim, qudits)
+
+    def to_matrix(self, sparse: bool = None):
+        """
+        Converts the controlled instruction into matrix form on its control
+        qudits followed by its target qudits
+
+        :param sparse: Whether to return a sparse matrix, defaults to choosing
+            by fill ratio
+        :type sparse: bool
+        :return: The controlled instruction in matrix form
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        U = self.U.to_matrix(sparse)
+        control_dims = self.dims[:len(self.controls)]
+        projector = np.zeros(Instruction.num_states(control_dims), dtype=int)
+        projector[np.ravel_multi_index(self.control_values, control_dims)] = 1
+        identity = np.identity(U.shape[0], dtype=int)
+        if sparse is not False and sp is not None:
+            projector = sp.diags(projector, format="csr", dtype=int)
+            identity = Misc.to_sparse(identity)
+            matrix = sp.identity(projector.shape[0] * U.shape[0],
+                                 format="csr") \
+                - Misc.kron(projector, identity) \
+                + Misc.kron(projector, Misc.to_sparse(U))
+        else:
+            projector = np.diag(projector)
+            matrix = np.identity(projector.shape[0] * U.shape[0]) \
+                - np.kron(projector, identity) \
+                + np.kron(projector, Misc.to_dense(U))
+        return Misc.auto_format(matrix, sparse)
+
+    def apply(self, state: np.ndarray, axes: tuple[int] = None,
+              inplace: bool = False):
+        """
+        Applies the controlled instruction to a state tensor of shape
+        (d_0, ..., d_{n-1}) by applying it to the slice of the state where the
+        controls have their control values, or by the JIT kernels for small
+        target gates when they are enabled.\n
+        * Note: The state is only updated in place if inplace and the
+        instruction does not upcast it, e.g. a complex gate on a real state.
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param axes: The state axes of the control qudits followed by the
+            target qudits, defaults to the first num_qudits axes
+        :type axes: tuple[int]
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        if axes is None:
+            axes = tuple(range(self.num_qudits))
+        num_controls = len(self.controls)
+        control_axes = axes[:num_controls]
+        if isinstance(self.U, Gate) and JitKernels.supports(
+                state, Instruction.num_states(self.U.dims), dense=True):
+            return StateVectorKernels.apply_controlled(
+                state, self.U.matrix, zip(control_axes, self.control_values),
+                axes[num_controls:], inplace)
+        index = [slice(None)] * state.ndim
+        for axis, value in zip(control_axes, self.control_values):
+            index[axis] = value
+        index = tuple(index)
+        target_axes = tuple(axis - sum(c < axis for c in control_axes)
+                            for axis in axes[num_controls:])
+        updated = self.U.apply(state[index], target_axes)
+        if not inplace or updated.dtype != state.dtype:
+            state = state.astype(np.result_type(state, updated))
+        state[index] = updated
+        return state
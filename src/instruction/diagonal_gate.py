@@ -0,0 +1,423 @@
+"""
+Diagonal Gate
+
+Creates quantum gate objects which are diagonal in the standard basis
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from copy import copy
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc, sp
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+from src.instruction import Instruction
+from src.instruction.gate import Gate
+from src.simulator.kernels import StateVectorKernels
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class DiagonalGate(Gate):
+    """Creates quantum gate objects which are diagonal in the standard basis.
+    Only the diagonal is stored, so gates compose by elementwise
+    multiplication and are applied to states by broadcasting."""
+    __slots__ = ()
+
+    def __init__(self, name: str = None, diagonal: np.ndarray = None,
+                 num_qudits: int = None, dim: int = 3,
+                 qudits: Iterable[int] = None):
+        """
+        Creates a new diagonal quantum gate
+
+        :param name: The name of the gate
+        :type name: str
+        :param diagonal: The diagonal of the gate
+        :type diagonal: np.ndarray
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param qudits: The qudits of the enclosing instruction that this
+            gate acts on, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
+        """
+        if diagonal is not None:
+            diagonal = np.ravel(diagonal)
+        Gate.__init__(self, name, diagonal, num_qudits, dim, qudits)
+
+    @property
+    def diagonal(self):
+        """
+        Gets the diagonal of the gate
+
+        :return: The diagonal of the gate
+        :rtype: np.ndarray
+        """
+        if self.instructions is None:
+            return None
+        return self.instructions[0]
+
+    @property
+    def matrix(self):
+        """
+        Gets the gate's matrix
+
+        :return: The gate's matrix
+        :rtype: np.ndarray
+        """
+        if self.instructions is None:
+            return None
+        return np.diag(self.diagonal)
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return self._num_qudits
+
+    @diagonal.setter
+    def diagonal(self, diagonal: np.ndarray):
+        """
+        Sets the diagonal of the gate
+
+        :param diagonal: The diagonal of the gate
+        :type diagonal: np.ndarray
+        """
+        self.instructions = np.ravel(diagonal)
+
+    @matrix.setter
+    def matrix(self, matrix: np.ndarray):
+        """
+        Sets the gate's matrix
+
+        :param matrix: A diagonal matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        """
+        self.diagonal = DiagonalGate.matrix_diagonal(matrix)
+
+    @num_qudits.setter
+    def num_qudits(self, num_qudits: int = None):
+        """
+        Sets the number of qudits
+
+        :param num_qudits: The number of qudits, defaults to the minimum number
+            of required qudits
+        :type num_qudits: int
+        """
+        if num_qudits is not None:
+            self._num_qudits = num_qudits
+        elif self.instructions is not None and self.dim is not None:
+            self._num_qudits = Instruction.infer_num_qudits(
+                self.dim, len(self.diagonal))
+        else:
+            self._num_qudits = None
+        if self.num_qudits is not None \
+                and self.instructions is not None and self.dim is not None:
+            num_bits = Instruction.num_states(self.dim, self.num_qudits)
+            if num_bits > len(self.diagonal):
+                self.diagonal = np.concatenate(
+                    (self.diagonal, np.ones(num_bits - len(self.diagonal))))
+            elif num_bits < len(self.diagonal):
+                self.diagonal = self.diagonal[:num_bits]
+
+    @staticmethod
+    def matrix_diagonal(matrix: np.ndarray):
+        """
+        Gets the diagonal of a diagonal matrix
+
+        :param matrix: A diagonal matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :raises ValueError: The matrix is not diagonal
+        :return: The diagonal of the matrix
+        :rtype: np.ndarray
+        """
+        diagonal = np.asarray(matrix.diagonal()).ravel()
+        if Misc.is_sparse(matrix):
+            off_diagonal = (matrix - sp.diags(
+                diagonal, dtype=diagonal.dtype)).count_nonzero()
+        else:
+            off_diagonal = np.count_nonzero(matrix - np.diag(diagonal))
+        if off_diagonal:
+            raise ValueError("the matrix is not diagonal")
+        return diagonal
+
+    @staticmethod
+    def isdiagonal(matrix: np.ndarray):
+        """
+        Checks if a matrix is diagonal
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :return: If the matrix is diagonal
+        :rtype: bool
+        """
+        try:
+            DiagonalGate.matrix_diagonal(matrix)
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def from_matrix(cls, name: str, matrix: np.ndarray, dim: int = 3,
+                    qudits: Iterable[int] = None):
+        """
+        Creates a diagonal gate from a diagonal matrix, e.g. the composite
+        diagonals zww, tcsdagphase, and tczwwphase
+
+        :param name: The name of the gate
+        :type name: str
+        :param matrix: A diagonal matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param qudits: The qudits the gate acts on
+        :type qudits: Iterable[int]
+        :raises ValueError: The matrix is not diagonal
+        :return: The diagonal gate
+        :rtype: DiagonalGate
+        """
+        return cls(name, cls.matrix_diagonal(matrix), dim=dim, qudits=qudits)
+
+    @classmethod
+    def Z(cls, dim: int = 3, qudits: Iterable[int] = None):
+        """
+        The Pauli-Z gate, see QuantumCircuitMatrix.Z_gate
+
+        :return: The Pauli-Z gate
+        :rtype: DiagonalGate
+        """
+        return cls("Z", QCM.Z_diagonal(dim), 1, dim, qudits)
+
+    @classmethod
+    def Z_phase(cls, a: float, b: float, qudits: Iterable[int] = None):
+        """
+        The Z phase shift gate, see QuantumCircuitMatrix.Z_phase_gate
+
+        :return: The Z phase shift gate
+        :rtype: DiagonalGate
+        """
+        return cls("Z(%s,%s)" % (a, b), QCM.Z_phase_diagonal(a, b), 1, 3,
+                   qudits)
+
+    @classmethod
+    def S(cls, qudits: Iterable[int] = None):
+        """
+        The qutrit S gate, see QuantumCircuitMatrix.S_gate
+
+        :return: The qutrit S gate
+        :rtype: DiagonalGate
+        """
+        return cls("S", QCM.Z_phase_diagonal(0, 1), 1, 3, qudits)
+
+    @classmethod
+    def T(cls, qudits: Iterable[int] = None):
+        """
+        The qutrit T gate, see QuantumCircuitMatrix.T_gate
+
+        :return: The qutrit T gate
+        :rtype: DiagonalGate
+        """
+        return cls("T", QCM.Z_phase_diagonal(1 / 3, -1 / 3), 1, 3, qudits)
+
+    @classmethod
+    def R(cls, qudits: Iterable[int] = None):
+        """
+        The reflection gate, see QuantumCircuitMatrix.R_gate
+
+        :return: The reflection gate
+        :rtype: DiagonalGate
+        """
+        return cls("R", QCM.Z_phase_diagonal(0, 3 / 2), 1, 3, qudits)
+
+    def inverse(self):
+        """
+        Returns the inverse of the gate, i.e. its conjugated diagonal
+
+        :return: The inverse of the gate
+        :rtype: DiagonalGate
+        """
+        gate = copy(self)
+        gate.diagonal = np.conj(self.diagonal)
+        gate.name = Instruction.inverse_name(self.name)
+        return gate
+
+    def order(self, max_order: int = 64):
+        """
+        Finds the smallest positive power of the gate which is the identity
+        from the phases of its diagonal
+
+        :param max_order: The largest order to consider, defaults to 64
+        :type max_order: int
+        :return: The order of the gate, or None if it exceeds max_order
+        :rtype: int
+        """
+        return Misc.phase_order(self.diagonal, max_order)
+
+    def power(self, k: int):
+        """
+        Raises the gate to the power k by raising its diagonal to the power k,
+        after reducing k modulo the order of the gate if it is known
+
+        :param k: The power
+        :type k: int
+        :raises TypeError: If k is not an integer
+        :return: The gate to the power k
+        :rtype: DiagonalGate
+        """
+        if not isinstance(k, (int, np.integer)):
+            raise TypeError("%s.power() needs an integer power, not %r"
+                            % (str(self), k))
+        order = self.order()
+        if order is not None:
+            k %= order
+        gate = copy(self)
+        gate.diagonal = np.power(self.diagonal.astype(complex), k)
+        gate.name = Instruction.power_name(self.name, k)
+        return gate
+
+    def controlled(self, control_value: int = None, control_dim: int = None):
+        """
+        Returns the controlled version of the gate, which is again diagonal,
+        acting on a new control qudit 0 followed by the gate's qudits
+
+        :param control_value: The state of the control qudit for which the
+            gate is applied, defaults to control_dim - 1 (ie: |2⟩ for
+            qutrits)
+        :type control_value: int
+        :param control_dim: The dimension of the control qudit, defaults to
+            the dimension of the gate's first qudit
+        :type control_dim: int
+        :return: The controlled gate
+        :rtype: DiagonalGate
+        :raises ValueError: The control value is not a state of the control
+            qudit
+        """
+        dim = Instruction.controlled_dim(self.dim, self.num_qudits,
+                                         control_dim)
+        control_dim = Instruction.qudit_dims(dim, 1)[0]
+        if control_value is None:
+            control_value = control_dim - 1
+        if not 0 <= control_value < control_dim:
+            raise ValueError("control value %s is not a valid state of a "
+                             "%s-dimensional qudit"
+                             % (control_value, control_dim))
+        diagonal = np.ones((control_dim, len(self.diagonal)),
+                           dtype=self.diagonal.dtype)
+        diagonal[control_value] = self.diagonal
+        return DiagonalGate("C%s(%s)" % (control_value, self.name), diagonal,
+                            self.num_qudits + 1, dim)
+
+    def commutes_with(self, other: Instruction):
+        """
+        Checks if the gate trivially commutes with another instruction, i.e.
+        if the other instruction is diagonal or acts on disjoint qudits
+
+        :param other: Another instruction in the same enclosing instruction
+        :type other: Instruction
+        :return: If the instructions trivially commute
+        :rtype: bool
+        """
+        if isinstance(other, DiagonalGate):
+            return True
+        if self.qudits is None or other.qudits is None:
+            return False
+        return not set(self.qudits) & set(other.qudits)
+
+    def compose(self, other: 'DiagonalGate'):
+        """
+        Composes two diagonal gates of the same enclosing instruction by
+        elementwise multiplication of their diagonals. Gates on different
+        qudits merge into a single gate on the union of their qudits.
+
+        :param other: Another diagonal gate
+        :type other: DiagonalGate
+        :return: The composed diagonal gate
+        :rtype: DiagonalGate
+        """
+        if not isinstance(other, DiagonalGate):
+            raise TypeError("'%s' objects cannot be composed with diagonal "
+                            "gates" % type(other))
+        qudits = self.qudits or tuple(range(self.num_qudits))
+        other_qudits = other.qudits or tuple(range(other.num_qudits))
+        name = "%s*%s" % (self.name, other.name)
+        if qudits == other_qudits:
+            return DiagonalGate(name, self.diagonal * other.diagonal,
+                                self.num_qudits, self.dim, self.qudits)
+        union = tuple(sorted(set(qudits) | set(other_qudits)))
+        axes = {q: i for i, q in enumerate(union)}
+        dims = dict(zip(qudits, self.dims))
+        dims.update(zip(other_qudits, other.dims))
+        dims = tuple(dims[q] for q in union)
+        phases = StateVectorKernels.phase_tensor(
+            self.diagonal, [axes[q] for q in qudits], len(union), self.dims) \
+            * StateVectorKernels.phase_tensor(
+            other.diagonal, [axes[q] for q in other_qudits], len(union),
+            other.dims)
+        phases = np.broadcast_to(phases, dims)
+        dim = self.dim if isinstance(self.dim, int) \
+            and self.dim == other.dim else dims
+        return DiagonalGate(name, phases, len(union), dim, union)
+
+    def __matmul__(self, other: 'DiagonalGate'):
+        """
+        Composes two diagonal gates when the '@' operator is used
+
+        :param other: Another diagonal gate
+        :type other: DiagonalGate
+        :return: The composed diagonal gate
+        :rtype: DiagonalGate
+        """
+        return self.compose(other)
+
+    def to_matrix(self, sparse: bool = None):
+        """
+        Converts the gate into matrix form
+
+        :param sparse: Whether to return a sparse matrix, defaults to choosing
+            by fill ratio
+        :type sparse: bool
+        :return: The gate in matrix form
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        if sparse is not False and sp is not None:
+            return Misc.auto_format(
+                sp.diags(self.diagonal, format="csr",
+                         dtype=self.diagonal.dtype), sparse)
+        return self.matrix
+
+    def apply(self, state: np.ndarray, axes: tuple[int] = None,
+              inplace: bool = False):
+        """
+        Applies the gate to a state tensor of shape (d_0, ..., d_{n-1}) by
+        broadcasting its diagonal along the target axes
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param axes: The state axes of the gate's qudits, defaults to the
+            first num_qudits axes
+        :type axes: tuple[int]
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        if axes is None:
+            axes = tuple(range(self.num_qudits))
+        return StateVectorKernels.apply_diagonal(state, self.diagonal, axes,
+                                                 inplace=inplace)
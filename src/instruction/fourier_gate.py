@@ -0,0 +1,335 @@
+"""
+Fourier Gate
+
+Creates quantum gate objects which apply powers of the Hadamard gate, i.e.
+the quantum Fourier transform, to each of their qudits
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from copy import copy
+from math import gcd
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.Precision import Precision
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+from src.instruction import Instruction
+from src.instruction.gate import Gate
+from src.simulator.kernels import StateVectorKernels
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class FourierGate(Gate):
+    """Creates quantum gate objects which apply the power powers[i] of the
+    Hadamard gate of QuantumCircuitMatrix.H_gate to their qudit i. Only the
+    powers are stored, and the gate is applied to a state as batched FFTs
+    along its axes, so a layer of Hadamard gates costs O(N log N) instead
+    of a matrix product."""
+    __slots__ = ()
+
+    def __init__(self, name: str = None, powers: Iterable[int] = None,
+                 num_qudits: int = None, dim: int = 3,
+                 qudits: Iterable[int] = None):
+        """
+        Creates a new Fourier gate
+
+        :param name: The name of the gate
+        :type name: str
+        :param powers: The power of the Hadamard gate applied to each qudit,
+            which are reduced modulo 4 since :math:`H^4 = I`
+        :type powers: Iterable[int]
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param qudits: The qudits of the enclosing instruction that this
+            gate acts on, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
+        """
+        if powers is None:
+            powers = [1] * (num_qudits or 1)
+        powers = np.ravel(np.asarray(powers, dtype=int)) % 4
+        Gate.__init__(self, name, powers, num_qudits, dim, qudits)
+
+    @property
+    def powers(self):
+        """
+        Gets the power of the Hadamard gate applied to each qudit
+
+        :return: The powers
+        :rtype: np.ndarray
+        """
+        return self.instructions[0]
+
+    @property
+    def matrix(self):
+        """
+        Gets the gate's matrix, the Kronecker product of the powers of the
+        Hadamard gate of each qudit
+
+        :return: The gate's matrix
+        :rtype: np.ndarray
+        """
+        return StateVectorKernels.fourier_matrix(
+            self.dims, tuple(self.powers.tolist())).copy()
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return self._num_qudits
+
+    @matrix.setter
+    def matrix(self, matrix: np.ndarray):
+        """
+        Sets the gate's matrix, which must be a Kronecker product of powers
+        of Hadamard gates
+
+        :param matrix: A Kronecker product of powers of Hadamard gates
+        :type matrix: np.ndarray or sp.spmatrix
+        :raises ValueError: The matrix is not a product of Hadamard gates
+        """
+        self.instructions = FourierGate.matrix_powers(matrix, self.dims)
+
+    @num_qudits.setter
+    def num_qudits(self, num_qudits: int = None):
+        """
+        Sets the number of qudits
+
+        :param num_qudits: The number of qudits, defaults to the number of
+            powers
+        :type num_qudits: int
+        """
+        if num_qudits is None:
+            num_qudits = len(self.powers)
+        if num_qudits != len(self.powers):
+            raise ValueError("%s powers of the Hadamard gate do not act on "
+                             "%s qudits" % (len(self.powers), num_qudits))
+        self._num_qudits = num_qudits
+
+    @staticmethod
+    def matrix_powers(matrix: np.ndarray, dims: Iterable[int]):
+        """
+        Gets the power of the Hadamard gate of each qudit of a Kronecker
+        product of powers of Hadamard gates
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :param dims: The dimension of each qudit
+        :type dims: Iterable[int]
+        :raises ValueError: The matrix is not a product of Hadamard gates
+        :return: The power of the Hadamard gate of each qudit
+        :rtype: np.ndarray
+        """
+        matrix = Misc.to_dense(matrix)
+        dims = tuple(dims)
+        if matrix.shape != (Instruction.num_states(dims),) * 2:
+            raise ValueError("the matrix is not a product of Hadamard gates")
+        tensor = matrix.reshape(dims + dims)
+        powers = list()
+        for i, d in enumerate(dims):
+            block = tensor[tuple(slice(None) if j % len(dims) == i else 0
+                                 for j in range(2 * len(dims)))]
+            for power in range(4):
+                H = np.linalg.matrix_power(QCM.H_gate(d), power)
+                if block[0, 0] != 0 and Precision.allclose(
+                        block / block[0, 0], H / H[0, 0]):
+                    powers.append(power)
+                    break
+            else:
+                raise ValueError("the matrix is not a product of Hadamard "
+                                 "gates")
+        if not Precision.allclose(matrix, StateVectorKernels.fourier_matrix(
+                dims, tuple(powers))):
+            raise ValueError("the matrix is not a product of Hadamard gates")
+        return np.array(powers, dtype=int)
+
+    @staticmethod
+    def isfourier(matrix: np.ndarray, dims: Iterable[int]):
+        """
+        Checks if a matrix is a Kronecker product of powers of Hadamard gates
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :param dims: The dimension of each qudit
+        :type dims: Iterable[int]
+        :return: If the matrix is a product of Hadamard gates
+        :rtype: bool
+        """
+        try:
+            FourierGate.matrix_powers(matrix, dims)
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def from_matrix(cls, name: str, matrix: np.ndarray, dim: int = 3,
+                    qudits: Iterable[int] = None):
+        """
+        Creates a Fourier gate from a Kronecker product of powers of Hadamard
+        gates
+
+        :param name: The name of the gate
+        :type name: str
+        :param matrix: A Kronecker product of powers of Hadamard gates
+        :type matrix: np.ndarray or sp.spmatrix
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param qudits: The qudits of the enclosing instruction that this
+            gate acts on, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
+        :raises ValueError: The matrix is not a product of Hadamard gates
+        :return: The Fourier gate
+        :rtype: FourierGate
+        """
+        num_qudits = Instruction.infer_num_qudits(dim, matrix.shape[0])
+        powers = cls.matrix_powers(
+            matrix, Instruction.qudit_dims(dim, num_qudits))
+        return cls(name, powers, num_qudits, dim, qudits)
+
+    @classmethod
+    def H(cls, dim: int = 3, qudits: Iterable[int] = None):
+        """
+        The Hadamard gate, see QuantumCircuitMatrix.H_gate
+
+        :return: The Hadamard gate
+        :rtype: FourierGate
+        """
+        return cls("H", [1], 1, dim, qudits)
+
+    @classmethod
+    def H_dagger(cls, dim: int = 3, qudits: Iterable[int] = None):
+        """
+        The inverse Hadamard gate, see QuantumCircuitMatrix.H_dagger_gate
+
+        :return: The inverse Hadamard gate
+        :rtype: FourierGate
+        """
+        return cls("H†", [3], 1, dim, qudits)
+
+    @classmethod
+    def layer(cls, qudits: Iterable[int], power: int = 1, dim: int = 3):
+        """
+        A layer of the same power of the Hadamard gate on every given qudit
+
+        :param qudits: The qudits of the enclosing instruction
+        :type qudits: Iterable[int]
+        :param power: The power of the Hadamard gate, defaults to 1
+        :type power: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: The layer of Hadamard gates
+        :rtype: FourierGate
+        """
+        qudits = tuple(qudits)
+        name = "H" if power % 4 == 1 else "H^%s" % (power % 4)
+        return cls(name, [power] * len(qudits), len(qudits), dim, qudits)
+
+    def astype(self, dtype: np.dtype):
+        """
+        Returns the gate, whose powers are never cast
+
+        :param dtype: The dtype of the states
+        :type dtype: np.dtype
+        :return: The gate
+        :rtype: FourierGate
+        """
+        return self
+
+    def inverse(self):
+        """
+        Returns the inverse of the gate, i.e. the negated powers
+
+        :return: The inverse of the gate
+        :rtype: FourierGate
+        """
+        gate = copy(self)
+        gate.instructions = -self.powers % 4
+        gate.name = Instruction.inverse_name(self.name)
+        return gate
+
+    def order(self, max_order: int = 64):
+        """
+        Finds the smallest positive power of the gate which is the identity,
+        which divides 4 since :math:`H^4 = I` (and :math:`H^2 = I` for qubits)
+
+        :param max_order: The largest order to consider, defaults to 64
+        :type max_order: int
+        :return: The order of the gate, or None if it exceeds max_order
+        :rtype: int
+        """
+        order = 1
+        for d, power in zip(self.dims, self.powers):
+            period = 2 if d <= 2 else 4
+            power_order = period // gcd(period, int(power))
+            order = order * power_order // gcd(order, power_order)
+        return order if order <= max_order else None
+
+    def power(self, k: int):
+        """
+        Raises the gate to the power k by multiplying its powers by k
+
+        :param k: The power
+        :type k: int
+        :raises TypeError: If k is not an integer
+        :return: The gate to the power k
+        :rtype: FourierGate
+        """
+        if not isinstance(k, (int, np.integer)):
+            raise TypeError("%s.power() needs an integer power, not %r"
+                            % (str(self), k))
+        gate = copy(self)
+        gate.instructions = self.powers * k % 4
+        gate.name = Instruction.power_name(self.name, k)
+        return gate
+
+    def to_matrix(self, sparse: bool = None):
+        """
+        Converts the gate into matrix form
+
+        :param sparse: Whether to return a sparse matrix, defaults to a dense
+            matrix
+        :type sparse: bool
+        :return: The gate in matrix form
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        if sparse is None:
+            return self.matrix
+        return Misc.auto_format(self.matrix, sparse)
+
+    def apply(self, state: np.ndarray, axes: tuple[int] = None,
+              inplace: bool = False):
+        """
+        Applies the gate to a state tensor of shape (d_0, ..., d_{n-1}) as
+        batched FFTs along the target axes
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param axes: The state axes of the gate's qudits, defaults to the
+            first num_qudits axes
+        :type axes: tuple[int]
+        :param inplace: Unused, as the FFTs always write a new state tensor,
+            defaults to False
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        if axes is None:
+            axes = tuple(range(self.num_qudits))
+        return StateVectorKernels.apply_fourier(state, self.powers, axes)
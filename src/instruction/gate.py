@@ -9,11 +9,17 @@ Date of Initial Creation: January 3, 2022
 
 """
 
+from copy import copy
+
 import numpy as np
 
+from src.MiscFunctions import MiscFunctions as Misc
+from src.Precision import Precision
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
 from src.instruction import Instruction
+from src.simulator.kernels import StateVectorKernels
 
-from typing import overload
+from typing import Iterable, overload
 
 __author__      = "Alex Lim"
 __credits__     = "Alex Lim"
@@ -22,6 +28,8 @@ __maintainer__  = "Alex Lim"
 
 class Gate(Instruction):
     """Creates matrix-based quantum gate objects"""
+    __slots__ = ("_order",)
+
     @overload
     def __init__(self, gate: 'Gate'):
         """
@@ -31,11 +39,12 @@ class Gate(Instruction):
         :type gate: gate
         """
         Instruction.__init__(self, gate.name, gate.instructions,
-                             gate.num_qudits, gate.dim)
+                             gate.num_qudits, gate.dim, gate.qudits)
 
     def __init__(self, name: str = None,
                  instructions: np.ndarray = None,
-                 num_qudits: int = None, dim: int = 3):
+                 num_qudits: int = None, dim: int = 3,
+                 qudits: Iterable[int] = None):
         """
         Creates a new matrix-based quantum gate
 
@@ -48,8 +57,23 @@ class Gate(Instruction):
         :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
             defaults to 3
         :type dim: int
+        :param qudits: The qudits of the enclosing instruction that this
+            gate acts on, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
+        """
+        Instruction.__init__(self, name, instructions, num_qudits, dim, qudits)
+
+    @property
+    def matrix(self):
+        """
+        Gets the gate's matrix
+
+        :return: The gate's matrix
+        :rtype: np.ndarray or sp.spmatrix
         """
-        Instruction.__init__(self, name, instructions, num_qudits, dim)
+        if self.instructions is None:
+            return None
+        return self.instructions[0]
 
     @property
     def num_qudits(self):
@@ -61,6 +85,16 @@ class Gate(Instruction):
         """
         return self._num_qudits
 
+    @matrix.setter
+    def matrix(self, matrix: np.ndarray):
+        """
+        Sets the gate's matrix
+
+        :param matrix: The gate's matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        """
+        self.instructions = matrix
+
     @num_qudits.setter
     def num_qudits(self, num_qudits: int = None):
         """
@@ -71,30 +105,222 @@ class Gate(Instruction):
         :type num_qudits: int
         """
         if num_qudits is not None:
-            self.num_qudits = num_qudits
+            self._num_qudits = num_qudits
         elif self.instructions is not None and self.dim is not None:
-            self.num_qudits = \
-                int(np.log(self.instructions.shape[0]) / np.log(self.dim))
+            self._num_qudits = Instruction.infer_num_qudits(
+                self.dim, self.matrix.shape[0])
         else:
-            self.num_qudits = None
+            self._num_qudits = None
         if self.num_qudits is not None \
                 and self.instructions is not None and self.dim is not None:
-            num_bits = self.dim ** self.num_qudits
+            num_bits = Instruction.num_states(self.dim, self.num_qudits)
             if num_bits > self.matrix.shape[0]:
                 num_cat = num_bits - self.matrix.shape[0]
-                self.matrix = np.concatenate(
-                    (self.matrix, np.zeros([num_cat, num_bits])), axis=0
-                )
-                self.matrix = np.concatenate(
-                    (self.matrix, np.concatenate(
-                        np.zeros((num_bits, num_cat)), np.identity(num_cat),
-                        axis=0)
-                     ), axis=1
-                )
+                matrix = Misc.to_dense(self.matrix)
+                self.matrix = np.block([
+                    [matrix, np.zeros([matrix.shape[0], num_cat])],
+                    [np.zeros([num_cat, matrix.shape[1]]),
+                     np.identity(num_cat)]])
             elif num_bits < self.matrix.shape[0]:
-                for i in range(2):
-                    self.matrix = np.delete(
-                        self.matrix, range(self.num_qudits, num_bits), axis=i)
+                self.matrix = self.matrix[:num_bits, :num_bits]
+
+    def to_matrix(self, sparse: bool = None):
+        """
+        Converts the gate into matrix form
+
+        :param sparse: Whether to return a sparse matrix, defaults to the form
+            the gate's matrix is stored in
+        :type sparse: bool
+        :return: The gate in matrix form
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        if sparse is None:
+            return self.matrix
+        return Misc.auto_format(self.matrix, sparse)
+
+    def apply(self, state: np.ndarray, axes: tuple[int] = None,
+              inplace: bool = False):
+        """
+        Applies the gate to a state tensor of shape (d_0, ..., d_{n-1})
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param axes: The state axes of the gate's qudits, defaults to the
+            first num_qudits axes
+        :type axes: tuple[int]
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        if axes is None:
+            axes = tuple(range(self.num_qudits))
+        return StateVectorKernels.apply_matrix(state, self.matrix, axes,
+                                               inplace=inplace)
+
+    def inverse(self):
+        """
+        Returns the inverse of the gate, i.e. its conjugate transpose
+
+        :return: The inverse of the gate
+        :rtype: Gate
+        """
+        gate = copy(self)
+        gate.matrix = Misc.T(self.matrix)
+        gate.name = Instruction.inverse_name(self.name)
+        return gate
+
+    def order(self, max_order: int = 64, max_qudits: int = 2):
+        """
+        Finds the smallest positive power of the gate which is the identity,
+        e.g. 4 for the Hadamard gate
+
+        :param max_order: The largest order to consider, defaults to 64
+        :type max_order: int
+        :param max_qudits: The largest number of qudits to find the order of,
+            defaults to 2
+        :type max_qudits: int
+        :return: The order of the gate, or None if it is unknown
+        :rtype: int
+        """
+        if self.num_qudits is None or self.num_qudits > max_qudits:
+            return None
+        cached = getattr(self, "_order", None)
+        if cached is not None and cached[0] is self.instructions \
+                and cached[1] == max_order:
+            return cached[2]
+        matrix = Misc.to_dense(self.matrix)
+        identity = np.identity(len(matrix))
+        order = None
+        power = matrix
+        for k in range(1, max_order + 1):
+            if Precision.allclose(power, identity):
+                order = k
+                break
+            power = np.dot(power, matrix)
+        self._order = (self.instructions, max_order, order)
+        return order
+
+    def power(self, k: int):
+        """
+        Raises the gate to the power k, after reducing k modulo the order of
+        the gate if it is known. Negative powers are powers of the inverse,
+        and repeated squaring is only used for the remaining power.
+
+        :param k: The power
+        :type k: int
+        :raises TypeError: If k is not an integer
+        :return: The gate to the power k
+        :rtype: Gate
+        """
+        if not isinstance(k, (int, np.integer)):
+            raise TypeError("%s.power() needs an integer power, not %r"
+                            % (str(self), k))
+        order = self.order()
+        if order is not None:
+            k %= order
+        if k < 0:
+            return self.inverse().power(-k)
+        if k == 1:
+            return self
+        gate = copy(self)
+        gate.matrix = np.linalg.matrix_power(Misc.to_dense(self.matrix), k)
+        gate.name = Instruction.power_name(self.name, k)
+        return gate
+
+    def controlled(self, control_value: int = None, control_dim: int = None):
+        """
+        Returns the controlled version of the gate, acting on a new control
+        qudit 0 followed by the gate's qudits
+
+        :param control_value: The state of the control qudit for which the
+            gate is applied, defaults to control_dim - 1 (ie: |2⟩ for
+            qutrits)
+        :type control_value: int
+        :param control_dim: The dimension of the control qudit, defaults to
+            the dimension of the gate's first qudit
+        :type control_dim: int
+        :return: The controlled gate
+        :rtype: Controlled
+        :raises ValueError: The control value is not a state of the control
+            qudit
+        """
+        from src.instruction.controlled import Controlled
+        dim = Instruction.controlled_dim(self.dim, self.num_qudits,
+                                         control_dim)
+        if control_value is None:
+            control_value = Instruction.qudit_dims(dim, 1)[0] - 1
+        return Controlled(self.on(None), [(0, control_value)],
+                          range(1, self.num_qudits + 1), dim=dim)
+
+    def is_clifford(self, max_qudits: int = 2):
+        """
+        Checks if the gate is a Clifford gate, i.e. if it maps every
+        generalized Pauli X and Z gate to a Pauli gate up to a phase under
+        conjugation
+
+        :param max_qudits: The largest number of qudits to check, as larger
+            gates are assumed to not be Clifford gates, defaults to 2
+        :type max_qudits: int
+        :return: If the gate is a Clifford gate
+        :rtype: bool
+        """
+        if self.num_qudits is None or self.num_qudits > max_qudits \
+                or len(set(self.dims)) > 1:
+            return False
+        dim = self.dims[0] if self.dims else self.dim
+        matrix = Misc.to_dense(self.matrix)
+        matrix_dag = Misc.T(matrix)
+        paulis = [QCM.X_gate("+1", dim), QCM.Z_gate(dim)]
+        for qudit in range(self.num_qudits):
+            for pauli in paulis:
+                pauli = Instruction.extend_matrix(
+                    pauli, self.num_qudits, dim, [qudit])
+                if not Gate.ispauli(Misc.dot(matrix, pauli, matrix_dag),
+                                    self.num_qudits, dim):
+                    return False
+        return True
+
+    @staticmethod
+    def ispauli(matrix: np.ndarray, num_qudits: int, dim: int = 3):
+        """
+        Checks if a matrix is a generalized Pauli gate
+        :math:`X^a Z^b` up to a phase
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray
+        :param num_qudits: The number of qudits the matrix acts on
+        :type num_qudits: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :return: If the matrix is a Pauli gate up to a phase
+        :rtype: bool
+        """
+        shape = (dim,) * num_qudits
+        nonzero = ~Precision.isclose(matrix, 0)
+        if not np.all(nonzero.sum(axis=0) == 1):
+            return False
+        rows = nonzero.argmax(axis=0)
+        columns = np.arange(len(rows))
+        entries = matrix[rows, columns]
+        if not Precision.allclose(np.abs(entries), 1):
+            return False
+        digits = np.array(np.unravel_index(columns, shape))
+        shift = digits[:, :1] - np.array(np.unravel_index(rows[:1], shape))
+        if not np.all(np.array(np.unravel_index(rows, shape))
+                      == (digits - shift) % dim):
+            return False
+        phases = entries / entries[0]
+        unit_columns = [np.ravel_multi_index(
+            tuple(int(q == j) for q in range(num_qudits)), shape)
+            for j in range(num_qudits)]
+        powers = np.round(np.angle(phases[unit_columns])
+                          * dim / (2 * np.pi)).astype(int)
+        omega = np.e ** (2 * np.pi * 1j / dim)
+        return Precision.allclose(phases, omega ** (powers @ digits))
 
     # TODO: implement this method to display the quantum gate like in Qiskit
     def display(self):
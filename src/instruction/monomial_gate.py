@@ -0,0 +1,404 @@
+"""
+Monomial Gate
+
+Creates quantum gate objects which permute the standard basis states up to
+phases, e.g. the Pauli-X, CX, and SWAP gates
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import math
+from copy import copy
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc, sp
+from src.Permutation import Permutation
+from src.Precision import Precision
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+from src.instruction import Instruction
+from src.instruction.gate import Gate
+from src.simulator.kernels import StateVectorKernels
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class MonomialGate(Gate):
+    """Creates quantum gate objects which map each standard basis state |j⟩
+    to phases[j]|permutation[j]⟩. Only the permutation and phases are stored,
+    so gates are inverted, composed, and raised to powers in closed form.
+    The permutation is stored in the smallest unsigned integer dtype, e.g.
+    uint8 for gates of at most 256 states, and integer phases in int8."""
+    __slots__ = ("_permutation",)
+
+    def __init__(self, name: str = None, permutation: Iterable[int] = None,
+                 phases: np.ndarray = None, num_qudits: int = None,
+                 dim: int = 3, qudits: Iterable[int] = None):
+        """
+        Creates a new monomial quantum gate
+
+        :param name: The name of the gate
+        :type name: str
+        :param permutation: The standard basis state each standard basis
+            state is mapped to
+        :type permutation: Iterable[int]
+        :param phases: The phase each standard basis state gains, defaults to
+            no phases
+        :type phases: np.ndarray
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param qudits: The qudits of the enclosing instruction that this
+            gate acts on, defaults to the first num_qudits qudits
+        :type qudits: Iterable[int]
+        """
+        self._permutation = MonomialGate.compact_permutation(permutation)
+        if phases is None:
+            phases = np.ones(len(self._permutation), dtype=np.int8)
+        Gate.__init__(self, name, Precision.compact(np.ravel(phases)),
+                      num_qudits, dim, qudits)
+
+    @property
+    def permutation(self):
+        """
+        Gets the standard basis state each standard basis state is mapped to
+
+        :return: The permutation of the standard basis states
+        :rtype: np.ndarray
+        """
+        return self._permutation
+
+    @property
+    def phases(self):
+        """
+        Gets the phase each standard basis state gains
+
+        :return: The phases
+        :rtype: np.ndarray
+        """
+        return self.instructions[0]
+
+    @property
+    def matrix(self):
+        """
+        Gets the gate's matrix
+
+        :return: The gate's matrix
+        :rtype: np.ndarray
+        """
+        matrix = np.zeros((len(self.phases),) * 2, dtype=self.phases.dtype)
+        matrix[self.permutation, np.arange(len(self.phases))] = self.phases
+        return matrix
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return self._num_qudits
+
+    @matrix.setter
+    def matrix(self, matrix: np.ndarray):
+        """
+        Sets the gate's matrix
+
+        :param matrix: A monomial matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        """
+        permutation, phases = MonomialGate.matrix_monomial(matrix)
+        self._permutation = MonomialGate.compact_permutation(permutation)
+        self.instructions = Precision.compact(phases)
+
+    @num_qudits.setter
+    def num_qudits(self, num_qudits: int = None):
+        """
+        Sets the number of qudits
+
+        :param num_qudits: The number of qudits, defaults to the minimum number
+            of required qudits
+        :type num_qudits: int
+        """
+        if num_qudits is None:
+            num_qudits = Instruction.infer_num_qudits(
+                self.dim, len(self.permutation))
+        if Instruction.num_states(self.dim, num_qudits) \
+                != len(self.permutation):
+            raise ValueError("a permutation of %s states does not act on %s "
+                             "qudits" % (len(self.permutation), num_qudits))
+        self._num_qudits = num_qudits
+
+    @staticmethod
+    def compact_permutation(permutation: Iterable[int]):
+        """
+        Stores a permutation in the smallest unsigned integer dtype which
+        indexes its states, shared with the gates of equal permutations
+
+        :param permutation: The standard basis state each standard basis
+            state is mapped to
+        :type permutation: Iterable[int]
+        :return: The permutation
+        :rtype: np.ndarray
+        """
+        permutation = np.asarray(permutation)
+        return Instruction.intern(Precision.cast(
+            permutation, Precision.index_dtype(len(permutation))))
+
+    @staticmethod
+    def matrix_monomial(matrix: np.ndarray):
+        """
+        Gets the permutation and phases of a monomial matrix
+
+        :param matrix: A monomial matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :raises ValueError: The matrix is not monomial
+        :return: The permutation and phases of the matrix
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        matrix = Misc.to_dense(matrix)
+        nonzero = matrix != 0
+        if not (np.all(nonzero.sum(axis=0) == 1)
+                and np.all(nonzero.sum(axis=1) == 1)):
+            raise ValueError("the matrix is not monomial")
+        permutation = nonzero.argmax(axis=0)
+        return permutation, matrix[permutation, np.arange(len(permutation))]
+
+    @staticmethod
+    def ismonomial(matrix: np.ndarray):
+        """
+        Checks if a matrix is monomial, i.e. has exactly one nonzero entry in
+        each row and column
+
+        :param matrix: A matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :return: If the matrix is monomial
+        :rtype: bool
+        """
+        try:
+            MonomialGate.matrix_monomial(matrix)
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def from_matrix(cls, name: str, matrix: np.ndarray, dim: int = 3,
+                    qudits: Iterable[int] = None):
+        """
+        Creates a monomial gate from a monomial matrix
+
+        :param name: The name of the gate
+        :type name: str
+        :param matrix: A monomial matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            defaults to 3
+        :type dim: int
+        :param qudits: The qudits the gate acts on
+        :type qudits: Iterable[int]
+        :raises ValueError: The matrix is not monomial
+        :return: The monomial gate
+        :rtype: MonomialGate
+        """
+        permutation, phases = cls.matrix_monomial(matrix)
+        return cls(name, permutation, phases, dim=dim, qudits=qudits)
+
+    @classmethod
+    def X(cls, gate: str = "+1", dim: int = 3, qudits: Iterable[int] = None):
+        """
+        The Pauli-X gate, see QuantumCircuitMatrix.X_gate
+
+        :return: The Pauli-X gate
+        :rtype: MonomialGate
+        """
+        return cls("X" + gate, Permutation.parse(gate, dim).image, dim=dim,
+                   qudits=qudits)
+
+    @classmethod
+    def CX(cls, qudits: Iterable[int] = None):
+        """
+        The qutrit CX gate, see QuantumCircuitMatrix.CX_gate
+
+        :return: The qutrit CX gate
+        :rtype: MonomialGate
+        """
+        return cls.from_matrix("CX", QCM.CX_gate(), 3, qudits)
+
+    @classmethod
+    def swap(cls, dim: int = 3, qudits: Iterable[int] = None):
+        """
+        The SWAP gate, see QuantumCircuitMatrix.swap_gate
+
+        :return: The SWAP gate
+        :rtype: MonomialGate
+        """
+        return cls.from_matrix("SWAP", QCM.swap_gate(dim), dim, qudits)
+
+    def compose(self, other: 'MonomialGate'):
+        """
+        Composes the gate with another monomial gate on the same qudits, in
+        matrix product order
+
+        :param other: Another monomial gate
+        :type other: MonomialGate
+        :return: The product of the gates
+        :rtype: MonomialGate
+        """
+        if not isinstance(other, MonomialGate) \
+                or self.resolved_qudits() != other.resolved_qudits():
+            raise TypeError("%s cannot be composed with %s"
+                            % (str(self), str(other)))
+        return MonomialGate("%s*%s" % (self.name, other.name),
+                            self.permutation[other.permutation],
+                            self.phases[other.permutation] * other.phases,
+                            self.num_qudits, self.dim, self.qudits)
+
+    def __matmul__(self, other: 'MonomialGate'):
+        """
+        Composes two monomial gates when the '@' operator is used
+
+        :param other: Another monomial gate
+        :type other: MonomialGate
+        :return: The product of the gates
+        :rtype: MonomialGate
+        """
+        return self.compose(other)
+
+    def inverse(self):
+        """
+        Returns the inverse of the gate, i.e. the inverse permutation with
+        conjugated phases
+
+        :return: The inverse of the gate
+        :rtype: MonomialGate
+        """
+        permutation = np.empty_like(self.permutation)
+        permutation[self.permutation] = np.arange(len(self.permutation))
+        phases = np.empty_like(self.phases)
+        phases[self.permutation] = np.conj(self.phases)
+        gate = copy(self)
+        gate._permutation = MonomialGate.compact_permutation(permutation)
+        gate.instructions = phases
+        gate.name = Instruction.inverse_name(self.name)
+        return gate
+
+    def order(self, max_order: int = 64):
+        """
+        Finds the order of the gate from the lengths of the cycles of its
+        permutation and the phases it gains around each cycle
+
+        :param max_order: The largest order to consider, defaults to 64
+        :type max_order: int
+        :return: The order of the gate, or None if it exceeds max_order
+        :rtype: int
+        """
+        cycle_order = 1
+        visited = np.zeros(len(self.permutation), dtype=bool)
+        for start in range(len(self.permutation)):
+            length = 0
+            state = start
+            while not visited[state]:
+                visited[state] = True
+                state = self.permutation[state]
+                length += 1
+            if length:
+                cycle_order = cycle_order * length \
+                    // math.gcd(cycle_order, length)
+        if cycle_order > max_order:
+            return None
+        phase_order = Misc.phase_order(
+            self.power(cycle_order, reduce=False).phases,
+            max_order // cycle_order)
+        if phase_order is None:
+            return None
+        return cycle_order * phase_order
+
+    def power(self, k: int, reduce: bool = True):
+        """
+        Raises the gate to the power k by repeated squaring of its permutation
+        and phases, after reducing k modulo the order of the gate
+
+        :param k: The power
+        :type k: int
+        :param reduce: Whether to reduce k modulo the order, defaults to True
+        :type reduce: bool
+        :raises TypeError: If k is not an integer
+        :return: The gate to the power k
+        :rtype: MonomialGate
+        """
+        if not isinstance(k, (int, np.integer)):
+            raise TypeError("%s.power() needs an integer power, not %r"
+                            % (str(self), k))
+        if reduce:
+            order = self.order()
+            if order is not None:
+                k %= order
+        if k < 0:
+            return self.inverse().power(-k, reduce)
+        if k == 1:
+            return self
+        power = k
+        permutation = np.arange(len(self.permutation))
+        phases = np.ones(len(self.phases), dtype=self.phases.dtype)
+        base_permutation, base_phases = self.permutation, self.phases
+        while k:
+            if k & 1:
+                phases = base_phases[permutation] * phases
+                permutation = base_permutation[permutation]
+            base_phases = base_phases[base_permutation] * base_phases
+            base_permutation = base_permutation[base_permutation]
+            k >>= 1
+        gate = copy(self)
+        gate._permutation = MonomialGate.compact_permutation(permutation)
+        gate.instructions = phases
+        gate.name = Instruction.power_name(self.name, power)
+        return gate
+
+    def to_matrix(self, sparse: bool = None):
+        """
+        Converts the gate into matrix form
+
+        :param sparse: Whether to return a sparse matrix, defaults to choosing
+            by fill ratio
+        :type sparse: bool
+        :return: The gate in matrix form
+        :rtype: np.ndarray or sp.csr_matrix
+        """
+        if sparse is not False and sp is not None:
+            size = len(self.permutation)
+            return Misc.auto_format(sp.csr_matrix(
+                (self.phases, (self.permutation, np.arange(size))),
+                shape=(size, size)), sparse)
+        return self.matrix
+
+    def apply(self, state: np.ndarray, axes: tuple[int] = None,
+              inplace: bool = False):
+        """
+        Applies the gate to a state tensor of shape (d_0, ..., d_{n-1}) by
+        permuting and rephasing the amplitudes along the target axes
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param axes: The state axes of the gate's qudits, defaults to the
+            first num_qudits axes
+        :type axes: tuple[int]
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        if axes is None:
+            axes = tuple(range(self.num_qudits))
+        return StateVectorKernels.apply_monomial(
+            state, self.permutation, self.phases, axes, inplace=inplace)
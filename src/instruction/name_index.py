@@ -0,0 +1,156 @@
+"""
+Name Index
+
+Indexes the positions of instructions by name for constant time lookups and
+prefix queries
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from bisect import bisect_left, insort
+from typing import Iterable
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class NameIndex(object):
+    """Maps the names of instructions, and their case-folded names, to the
+    sorted positions of the instructions with that name. The distinct names
+    are also kept sorted, so all names with a given prefix are found by
+    bisection instead of a scan."""
+    __slots__ = ("_positions", "_names")
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Creates a new name index
+
+        :param names: The names of the instructions in order, where None is
+            not indexed
+        :type names: Iterable[str]
+        """
+        self._positions = ({}, {})
+        self._names = ([], [])
+        for position, name in enumerate(names):
+            self.add(name, position)
+
+    @staticmethod
+    def keys(name: str):
+        """
+        Gets the keys of a name in the exact and case-folded indices
+
+        :param name: A name
+        :type name: str
+        :return: The name and its case-folded name
+        :rtype: tuple[str, str]
+        """
+        return name, name.casefold()
+
+    def add(self, name: str, position: int):
+        """
+        Adds the position of an instruction
+
+        :param name: The name of the instruction
+        :type name: str
+        :param position: The position of the instruction
+        :type position: int
+        """
+        if name is None:
+            return
+        for key, positions, names in zip(self.keys(name), self._positions,
+                                         self._names):
+            if key not in positions:
+                positions[key] = []
+                insort(names, key)
+            if not positions[key] or positions[key][-1] < position:
+                positions[key].append(position)
+            else:
+                insort(positions[key], position)
+
+    def discard(self, name: str, position: int):
+        """
+        Removes the position of an instruction
+
+        :param name: The name of the instruction
+        :type name: str
+        :param position: The position of the instruction
+        :type position: int
+        """
+        if name is None:
+            return
+        for key, positions, names in zip(self.keys(name), self._positions,
+                                         self._names):
+            key_positions = positions[key]
+            del key_positions[bisect_left(key_positions, position)]
+            if not key_positions:
+                del positions[key]
+                del names[bisect_left(names, key)]
+
+    def shift(self, start: int, delta: int):
+        """
+        Shifts the positions of all instructions at or after a position, e.g.
+        after inserting or removing an instruction
+
+        :param start: The first position to shift
+        :type start: int
+        :param delta: The amount to shift by
+        :type delta: int
+        """
+        for positions in self._positions:
+            for key_positions in positions.values():
+                for i in range(bisect_left(key_positions, start),
+                               len(key_positions)):
+                    key_positions[i] += delta
+
+    def reverse(self, length: int):
+        """
+        Reverses the positions of all instructions
+
+        :param length: The number of instructions
+        :type length: int
+        """
+        for positions in self._positions:
+            for key, key_positions in positions.items():
+                positions[key] = [length - 1 - position
+                                  for position in reversed(key_positions)]
+
+    def positions(self, name: str, case_sensitive: bool = True):
+        """
+        Gets the sorted positions of the instructions with a name
+
+        :param name: The name of the instructions
+        :type name: str
+        :param case_sensitive: If the name is case-sensitive, defaults to True
+        :type case_sensitive: bool
+        :return: The positions
+        :rtype: list[int]
+        """
+        key = self.keys(name)[not case_sensitive]
+        return self._positions[not case_sensitive].get(key, [])
+
+    def prefix_positions(self, prefix: str, case_sensitive: bool = True):
+        """
+        Gets the sorted positions of the instructions whose name starts with
+        a prefix, e.g. "tcx" for every tcx* block
+
+        :param prefix: The prefix of the names
+        :type prefix: str
+        :param case_sensitive: If the prefix is case-sensitive, defaults to
+            True
+        :type case_sensitive: bool
+        :return: The positions
+        :rtype: list[int]
+        """
+        key = self.keys(prefix)[not case_sensitive]
+        positions = self._positions[not case_sensitive]
+        names = self._names[not case_sensitive]
+        matches = list()
+        for i in range(bisect_left(names, key), len(names)):
+            if not names[i].startswith(key):
+                break
+            matches.extend(positions[names[i]])
+        return sorted(matches)
@@ -0,0 +1,169 @@
+"""
+Resource Estimator
+
+Estimates the gate counts, T-count, depth, memory, and FLOPs of instructions
+from their compiled instruction stream, without building matrices
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import numpy as np
+
+from src.instruction import Instruction
+from src.instruction.compiled import CompiledCircuit
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class ResourceEstimator(object):
+    """Estimates the resources of instructions in one pass over their
+    compiled instruction stream. Every distinct gate is classified once, so
+    the cost is dominated by the depth computation over the records."""
+    @staticmethod
+    def gate_controls(gate: Instruction):
+        """
+        Gets the number of control qudits of a gate
+
+        :param gate: A gate
+        :type gate: Instruction
+        :return: The number of control qudits
+        :rtype: int
+        """
+        from src.instruction.controlled import Controlled
+        if isinstance(gate, Controlled):
+            return len(gate.controls)
+        return 0
+
+    @staticmethod
+    def is_t(gate: Instruction):
+        """
+        Checks if a gate counts towards the T-count, i.e. if it is a
+        single-qudit diagonal gate which is not a Clifford gate, e.g. T and T†
+
+        :param gate: A gate
+        :type gate: Instruction
+        :return: If the gate counts towards the T-count
+        :rtype: bool
+        """
+        from src.optimizer.peephole import PeepholeOptimizer
+        return PeepholeOptimizer.t_count([gate]) == 1
+
+    @staticmethod
+    def is_clifford(gate: Instruction):
+        """
+        Checks if a gate is a Clifford gate of at most two qudits
+
+        :param gate: A gate
+        :type gate: Instruction
+        :return: If the gate is a Clifford gate
+        :rtype: bool
+        """
+        from src.instruction.gate import Gate
+        return isinstance(gate, Gate) and gate.is_clifford()
+
+    @staticmethod
+    def gate_flops(gate: Instruction, num_targets: int, num_qudits: int,
+                   dim: int = 3):
+        """
+        Estimates the real floating point operations of applying a gate to a
+        state vector
+
+        :param gate: A gate
+        :type gate: Instruction
+        :param num_targets: The number of qudits the gate acts on
+        :type num_targets: int
+        :param num_qudits: The number of qudits of the state
+        :type num_qudits: int
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3),
+            or the geometric mean dimension for qudits of mixed dimensions,
+            defaults to 3
+        :type dim: int or float
+        :return: The floating point operations
+        :rtype: int or float
+        """
+        from src.instruction.diagonal_gate import DiagonalGate
+        from src.instruction.monomial_gate import MonomialGate
+        controls = ResourceEstimator.gate_controls(gate)
+        size = dim ** (num_qudits - controls)
+        if isinstance(gate, (DiagonalGate, MonomialGate)):
+            return 6 * size
+        return 8 * size * dim ** (num_targets - controls)
+
+    @staticmethod
+    def estimate(instruction: Instruction or CompiledCircuit,
+                 num_qudits: int = None):
+        """
+        Estimates the resources of an instruction
+
+        :param instruction: An instruction or compiled circuit
+        :type instruction: Instruction or CompiledCircuit
+        :param num_qudits: The number of qudits, defaults to the instruction's
+            number of qudits
+        :type num_qudits: int
+        :return: The gate count, gates by class and by number of controls,
+            T-count, Clifford count, depth, qudit width, and the estimated
+            bytes and FLOPs of each backend
+        :rtype: dict
+        """
+        compiled = instruction if isinstance(instruction, CompiledCircuit) \
+            else CompiledCircuit(instruction, num_qudits=num_qudits)
+        num_qudits = compiled.num_qudits or 0
+        num_states = Instruction.num_states(compiled.instruction.dim,
+                                            num_qudits)
+        dim = compiled.instruction.dim
+        if not isinstance(dim, int):
+            dim = num_states ** (1 / num_qudits)
+        opcodes = compiled.opcodes
+        offsets = compiled.offsets
+        widths = np.diff(offsets)
+        by_class, by_controls = dict(), dict()
+        t_count, clifford_count, flops = 0, 0, 0
+        for opcode, first, count in zip(*np.unique(
+                opcodes, return_index=True, return_counts=True)):
+            gate = compiled.gate(int(opcode))
+            count = int(count)
+            name = type(gate).__name__
+            by_class[name] = by_class.get(name, 0) + count
+            controls = ResourceEstimator.gate_controls(gate)
+            by_controls[controls] = by_controls.get(controls, 0) + count
+            if ResourceEstimator.is_t(gate):
+                t_count += count
+            if ResourceEstimator.is_clifford(gate):
+                clifford_count += count
+            flops += count * ResourceEstimator.gate_flops(
+                gate, int(widths[first]), num_qudits, dim)
+        flops = int(round(flops))
+        layers = [0] * num_qudits
+        targets = compiled.targets.tolist()
+        offsets = offsets.tolist()
+        for i in range(len(opcodes)):
+            qudits = targets[offsets[i]:offsets[i + 1]]
+            layer = 1 + max(layers[q] for q in qudits)
+            for q in qudits:
+                layers[q] = layer
+        state_bytes = 16 * num_states
+        return {
+            "gate_count": len(opcodes),
+            "gates_by_class": by_class,
+            "gates_by_controls": by_controls,
+            "t_count": t_count,
+            "clifford_count": clifford_count,
+            "depth": max(layers, default=0),
+            "width": len(np.unique(compiled.targets)),
+            "num_qudits": num_qudits,
+            "memory": {
+                "statevector": state_bytes,
+                "density_matrix": state_bytes * num_states,
+                "unitary": state_bytes * num_states,
+            },
+            "flops": {
+                "statevector": flops,
+                "density_matrix": 2 * flops * num_states,
+                "unitary": flops * num_states,
+            },
+        }
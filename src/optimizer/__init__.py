@@ -0,0 +1,13 @@
+"""
+BitOQutritSim optimizer package
+
+Enables rewriting instructions into cheaper equivalent instructions for the
+BitOQutritSim package.
+
+Author: Alex Lim
+
+"""
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
@@ -0,0 +1,193 @@
+"""
+Peephole Optimizer
+
+Cancels inverse pairs and reduces runs of gates modulo their order
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.Precision import Precision
+from src.instruction import Instruction
+from src.instruction.circuit import Circuit
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.gate import Gate
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class PeepholeOptimizer(object):
+    """Cancels inverse pairs and reduces runs of gates modulo their order,
+    e.g. swap·swap, tau0_1·tau0_1, kron(Misc.T(x), I)·kron(x, I), and runs
+    of four H gates. Gates are moved past gates on other qudits, and
+    optionally diagonal gates past each other, to expose more
+    cancellations."""
+    def __init__(self, commute_diagonals: bool = True,
+                 merge_diagonals: bool = True):
+        """
+        Creates a new peephole optimizer
+
+        :param commute_diagonals: Whether diagonal gates may be moved past
+            each other, defaults to True
+        :type commute_diagonals: bool
+        :param merge_diagonals: Whether diagonal gates on the same qudits are
+            merged into a single diagonal gate, defaults to True
+        :type merge_diagonals: bool
+        """
+        self.commute_diagonals = commute_diagonals
+        self.merge_diagonals = merge_diagonals
+
+    @staticmethod
+    def t_count(gates: list[Instruction]):
+        """
+        Counts the single-qudit diagonal gates which are not Clifford gates,
+        e.g. T and T†
+
+        :param gates: The gates
+        :type gates: list[Instruction]
+        :return: The number of non-Clifford single-qudit diagonal gates
+        :rtype: int
+        """
+        count = 0
+        for gate in gates:
+            if isinstance(gate, Gate) and gate.num_qudits == 1 \
+                    and (isinstance(gate, DiagonalGate)
+                         or DiagonalGate.isdiagonal(gate.matrix)) \
+                    and not gate.is_clifford():
+                count += 1
+        return count
+
+    @staticmethod
+    def depth(gates: list[Instruction]):
+        """
+        Finds the depth of a sequence of gates, i.e. the number of layers of
+        gates on disjoint qudits when every gate is placed as early as possible
+
+        :param gates: The gates
+        :type gates: list[Instruction]
+        :return: The depth
+        :rtype: int
+        """
+        layers = dict()
+        depth = 0
+        for gate in gates:
+            qudits = gate.resolved_qudits()
+            layer = 1 + max(layers.get(q, 0) for q in qudits)
+            for q in qudits:
+                layers[q] = layer
+            depth = max(depth, layer)
+        return depth
+
+    @staticmethod
+    def issame(instruction: Instruction, other: Instruction):
+        """
+        Checks if two instructions of the same enclosing instruction are the
+        same gate on the same qudits
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param other: Another instruction
+        :type other: Instruction
+        :return: If the instructions are the same
+        :rtype: bool
+        """
+        if instruction is other:
+            return True
+        if instruction.resolved_qudits() != other.resolved_qudits() \
+                or instruction.dim != other.dim:
+            return False
+        matrix = Misc.to_dense(instruction.to_matrix(sparse=False))
+        other_matrix = Misc.to_dense(other.to_matrix(sparse=False))
+        return matrix.shape == other_matrix.shape \
+            and Precision.allclose(matrix, other_matrix)
+
+    def commutes(self, instruction: Instruction, other: Instruction):
+        """
+        Checks if two instructions of the same enclosing instruction trivially
+        commute
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param other: Another instruction
+        :type other: Instruction
+        :return: If the instructions trivially commute
+        :rtype: bool
+        """
+        if self.commute_diagonals and isinstance(instruction, DiagonalGate) \
+                and isinstance(other, DiagonalGate):
+            return True
+        return not set(instruction.resolved_qudits()) \
+            & set(other.resolved_qudits())
+
+    @staticmethod
+    def isidentity(instruction: Instruction, exponent: int = 1):
+        """
+        Checks if a power of an instruction is the identity
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param exponent: The power, defaults to 1
+        :type exponent: int
+        :return: If the power of the instruction is the identity
+        :rtype: bool
+        """
+        if exponent == 0:
+            return True
+        order = instruction.order()
+        return order is not None and exponent % order == 0
+
+    def optimize(self, circuit: Instruction):
+        """
+        Rewrites the gates of a circuit, cancelling adjacent inverse pairs and
+        reducing runs of the same gate modulo its order.\n
+        * Note: Nested circuits are flattened.
+
+        :param circuit: A circuit
+        :type circuit: Instruction
+        :return: The optimized circuit and a report of the gate count and
+            T-count before and after optimizing
+        :rtype: tuple[Circuit, dict[str, int]]
+        """
+        gates = circuit.flatten()
+        runs = list()
+        for gate in gates:
+            for i in range(len(runs) - 1, -1, -1):
+                base, exponent = runs[i]
+                if self.issame(base, gate):
+                    runs[i][1] += 1
+                elif base.isinverse(gate):
+                    runs[i][1] -= 1
+                elif self.merge_diagonals \
+                        and isinstance(base, DiagonalGate) \
+                        and isinstance(gate, DiagonalGate) \
+                        and base.resolved_qudits() == gate.resolved_qudits():
+                    runs[i] = [base.power(exponent).compose(gate), 1]
+                elif self.commutes(base, gate):
+                    continue
+                else:
+                    runs.append([gate, 1])
+                    break
+                if self.isidentity(*runs[i]):
+                    del runs[i]
+                break
+            else:
+                runs.append([gate, 1])
+        optimized_gates = [base.power(exponent) for base, exponent in runs]
+        optimized = Circuit(circuit.name, optimized_gates, circuit.num_qudits,
+                            circuit.dim)
+        report = {
+            "gate_count_before": len(gates),
+            "gate_count_after": len(optimized_gates),
+            "t_count_before": self.t_count(gates),
+            "t_count_after": self.t_count(optimized_gates),
+        }
+        report["gates_removed"] = \
+            report["gate_count_before"] - report["gate_count_after"]
+        report["t_count_removed"] = \
+            report["t_count_before"] - report["t_count_after"]
+        return optimized, report
@@ -0,0 +1,495 @@
+"""
+Phase Gadget Optimizer
+
+Rewrites circuits of qudits of prime dimension as phase polynomials of
+phase gadgets, affine maps, and generic gates, fuses the gadgets, and
+extracts circuits back out
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.Precision import Precision
+from src.instruction import Instruction
+from src.instruction.circuit import Circuit
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.gate import Gate
+from src.instruction.monomial_gate import MonomialGate
+from src.optimizer.peephole import PeepholeOptimizer
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class PhaseGadgetDiagram(object):
+    """Represents a circuit of qudits of prime dimension d as a phase
+    polynomial in path-sum form. Every wire carries an affine form
+    mod d of the diagram's variables, and the nodes, in the order they act on
+    the state, are\n
+    * "phase": a phase gadget, i.e. a phase on the values of the affine
+    forms of its wires (e.g. Z, S, T, and controlled phases)\n
+    * "linear": an affine map mod d of its wires (e.g. X, CX, tau, and
+    SWAP)\n
+    * "generic": any other gate, whose outputs are new variables of the
+    diagram (e.g. H)\n
+    Phase gadgets on the same forms fuse wherever they are in the diagram,
+    and runs of single-qudit nodes between two
+    generic nodes on one wire whose product is monomial (e.g. H·S·H·S·H) are
+    fused into phase and linear nodes."""
+    def __init__(self, num_qudits: int, dim: int = 3):
+        """
+        Creates a new empty phase gadget diagram
+
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudit, which must be prime, defaults
+            to 3
+        :type dim: int
+        :raises ValueError: The dimension is not prime
+        """
+        if not isinstance(dim, int) or dim < 2 \
+                or any(dim % p == 0 for p in range(2, int(dim ** 0.5) + 1)):
+            raise ValueError("phase gadget diagrams need a prime dimension, "
+                             "not %s" % (dim,))
+        self.num_qudits = num_qudits
+        self.dim = dim
+        self.nodes = list()
+
+    @classmethod
+    def from_circuit(cls, circuit: Instruction):
+        """
+        Converts a circuit into a phase gadget diagram
+
+        :param circuit: A circuit
+        :type circuit: Instruction
+        :return: The phase gadget diagram
+        :rtype: PhaseGadgetDiagram
+        """
+        diagram = cls(circuit.num_qudits, circuit.dim)
+        for gate in reversed(circuit.flatten()):
+            diagram.add_gate(gate)
+        return diagram
+
+    def add_gate(self, gate: Instruction):
+        """
+        Appends a gate to the diagram, after the nodes already in it
+
+        :param gate: A gate of the circuit the diagram represents
+        :type gate: Instruction
+        """
+        qudits = gate.resolved_qudits()
+        if isinstance(gate, DiagonalGate):
+            self.nodes.append(self.phase_node(gate.diagonal, qudits,
+                                              gate.name, gate))
+        elif isinstance(gate, MonomialGate):
+            self.nodes.extend(self.monomial_nodes(
+                gate.permutation, gate.phases, qudits, gate.name, gate))
+        else:
+            self.nodes.extend(self.matrix_nodes(
+                Misc.to_dense(gate.to_matrix(sparse=False)), qudits,
+                gate.name, gate))
+
+    def phase_node(self, diagonal: np.ndarray, qudits: tuple[int],
+                   name: str = None, gate: Instruction = None):
+        """
+        Creates a phase gadget node
+
+        :param diagonal: The phases of the standard basis states of the qudits
+        :type diagonal: np.ndarray
+        :param qudits: The qudits
+        :type qudits: tuple[int]
+        :param name: The name of the gadget
+        :type name: str
+        :param gate: The gate the gadget is exactly equal to, if any
+        :type gate: Instruction
+        :return: The phase gadget node
+        :rtype: dict
+        """
+        return {"type": "phase", "qudits": tuple(qudits), "name": name,
+                "gate": gate, "source": gate,
+                "table": np.reshape(diagonal, (self.dim,) * len(qudits))}
+
+    def monomial_nodes(self, permutation: np.ndarray, phases: np.ndarray,
+                       qudits: tuple[int], name: str = None,
+                       gate: Instruction = None):
+        """
+        Creates the nodes of a monomial gate, i.e. a phase gadget on its
+        inputs followed by a linear node if its permutation is affine mod d,
+        or else a generic node
+
+        :param permutation: The permutation of the standard basis states
+        :type permutation: np.ndarray
+        :param phases: The phase each standard basis state gains
+        :type phases: np.ndarray
+        :param qudits: The qudits
+        :type qudits: tuple[int]
+        :param name: The name of the gate
+        :type name: str
+        :param gate: The gate, if any
+        :type gate: Instruction
+        :return: The nodes of the gate in the order they act on the state
+        :rtype: list[dict]
+        """
+        affine = self.affine_map(permutation, len(qudits))
+        if affine is None:
+            matrix = np.zeros((len(phases),) * 2, dtype=complex)
+            matrix[permutation, np.arange(len(phases))] = phases
+            return [{"type": "generic", "qudits": tuple(qudits),
+                     "name": name, "gate": gate, "source": gate,
+                     "matrix": matrix}]
+        trivial = Precision.allclose(phases, 1)
+        nodes = list()
+        if not trivial:
+            nodes.append(self.phase_node(phases, qudits, name, gate))
+        nodes.append({"type": "linear", "qudits": tuple(qudits), "name": name,
+                      "gate": gate if trivial else None, "source": gate,
+                      "matrix": affine[0], "shift": affine[1]})
+        return nodes
+
+    def matrix_nodes(self, matrix: np.ndarray, qudits: tuple[int],
+                     name: str = None, gate: Instruction = None):
+        """
+        Creates the nodes of a gate from its matrix
+
+        :param matrix: The gate's matrix
+        :type matrix: np.ndarray
+        :param qudits: The qudits
+        :type qudits: tuple[int]
+        :param name: The name of the gate
+        :type name: str
+        :param gate: The gate, if any
+        :type gate: Instruction
+        :return: The nodes of the gate in the order they act on the state
+        :rtype: list[dict]
+        """
+        matrix = np.where(Precision.isclose(matrix, 0), 0, matrix)
+        if DiagonalGate.isdiagonal(matrix):
+            return [self.phase_node(np.diagonal(matrix), qudits, name, gate)]
+        if MonomialGate.ismonomial(matrix):
+            permutation, phases = MonomialGate.matrix_monomial(matrix)
+            return self.monomial_nodes(permutation, phases, qudits, name, gate)
+        return [{"type": "generic", "qudits": tuple(qudits), "name": name,
+                 "gate": gate, "source": gate, "matrix": matrix}]
+
+    def affine_map(self, permutation: np.ndarray, num_qudits: int):
+        """
+        Finds the affine map :math:`x ↦ Ax + b` mod d of the qudits' values
+        which permutes their standard basis states like a permutation
+
+        :param permutation: The permutation of the standard basis states
+        :type permutation: np.ndarray
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :return: The matrix A and shift b, or None if the permutation is not
+            affine
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        shape = (self.dim,) * num_qudits
+        digits = np.array(np.unravel_index(np.arange(len(permutation)),
+                                           shape)).T
+        image = np.array(np.unravel_index(permutation, shape)).T
+        shift = image[0]
+        units = [np.ravel_multi_index(tuple(np.identity(
+            num_qudits, dtype=int)[j]), shape) for j in range(num_qudits)]
+        matrix = (image[units] - shift).T % self.dim
+        if not np.array_equal((digits @ matrix.T + shift) % self.dim, image):
+            return None
+        return matrix, shift
+
+    def node_matrix(self, node: dict):
+        """
+        Gets the matrix of a node on its qudits
+
+        :param node: A node
+        :type node: dict
+        :return: The node's matrix
+        :rtype: np.ndarray
+        """
+        if node["type"] == "phase":
+            return np.diag(np.ravel(node["table"]))
+        if node["type"] == "linear":
+            return MonomialGate(None, self.linear_permutation(node),
+                                num_qudits=len(node["qudits"]),
+                                dim=self.dim).matrix
+        return node["matrix"]
+
+    def linear_permutation(self, node: dict):
+        """
+        Gets the permutation of the standard basis states of a linear node
+
+        :param node: A linear node
+        :type node: dict
+        :return: The permutation
+        :rtype: np.ndarray
+        """
+        shape = (self.dim,) * len(node["qudits"])
+        digits = np.array(np.unravel_index(np.arange(np.prod(shape)), shape))
+        image = (node["matrix"] @ digits + node["shift"][:, None]) % self.dim
+        return np.ravel_multi_index(tuple(image), shape)
+
+    def wire_forms(self):
+        """
+        Gets the affine forms carried by the wires of each node just before it
+        acts, as the coefficients of the diagram's variables and a constant
+
+        :return: The forms and constants of each node's wires
+        :rtype: list[tuple[np.ndarray, np.ndarray]]
+        """
+        num_vars = self.num_qudits + sum(
+            len(node["qudits"]) for node in self.nodes
+            if node["type"] == "generic")
+        forms = np.zeros((self.num_qudits, num_vars), dtype=np.int64)
+        forms[:, :self.num_qudits] = np.identity(self.num_qudits, dtype=int)
+        shifts = np.zeros(self.num_qudits, dtype=np.int64)
+        fresh = self.num_qudits
+        node_forms = list()
+        for node in self.nodes:
+            qudits = list(node["qudits"])
+            node_forms.append((forms[qudits].copy(), shifts[qudits].copy()))
+            if node["type"] == "linear":
+                forms[qudits] = node["matrix"] @ forms[qudits] % self.dim
+                shifts[qudits] = (node["matrix"] @ shifts[qudits]
+                                  + node["shift"]) % self.dim
+            elif node["type"] == "generic":
+                forms[qudits] = 0
+                forms[qudits, range(fresh, fresh + len(qudits))] = 1
+                shifts[qudits] = 0
+                fresh += len(qudits)
+        return node_forms
+
+    def gadget(self, table: np.ndarray, forms: np.ndarray,
+               shifts: np.ndarray):
+        """
+        Rewrites the phases of a phase node as a function of its wires' forms
+        normalized to a leading coefficient of 1 and sorted, so that gadgets
+        on the same forms have the same key
+
+        :param table: The phases of the node's wires' values
+        :type table: np.ndarray
+        :param forms: The forms of the node's wires
+        :type forms: np.ndarray
+        :param shifts: The constants of the node's wires
+        :type shifts: np.ndarray
+        :return: The normalized forms and the phases of their values
+        :rtype: tuple[tuple[tuple[int]], np.ndarray]
+        """
+        keys, indices = list(), list()
+        values = np.arange(self.dim)
+        for form, shift in zip(forms, shifts):
+            leading = int(form[np.flatnonzero(form)[0]])
+            keys.append(tuple((form * pow(leading, -1, self.dim)
+                               % self.dim).tolist()))
+            indices.append((leading * values + shift) % self.dim)
+        order = sorted(range(len(keys)), key=lambda i: keys[i])
+        return tuple(keys[i] for i in order), \
+            np.transpose(table[np.ix_(*indices)], order)
+
+    def ungadget(self, gadget: np.ndarray, forms: np.ndarray,
+                 shifts: np.ndarray):
+        """
+        Rewrites the phases of normalized forms as the phases of the values of
+        a phase node's wires, i.e. the inverse of gadget
+
+        :param gadget: The phases of the normalized forms' values
+        :type gadget: np.ndarray
+        :param forms: The forms of the node's wires
+        :type forms: np.ndarray
+        :param shifts: The constants of the node's wires
+        :type shifts: np.ndarray
+        :return: The phases of the node's wires' values
+        :rtype: np.ndarray
+        """
+        keys, indices = list(), list()
+        values = np.arange(self.dim)
+        for form, shift in zip(forms, shifts):
+            leading = int(form[np.flatnonzero(form)[0]])
+            keys.append(tuple((form * pow(leading, -1, self.dim)
+                               % self.dim).tolist()))
+            indices.append(pow(leading, -1, self.dim) * (values - shift)
+                           % self.dim)
+        order = sorted(range(len(keys)), key=lambda i: keys[i])
+        return np.transpose(gadget, np.argsort(order))[np.ix_(*indices)]
+
+    def fuse_gadgets(self):
+        """
+        Fuses every phase gadget into the first phase gadget on the same
+        forms, and removes gadgets whose phases are all 1
+
+        :return: The number of phase gadgets removed
+        :rtype: int
+        """
+        fused = dict()
+        nodes = list()
+        for node, (forms, shifts) in zip(self.nodes, self.wire_forms()):
+            if node["type"] != "phase":
+                nodes.append(node)
+                continue
+            key, gadget = self.gadget(node["table"], forms, shifts)
+            if key not in fused:
+                fused[key] = [node, forms, shifts, gadget]
+                nodes.append(node)
+                continue
+            first = fused[key]
+            first[3] = first[3] * gadget
+            first[0]["name"] = "%s*%s" % (node["name"], first[0]["name"])
+            first[0]["gate"] = None
+        for node, forms, shifts, gadget in fused.values():
+            if node["gate"] is None:
+                node["table"] = self.ungadget(gadget, forms, shifts)
+        nodes = [node for node in nodes if node["type"] != "phase"
+                 or not Precision.allclose(node["table"], 1)]
+        removed = len(self.nodes) - len(nodes)
+        self.nodes = nodes
+        return removed
+
+    def eliminate_hadamards(self):
+        """
+        Eliminates a single-qudit generic node, e.g. H, together with the next
+        generic node on its qudit if the variable between them only meets
+        single-qudit nodes on that qudit and the product of all of them is
+        monomial (e.g. H·H, H·Z·H, and H·S·H·S·H), which is then rewritten as
+        phase and linear nodes
+
+        :return: If a pair of generic nodes was eliminated
+        :rtype: bool
+        """
+        for start, node in enumerate(self.nodes):
+            if node["type"] != "generic" or len(node["qudits"]) != 1:
+                continue
+            run = [start]
+            product = self.node_matrix(node)
+            for index in range(start + 1, len(self.nodes)):
+                other = self.nodes[index]
+                if node["qudits"][0] not in other["qudits"]:
+                    continue
+                if len(other["qudits"]) != 1:
+                    break
+                run.append(index)
+                product = np.dot(self.node_matrix(other), product)
+                if other["type"] != "generic":
+                    continue
+                product = np.where(Precision.isclose(product, 0), 0, product)
+                if MonomialGate.ismonomial(product):
+                    name = "*".join(str(self.nodes[i]["name"])
+                                    for i in reversed(run))
+                    nodes = self.matrix_nodes(product, node["qudits"], name)
+                    for i in reversed(run):
+                        del self.nodes[i]
+                    self.nodes[start:start] = nodes
+                    return True
+        return False
+
+    def simplify(self, max_iterations: int = 1000):
+        """
+        Simplifies the diagram by fusing phase gadgets and eliminating pairs
+        of Hadamard-like nodes until neither rewrite applies
+
+        :param max_iterations: The largest number of rounds of rewrites,
+            defaults to 1000
+        :type max_iterations: int
+        :return: The number of rounds of rewrites
+        :rtype: int
+        """
+        for iteration in range(max_iterations):
+            removed = self.fuse_gadgets()
+            if not self.eliminate_hadamards() and not removed:
+                return iteration
+        return max_iterations
+
+    def to_circuit(self, name: str = None):
+        """
+        Extracts a circuit from the diagram, with one gate per node except for
+        monomial gates whose phase gadget was not rewritten
+
+        :param name: The name of the circuit
+        :type name: str
+        :return: The circuit
+        :rtype: Circuit
+        """
+        gates = list()
+        skip = False
+        for index, node in enumerate(self.nodes):
+            if skip:
+                skip = False
+                continue
+            gate = node["gate"]
+            nxt = self.nodes[index + 1] if index + 1 < len(self.nodes) \
+                else None
+            if node["type"] == "phase" and gate is not None \
+                    and nxt is not None and nxt["type"] == "linear" \
+                    and nxt["source"] is node["source"]:
+                skip = True
+            elif gate is not None:
+                pass
+            elif node["type"] == "phase":
+                gate = DiagonalGate(node["name"], node["table"],
+                                    len(node["qudits"]), self.dim,
+                                    node["qudits"])
+            elif node["type"] == "linear":
+                gate = MonomialGate(node["name"],
+                                    self.linear_permutation(node), None,
+                                    len(node["qudits"]), self.dim,
+                                    node["qudits"])
+            else:
+                gate = Gate(node["name"], node["matrix"], len(node["qudits"]),
+                            self.dim, node["qudits"])
+            gates.append(gate)
+        return Circuit(name, list(reversed(gates)), self.num_qudits, self.dim)
+
+
+class PhaseGadgetOptimizer(object):
+    """Reduces the T-count, gate count, and depth of circuits of qudits of
+    prime dimension with a phase-gadget fusion and single-qudit run fusion
+    pass over their phase gadget diagrams, followed by a peephole pass over the
+    extracted circuit"""
+    def __init__(self, max_iterations: int = 1000, peephole: bool = True):
+        """
+        Creates a new phase gadget optimizer
+
+        :param max_iterations: The largest number of rounds of rewrites,
+            defaults to 1000
+        :type max_iterations: int
+        :param peephole: Whether to run the peephole optimizer on the
+            extracted circuit, defaults to True
+        :type peephole: bool
+        """
+        self.max_iterations = max_iterations
+        self.peephole = peephole
+
+    def optimize(self, circuit: Instruction):
+        """
+        Simplifies a circuit as a phase gadget diagram and extracts it back out
+
+        :param circuit: A circuit
+        :type circuit: Instruction
+        :return: The optimized circuit and a report of the gate count,
+            T-count, and depth before and after optimizing
+        :rtype: tuple[Circuit, dict[str, int]]
+        """
+        gates = circuit.flatten()
+        diagram = PhaseGadgetDiagram.from_circuit(circuit)
+        iterations = diagram.simplify(self.max_iterations)
+        optimized = diagram.to_circuit(circuit.name)
+        if self.peephole:
+            optimized = PeepholeOptimizer().optimize(optimized)[0]
+        optimized_gates = optimized.instructions
+        report = {
+            "gate_count_before": len(gates),
+            "gate_count_after": len(optimized_gates),
+            "t_count_before": PeepholeOptimizer.t_count(gates),
+            "t_count_after": PeepholeOptimizer.t_count(optimized_gates),
+            "depth_before": PeepholeOptimizer.depth(gates),
+            "depth_after": PeepholeOptimizer.depth(optimized_gates),
+            "iterations": iterations,
+        }
+        report["gates_removed"] = \
+            report["gate_count_before"] - report["gate_count_after"]
+        report["t_count_removed"] = \
+            report["t_count_before"] - report["t_count_after"]
+        return optimized, report
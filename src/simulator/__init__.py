@@ -0,0 +1,12 @@
+"""
+BitOQutritSim simulator package
+
+Enables simulating instructions on qudit states for the BitOQutritSim package.
+
+Author: Alex Lim
+
+"""
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
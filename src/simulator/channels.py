@@ -0,0 +1,290 @@
+"""
+Kraus Channels
+
+Quantum channels on qudits given by their Kraus operators, e.g. for noisy
+simulations with the density matrix simulator
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.PauliString import PauliString
+from src.simulator.kernels import StateVectorKernels
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class KrausChannel(object):
+    """A quantum channel :math:`ρ \\mapsto \\sum_k K_k ρ K_k^†` on one or
+    more qudits. The channel acts on a density matrix through its local
+    superoperator :math:`\\sum_k K_k ⊗ \\overline{K_k}`, which only involves
+    the channel's own qudits, and channels compose by multiplying their
+    superoperators, with the Kraus operators of the result recovered from its
+    Choi matrix so that a fused channel has at most D^2 of them for D states
+    of its qudits."""
+    __slots__ = ("_operators", "_dims", "_superoperator")
+
+    tolerance = 1e-10
+    """The tolerance of the completeness check and of the smallest kept
+    eigenvalue of the Choi matrix"""
+
+    def __init__(self, operators: Iterable[np.ndarray], dim: int = 3):
+        """
+        Creates a new Kraus channel
+
+        :param operators: The Kraus operators
+        :type operators: Iterable[np.ndarray]
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit, defaults to 3
+        :type dim: int or Iterable[int]
+        :raises ValueError: The Kraus operators have the wrong shape or do not
+            preserve the trace
+        """
+        operators = [np.asarray(Misc.to_dense(k), dtype=complex)
+                     for k in operators]
+        if not operators:
+            raise ValueError("a channel needs at least one Kraus operator")
+        size = operators[0].shape[0]
+        if isinstance(dim, (int, np.integer)):
+            dims = (int(dim),) * int(round(np.log(size) / np.log(dim))) \
+                if dim > 1 else ()
+        else:
+            dims = tuple(int(d) for d in dim)
+        if int(np.prod(dims, dtype=np.int64)) != size \
+                or any(k.shape != (size, size) for k in operators):
+            raise ValueError("Kraus operators must be square matrices on %s "
+                             "states" % int(np.prod(dims, dtype=np.int64)))
+        completeness = sum(k.conj().T @ k for k in operators)
+        if not np.allclose(completeness, np.identity(size),
+                           atol=KrausChannel.tolerance ** 0.5):
+            raise ValueError("Kraus operators do not preserve the trace")
+        for k in operators:
+            k.setflags(write=False)
+        self._operators = tuple(operators)
+        self._dims = dims
+        self._superoperator = None
+
+    @staticmethod
+    def unitary(matrix: np.ndarray, dim: int = 3):
+        """
+        Creates the channel of a unitary gate
+
+        :param matrix: The gate matrix
+        :type matrix: np.ndarray
+        :param dim: The dimension of the qudits, defaults to 3
+        :type dim: int or Iterable[int]
+        :return: The channel :math:`ρ \\mapsto UρU^†`
+        :rtype: KrausChannel
+        """
+        return KrausChannel([matrix], dim)
+
+    @staticmethod
+    def identity(dim: int = 3, num_qudits: int = 1):
+        """
+        Creates the identity channel
+
+        :param dim: The dimension of the qudits, defaults to 3
+        :type dim: int
+        :param num_qudits: The number of qudits, defaults to 1
+        :type num_qudits: int
+        :return: The identity channel
+        :rtype: KrausChannel
+        """
+        return KrausChannel([np.identity(dim ** num_qudits)], dim)
+
+    @staticmethod
+    def depolarizing(p: float, dim: int = 3, num_qudits: int = 1):
+        """
+        Creates the depolarizing channel
+        :math:`ρ \\mapsto (1-p)ρ + p\\frac{I}{D}` for D states, whose Kraus
+        operators are the D^2 Pauli strings :math:`X^aZ^b` weighted by
+        :math:`\\sqrt{p/D^2}`, except the identity, which is weighted by
+        :math:`\\sqrt{1-p+p/D^2}`
+
+        :param p: The depolarizing probability, in [0, D^2/(D^2-1)]
+        :type p: float
+        :param dim: The dimension of the qudits, defaults to 3
+        :type dim: int
+        :param num_qudits: The number of qudits, defaults to 1
+        :type num_qudits: int
+        :return: The depolarizing channel
+        :rtype: KrausChannel
+        """
+        size = dim ** num_qudits
+        weight = p / size ** 2
+        operators = [np.sqrt(1 - p + weight) * np.identity(size)]
+        exponents = np.indices((dim,) * 2 * num_qudits).reshape(
+            2 * num_qudits, -1).T[1:]
+        for exponent in exponents:
+            operators.append(np.sqrt(weight) * PauliString(
+                exponent[:num_qudits], exponent[num_qudits:]).matrix(dim))
+        return KrausChannel(operators, dim)
+
+    @staticmethod
+    def dephasing(p: float, dim: int = 3):
+        """
+        Creates the dephasing channel of a qudit
+        :math:`ρ \\mapsto (1-p)ρ + p\\sum_k |k⟩⟨k|ρ|k⟩⟨k|`, which scales the
+        off-diagonal entries of ρ by 1-p
+
+        :param p: The dephasing probability, in [0, 1]
+        :type p: float
+        :param dim: The dimension of the qudit, defaults to 3
+        :type dim: int
+        :return: The dephasing channel
+        :rtype: KrausChannel
+        """
+        operators = [np.sqrt(1 - p) * np.identity(dim)]
+        for k in range(dim):
+            projector = np.zeros((dim, dim))
+            projector[k, k] = np.sqrt(p)
+            operators.append(projector)
+        return KrausChannel(operators, dim)
+
+    @staticmethod
+    def amplitude_damping(gamma: float, dim: int = 3):
+        """
+        Creates the amplitude damping channel of a qudit, in which each
+        excited state :math:`|k⟩` decays to :math:`|k-1⟩` with probability
+        gamma, as for the cascaded relaxation of a transmon qutrit. The Kraus
+        operators are :math:`K_0 = |0⟩⟨0| + \\sqrt{1-γ}\\sum_{k>0} |k⟩⟨k|` and
+        :math:`K_k = \\sqrt{γ}|k-1⟩⟨k|`.
+
+        :param gamma: The decay probability, in [0, 1]
+        :type gamma: float
+        :param dim: The dimension of the qudit, defaults to 3
+        :type dim: int
+        :return: The amplitude damping channel
+        :rtype: KrausChannel
+        """
+        operators = [np.diag([1] + [np.sqrt(1 - gamma)] * (dim - 1))]
+        for k in range(1, dim):
+            decay = np.zeros((dim, dim))
+            decay[k - 1, k] = np.sqrt(gamma)
+            operators.append(decay)
+        return KrausChannel(operators, dim)
+
+    @staticmethod
+    def from_superoperator(superoperator: np.ndarray, dim: int = 3):
+        """
+        Creates a channel from its superoperator
+        :math:`\\sum_k K_k ⊗ \\overline{K_k}` by eigendecomposition of its
+        Choi matrix, giving the fewest Kraus operators
+
+        :param superoperator: The superoperator
+        :type superoperator: np.ndarray
+        :param dim: The dimension of the qudits, defaults to 3
+        :type dim: int or Iterable[int]
+        :return: The channel
+        :rtype: KrausChannel
+        """
+        size = int(round(np.sqrt(superoperator.shape[0])))
+        choi = superoperator.reshape(size, size, size, size)\
+            .transpose(0, 2, 1, 3).reshape(size ** 2, size ** 2)
+        values, vectors = np.linalg.eigh((choi + choi.conj().T) / 2)
+        keep = values > KrausChannel.tolerance
+        operators = [np.sqrt(value) * vector.reshape(size, size)
+                     for value, vector in zip(values[keep], vectors.T[keep])]
+        return KrausChannel(operators[::-1], dim)
+
+    @property
+    def operators(self):
+        """
+        Gets the Kraus operators
+
+        :return: The Kraus operators
+        :rtype: tuple[np.ndarray]
+        """
+        return self._operators
+
+    @property
+    def dims(self):
+        """
+        Gets the dimension of each qudit
+
+        :return: The dimension of each qudit
+        :rtype: tuple[int]
+        """
+        return self._dims
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return len(self._dims)
+
+    @property
+    def superoperator(self):
+        """
+        Gets the superoperator :math:`\\sum_k K_k ⊗ \\overline{K_k}`, which
+        acts on the ket axes followed by the bra axes of the channel's
+        qudits.\n
+        * Note: The superoperator is cached and must not be modified.
+
+        :return: The superoperator
+        :rtype: np.ndarray
+        """
+        if self._superoperator is None:
+            superoperator = sum(np.kron(k, k.conj()) for k in self._operators)
+            superoperator.setflags(write=False)
+            self._superoperator = superoperator
+        return self._superoperator
+
+    def compose(self, other: 'KrausChannel'):
+        """
+        Composes two channels on the same qudits in matrix product order, so
+        that the other channel acts first
+
+        :param other: Another channel
+        :type other: KrausChannel
+        :raises ValueError: The channels act on qudits of different dimensions
+        :return: The fused channel
+        :rtype: KrausChannel
+        """
+        if self._dims != other.dims:
+            raise ValueError("cannot compose channels on qudits of dimensions "
+                             "%s and %s" % (self._dims, other.dims))
+        return KrausChannel.from_superoperator(
+            self.superoperator @ other.superoperator, self._dims)
+
+    def apply(self, state: np.ndarray, axes: Iterable[int]):
+        """
+        Applies the channel to a density tensor of shape
+        (d_0, ..., d_{n-1}, d_0, ..., d_{n-1}) by contracting its
+        superoperator with only the channel's ket and bra axes
+
+        :param state: The density tensor
+        :type state: np.ndarray
+        :param axes: The qudits the channel acts on
+        :type axes: Iterable[int]
+        :return: The updated density tensor
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        num_qudits = state.ndim // 2
+        return StateVectorKernels.apply_matrix(
+            state, self.superoperator,
+            axes + tuple(num_qudits + axis for axis in axes))
+
+    def __matmul__(self, other: 'KrausChannel'):
+        return self.compose(other)
+
+    def __len__(self):
+        return len(self._operators)
+
+    def __repr__(self):
+        return "KrausChannel(%s Kraus operators on qudits of dimensions %s)" \
+               % (len(self._operators), self._dims)
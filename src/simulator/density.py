@@ -0,0 +1,295 @@
+"""
+Density Matrix Simulator
+
+Simulates noisy instructions on mixed qudit states stored as density tensors
+of shape (d_0, ..., d_{n-1}, d_0, ..., d_{n-1})
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from src.Precision import Precision
+from src.QuditRegister import QuditRegister
+from src.Workspace import Workspace
+from src.instruction import Instruction
+from src.instruction.compiled import CompiledCircuit
+from src.simulator.channels import KrausChannel
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class DensityMatrixSimulator(object):
+    """Simulates instructions on mixed qudit states. The first n axes of a
+    density tensor index the ket and the last n axes index the bra, so gates
+    and channels only contract their own qudits' axes on both sides. Noise
+    channels are queued on the qudits they act on and consecutive channels
+    on the same qudits are fused into one before they are applied. As in
+    the StateVectorSimulator, the intermediate density tensors are written
+    into the simulator's workspace."""
+    def __init__(self, num_qudits: int, dim: int = 3,
+                 noise: KrausChannel = None, fuse_max_qudits: int = 0,
+                 dtype: np.dtype = None):
+        """
+        Creates a new density matrix simulator
+
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit for qudits of mixed dimensions,
+            defaults to 3
+        :type dim: int or Iterable[int]
+        :param noise: The single-qudit channel applied after every gate to
+            each of its qudits of the channel's dimension, defaults to None
+            (noiseless)
+        :type noise: KrausChannel
+        :param fuse_max_qudits: The largest number of qudits of a subcircuit
+            that is applied as a single fused gate, defaults to 0 (never fuse)
+        :type fuse_max_qudits: int
+        :param dtype: The dtype of the density tensors, complex64 or
+            complex128, defaults to Precision.dtype
+        :type dtype: np.dtype
+        :raises ValueError: The noise channel is not a single-qudit channel
+            on qudits of one of the dimensions of the qudits
+        """
+        self.num_qudits = num_qudits
+        self.dim = Instruction.normalize_dim(dim)
+        self.register = QuditRegister(
+            Instruction.qudit_dims(self.dim, num_qudits))
+        dims = tuple(sorted(set(self.register.dims)))
+        if noise is not None \
+                and (len(noise.dims) != 1 or noise.dims[0] not in dims):
+            raise ValueError("the noise channel acts on qudits of dimensions "
+                             "%s, but it must act on a single qudit of one "
+                             "of the dimensions %s" % (noise.dims, dims))
+        self.noise = noise
+        self.fuse_max_qudits = fuse_max_qudits
+        self.dtype = Precision.state_dtype(dtype)
+        self.workspace = Workspace()
+
+    @property
+    def shape(self):
+        """
+        Gets the shape of the density tensor
+
+        :return: The shape of the density tensor
+        :rtype: tuple[int]
+        """
+        return self.register.shape * 2
+
+    def initial_state(self):
+        """
+        Gets the density tensor of |0...0⟩⟨0...0|
+
+        :return: The density tensor of |0...0⟩⟨0...0|
+        :rtype: np.ndarray
+        """
+        state = np.zeros(self.shape, dtype=self.dtype)
+        state[(0,) * 2 * self.num_qudits] = 1
+        return state
+
+    def to_tensor(self, state: np.ndarray):
+        """
+        Copies a ket, density matrix, or density tensor into a density tensor
+        of the simulator's dtype
+
+        :param state: A ket, density matrix, or density tensor
+        :type state: np.ndarray
+        :return: The density tensor
+        :rtype: np.ndarray
+        """
+        state = np.asarray(state)
+        if state.size == self.register.size:
+            ket = state.reshape(-1)
+            state = np.outer(ket, ket.conj())
+        tensor = Precision.cast(state, self.dtype)
+        if tensor is state:
+            tensor = tensor.copy()
+        return tensor.reshape(self.shape)
+
+    def to_matrix(self, state: np.ndarray):
+        """
+        Converts a density tensor into a density matrix
+
+        :param state: A density tensor
+        :type state: np.ndarray
+        :return: The density matrix
+        :rtype: np.ndarray
+        """
+        return state.reshape(self.register.size, self.register.size)
+
+    def gate_noise(self, gate: Instruction, axes: tuple[int]):
+        """
+        Gets the noise channels which follow a gate, i.e. the noise channel
+        on each of the gate's qudits of the channel's dimension. Override to
+        model noise which depends on the gate.
+
+        :param gate: The gate
+        :type gate: Instruction
+        :param axes: The qudits the gate acts on
+        :type axes: tuple[int]
+        :return: The channels and the qudits they act on
+        :rtype: Iterable[tuple[KrausChannel, tuple[int]]]
+        """
+        if self.noise is None:
+            return ()
+        return ((self.noise, (axis,)) for axis in axes
+                if self.register.dims[axis] == self.noise.dims[0])
+
+    def apply_gate(self, state: np.ndarray, gate: Instruction,
+                   axes: tuple[int]):
+        """
+        Applies a gate :math:`ρ \\mapsto UρU^†` to a density tensor, as U on
+        its ket axes and :math:`\\overline{U}` on its bra axes
+
+        :param state: The density tensor
+        :type state: np.ndarray
+        :param gate: The gate
+        :type gate: Instruction
+        :param axes: The qudits the gate acts on
+        :type axes: tuple[int]
+        :return: The updated density tensor
+        :rtype: np.ndarray
+        """
+        state = gate.apply(state, axes, inplace=True)
+        state = gate.apply(np.conj(state, out=state), tuple(
+            self.num_qudits + axis for axis in axes), inplace=True)
+        return np.conj(state, out=state)
+
+    def apply_channel(self, state: np.ndarray, channel: KrausChannel,
+                      axes: Iterable[int]):
+        """
+        Applies a channel to a density tensor
+
+        :param state: The density tensor
+        :type state: np.ndarray
+        :param channel: The channel
+        :type channel: KrausChannel
+        :param axes: The qudits the channel acts on
+        :type axes: Iterable[int]
+        :return: The updated density tensor
+        :rtype: np.ndarray
+        """
+        return channel.apply(state, axes)
+
+    def evolve(self, instruction: Instruction, state: np.ndarray = None):
+        """
+        Applies an instruction and its noise to a density tensor
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param state: The ket, density matrix, or density tensor, defaults to
+            |0...0⟩⟨0...0|
+        :type state: np.ndarray
+        :return: The final density tensor
+        :rtype: np.ndarray
+        """
+        if state is None:
+            state = self.initial_state()
+        else:
+            state = self.to_tensor(state)
+        initial = state
+        pending = dict()
+        self.workspace.reserve(self.shape, self.dtype)
+        with self.workspace:
+            for gate, axes in reversed(CompiledCircuit(
+                    instruction, self.fuse_max_qudits, self.num_qudits,
+                    self.dtype)):
+                for queued in [key for key in pending
+                               if set(key) & set(axes)]:
+                    state = self.apply_channel(state, pending.pop(queued),
+                                               queued)
+                state = self.apply_gate(state, gate, axes)
+                for channel, targets in self.gate_noise(gate, axes):
+                    state = self.queue_channel(state, pending, channel,
+                                               targets)
+            for axes, channel in pending.items():
+                state = self.apply_channel(state, channel, axes)
+        return self.workspace.detach(state, initial)
+
+    def queue_channel(self, state: np.ndarray,
+                      pending: dict[tuple[int], KrausChannel],
+                      channel: KrausChannel, axes: Iterable[int]):
+        """
+        Queues a channel, fusing it with the channel already queued on the
+        same qudits and applying any queued channel on overlapping qudits
+
+        :param state: The density tensor
+        :type state: np.ndarray
+        :param pending: The queued channels by the qudits they act on
+        :type pending: dict[tuple[int], KrausChannel]
+        :param channel: The channel
+        :type channel: KrausChannel
+        :param axes: The qudits the channel acts on
+        :type axes: Iterable[int]
+        :return: The updated density tensor
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        if axes in pending:
+            pending[axes] = channel.compose(pending[axes])
+            return state
+        for queued in [key for key in pending if set(key) & set(axes)]:
+            state = self.apply_channel(state, pending.pop(queued), queued)
+        pending[axes] = channel
+        return state
+
+    def run(self, instruction: Instruction, state: np.ndarray = None):
+        """
+        Applies an instruction and its noise to a density matrix
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param state: The ket, density matrix, or density tensor, defaults to
+            |0...0⟩⟨0...0|
+        :type state: np.ndarray
+        :return: The final density matrix
+        :rtype: np.ndarray
+        """
+        return self.to_matrix(self.evolve(instruction, state))
+
+    def probabilities(self, state: np.ndarray):
+        """
+        Gets the probabilities of the measurement outcomes of all qudits of a
+        density tensor
+
+        :param state: The density tensor
+        :type state: np.ndarray
+        :return: The probabilities as a tensor with one axis per qudit
+        :rtype: np.ndarray
+        """
+        return np.diagonal(self.to_matrix(state)).real.reshape(
+            self.register.shape)
+
+    def purity(self, state: np.ndarray):
+        """
+        Gets the purity :math:`Tr(ρ^2)` of a density tensor
+
+        :param state: The density tensor
+        :type state: np.ndarray
+        :return: The purity
+        :rtype: float
+        """
+        return float(np.vdot(state, state).real)
+
+    def fidelity(self, state: np.ndarray, ket: np.ndarray):
+        """
+        Gets the fidelity :math:`⟨ψ|ρ|ψ⟩` of a density tensor with a pure
+        state
+
+        :param state: The density tensor
+        :type state: np.ndarray
+        :param ket: The pure state as a ket or state tensor
+        :type ket: np.ndarray
+        :return: The fidelity
+        :rtype: float
+        """
+        ket = np.asarray(ket).reshape(-1)
+        return float(np.vdot(ket, self.to_matrix(state) @ ket).real)
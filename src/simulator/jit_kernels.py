@@ -0,0 +1,217 @@
+"""
+JIT Kernels
+
+Numba-compiled kernels which apply small gates to flat state vectors in
+place, used by StateVectorKernels when Numba is installed
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba is an optional dependency
+    numba = None
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+jit = numba.njit(nogil=True, cache=True, fastmath=True) if numba is not None \
+    else (lambda function: function)
+
+
+class JitKernels(object):
+    """Applies gates of at most max_states states to C-contiguous complex
+    state tensors in place. The amplitudes a gate mixes are found by adding
+    the offset of each of the gate's basis states to a base index, which
+    ranges over the indices with zero dits on the gate's axes. The bases are
+    enumerated up to the trailing axes after the last target, which are
+    looped over contiguously in tiles, so no reshapes, transposes, or
+    temporary states are needed."""
+    available = numba is not None
+    """Whether Numba is installed"""
+    enabled = available
+    """Whether StateVectorKernels uses the JIT kernels"""
+    max_states = 64
+    """The largest number of states of a gate applied by the JIT kernels"""
+    max_dense_states = 5
+    """The largest number of states of a dense gate applied by the JIT
+    kernels, above which the matrix products of NumPy are faster"""
+    tile = 256
+    """The largest number of contiguous amplitudes of each basis state of a
+    gate that the dense and monomial kernels buffer at once"""
+
+    @staticmethod
+    def supports(state: np.ndarray, size: int, dense: bool = False):
+        """
+        Checks if the JIT kernels can apply a gate to a state tensor in place
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param size: The number of states of the gate
+        :type size: int
+        :param dense: Whether the gate is dense, defaults to False
+        :type dense: bool
+        :return: If the JIT kernels are enabled, the gate is small enough,
+            and the state is a writeable C-contiguous complex64 or complex128
+            array
+        :rtype: bool
+        """
+        limit = JitKernels.max_dense_states if dense \
+            else JitKernels.max_states
+        return JitKernels.enabled and size <= limit \
+            and isinstance(state, np.ndarray) \
+            and state.dtype in (np.complex64, np.complex128) \
+            and state.flags.c_contiguous and state.flags.writeable
+
+    @staticmethod
+    def indices(shape: tuple[int], axes: Iterable[int],
+                fixed: dict[int, int] = None):
+        """
+        Gets the offsets of the basis states of a gate and the base indices
+        of the flat state vector it acts on
+
+        :param shape: The shape of the state tensor
+        :type shape: tuple[int]
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param fixed: The dits of axes held fixed, e.g. control values,
+            defaults to None
+        :type fixed: dict[int, int]
+        :return: The offset of each basis state of the gate, the bases, and
+            the number of contiguous indices after each base
+        :rtype: tuple[np.ndarray, np.ndarray, int]
+        """
+        axes = tuple(axes)
+        fixed = dict() if fixed is None else fixed
+        strides = np.ones(len(shape), dtype=np.int64)
+        if len(shape) > 1:
+            strides[:-1] = np.cumprod(shape[:0:-1])[::-1]
+        offsets = np.zeros(1, dtype=np.int64)
+        for axis in axes:
+            offsets = (offsets[:, np.newaxis]
+                       + np.arange(shape[axis]) * strides[axis]).reshape(-1)
+        last = max(list(axes) + list(fixed))
+        bases = np.zeros(1, dtype=np.int64)
+        for axis in range(last):
+            if axis in fixed:
+                bases = bases + fixed[axis] * strides[axis]
+            elif axis not in axes:
+                bases = (bases[:, np.newaxis]
+                         + np.arange(shape[axis]) * strides[axis]).reshape(-1)
+        if last in fixed:
+            bases = bases + fixed[last] * strides[last]
+        return offsets, bases, int(strides[last])
+
+    @staticmethod
+    @jit
+    def dense(state: np.ndarray, matrix: np.ndarray, tile: int,
+              offsets: np.ndarray, bases: np.ndarray, inner: int):
+        """
+        Applies a dense gate matrix to a flat state vector in place
+
+        :param state: The flat state vector
+        :type state: np.ndarray
+        :param matrix: The gate matrix
+        :type matrix: np.ndarray
+        :param tile: The largest number of contiguous amplitudes buffered
+        :type tile: int
+        :param offsets: The offset of each basis state of the gate
+        :type offsets: np.ndarray
+        :param bases: The base indices
+        :type bases: np.ndarray
+        :param inner: The number of contiguous indices after each base
+        :type inner: int
+        """
+        size = offsets.shape[0]
+        tile = min(inner, tile)
+        buffer = np.empty((size, tile), dtype=state.dtype)
+        row = np.empty(tile, dtype=state.dtype)
+        for base in bases:
+            for start in range(base, base + inner, tile):
+                width = min(tile, base + inner - start)
+                for k in range(size):
+                    offset = start + offsets[k]
+                    for i in range(width):
+                        buffer[k, i] = state[offset + i]
+                for j in range(size):
+                    row[:width] = 0
+                    for k in range(size):
+                        element = matrix[j, k]
+                        for i in range(width):
+                            row[i] += element * buffer[k, i]
+                    offset = start + offsets[j]
+                    for i in range(width):
+                        state[offset + i] = row[i]
+
+    @staticmethod
+    @jit
+    def diagonal(state: np.ndarray, diagonal: np.ndarray,
+                 offsets: np.ndarray, bases: np.ndarray, inner: int):
+        """
+        Applies a diagonal gate to a flat state vector in place
+
+        :param state: The flat state vector
+        :type state: np.ndarray
+        :param diagonal: The diagonal of the gate
+        :type diagonal: np.ndarray
+        :param offsets: The offset of each basis state of the gate
+        :type offsets: np.ndarray
+        :param bases: The base indices
+        :type bases: np.ndarray
+        :param inner: The number of contiguous indices after each base
+        :type inner: int
+        """
+        for base in bases:
+            for k in range(offsets.shape[0]):
+                start = base + offsets[k]
+                phase = diagonal[k]
+                for i in range(start, start + inner):
+                    state[i] *= phase
+
+    @staticmethod
+    @jit
+    def monomial(state: np.ndarray, permutation: np.ndarray,
+                 phases: np.ndarray, tile: int, offsets: np.ndarray,
+                 bases: np.ndarray, inner: int):
+        """
+        Applies a monomial gate, which maps |j⟩ to phases[j]|permutation[j]⟩,
+        to a flat state vector in place
+
+        :param state: The flat state vector
+        :type state: np.ndarray
+        :param permutation: The permutation of the standard basis states
+        :type permutation: np.ndarray
+        :param phases: The phase of each standard basis state
+        :type phases: np.ndarray
+        :param tile: The largest number of contiguous amplitudes buffered
+        :type tile: int
+        :param offsets: The offset of each basis state of the gate
+        :type offsets: np.ndarray
+        :param bases: The base indices
+        :type bases: np.ndarray
+        :param inner: The number of contiguous indices after each base
+        :type inner: int
+        """
+        size = offsets.shape[0]
+        tile = min(inner, tile)
+        buffer = np.empty((size, tile), dtype=state.dtype)
+        for base in bases:
+            for start in range(base, base + inner, tile):
+                width = min(tile, base + inner - start)
+                for k in range(size):
+                    offset = start + offsets[k]
+                    for i in range(width):
+                        buffer[k, i] = state[offset + i]
+                for k in range(size):
+                    offset = start + offsets[permutation[k]]
+                    phase = phases[k]
+                    for i in range(width):
+                        state[offset + i] = phase * buffer[k, i]
@@ -0,0 +1,871 @@
+"""
+State Vector Kernels
+
+Applies gates to the target axes of state tensors of shape (d_0, ..., d_{n-1})
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import product
+from typing import Callable, Iterable
+
+import numpy as np
+
+from src.MiscFunctions import MiscFunctions as Misc
+from src.Precision import Precision
+from src.QuantumCircuitMatrix import QuantumCircuitMatrix as QCM
+from src.Workspace import Workspace
+from src.simulator.jit_kernels import JitKernels
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class StateVectorKernels(object):
+    """Applies gates to the target axes of state tensors"""
+    fft_min_dim = 16
+    """The smallest qudit dimension for which Hadamard gates are applied by
+    FFT, as smaller transforms are faster as dense matrix products"""
+    fourier_block_states = 81
+    """The largest number of states of adjacent axes whose Hadamard gates
+    are combined into one dense matrix product"""
+    threads = 1
+    """The number of threads which apply a gate to chunks of a state at
+    once, see configure"""
+    chunk_states = 3 ** 9
+    """The smallest number of amplitudes of a chunk of a state"""
+    executor = None
+    """The thread pool of the chunks, created when first used"""
+    expand_states = 81
+    """The largest number of states of a gate's axes and the axes after
+    them for which a gate matrix is expanded by the identity of the axes
+    after them, so that it is applied as one matrix product with many rows
+    rather than many small products"""
+
+    @classmethod
+    def configure(cls, threads: int = None, chunk_states: int = None):
+        """
+        Sets the number of threads and the chunk size of the kernels. Gates
+        on states of at least two chunks are applied to the chunks in
+        parallel, as NumPy releases the GIL while it processes each chunk.
+
+        :param threads: The number of threads, e.g. os.cpu_count(), defaults
+            to the current number
+        :type threads: int
+        :param chunk_states: The smallest number of amplitudes of a chunk,
+            defaults to the current number
+        :type chunk_states: int
+        """
+        if threads is not None and threads != cls.threads:
+            if cls.executor is not None:
+                cls.executor.shutdown()
+                cls.executor = None
+            cls.threads = threads
+        if chunk_states is not None:
+            cls.chunk_states = chunk_states
+
+    @classmethod
+    def thread_pool(cls):
+        """
+        Gets the thread pool of the chunks
+
+        :return: The thread pool
+        :rtype: ThreadPoolExecutor
+        """
+        if cls.executor is None:
+            cls.executor = ThreadPoolExecutor(
+                cls.threads, thread_name_prefix="StateVectorKernels")
+        return cls.executor
+
+    @staticmethod
+    def chunks(shape: tuple[int], axes: Iterable[int]):
+        """
+        Splits a state tensor into chunks along the leading axes a gate does
+        not act on, so that each chunk holds the whole of the gate's axes.
+        Axes are added until there are enough chunks for the threads or the
+        chunks would be smaller than chunk_states.
+
+        :param shape: The shape of the state tensor
+        :type shape: tuple[int]
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :return: The index of each chunk, which keeps every axis, or None if
+            the state is not split
+        :rtype: list[tuple[slice]] or None
+        """
+        threads = StateVectorKernels.threads
+        size = int(np.prod(shape, dtype=np.int64))
+        if threads <= 1 or size < 2 * StateVectorKernels.chunk_states:
+            return None
+        axes = set(axes)
+        split = list()
+        count = 1
+        for axis, dim in enumerate(shape):
+            if axis in axes:
+                continue
+            if count >= threads or \
+                    size // (count * dim) < StateVectorKernels.chunk_states:
+                break
+            split.append(axis)
+            count *= dim
+        if count < 2:
+            return None
+        chunks = list()
+        for indices in product(*[range(shape[axis]) for axis in split]):
+            index = [slice(None)] * len(shape)
+            for axis, i in zip(split, indices):
+                index[axis] = slice(i, i + 1)
+            chunks.append(tuple(index))
+        return chunks
+
+    @staticmethod
+    def apply_chunk(kernel: Callable, state: np.ndarray, out: np.ndarray,
+                    index: tuple[slice], *args: object):
+        """
+        Applies a chunk kernel to one chunk of a state tensor, which writes
+        the result straight into the same chunk of the output
+
+        :param kernel: The chunk kernel, called as kernel(chunk, output
+            chunk, *args)
+        :type kernel: Callable
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param out: The output state tensor
+        :type out: np.ndarray
+        :param index: The index of the chunk
+        :type index: tuple[slice]
+        :param args: The other arguments of the kernel
+        :type args: object
+        """
+        kernel(state[index], out[index], *args)
+
+    @staticmethod
+    def map_chunks(kernel: Callable, state: np.ndarray, out: np.ndarray,
+                   chunks: Iterable[tuple[slice]], *args: object):
+        """
+        Applies a chunk kernel to every chunk of a state tensor with the
+        thread pool
+
+        :param kernel: The chunk kernel, called as kernel(chunk, output
+            chunk, *args)
+        :type kernel: Callable
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param out: The output state tensor, which must not overlap the
+            state tensor
+        :type out: np.ndarray
+        :param chunks: The index of each chunk
+        :type chunks: Iterable[tuple[slice]]
+        :param args: The other arguments of the kernel
+        :type args: object
+        :return: The output state tensor
+        :rtype: np.ndarray
+        """
+        pool = StateVectorKernels.thread_pool()
+        futures = [pool.submit(StateVectorKernels.apply_chunk, kernel, state,
+                               out, index, *args) for index in chunks]
+        for future in futures:
+            future.result()
+        return out
+
+    @staticmethod
+    def map_moved_chunks(kernel: Callable, state: np.ndarray,
+                         out: np.ndarray, axes: Iterable[int],
+                         workspace: Workspace, *args: object):
+        """
+        Applies a chunk kernel to a gate's axes of a state tensor which are
+        not adjacent and ascending, as in apply_buffered: the state is copied
+        into the output with the axes moved to the front, its chunks are
+        written into the workspace's scratch slot (or a new array if no
+        workspace is active) with the thread pool, and the result is moved
+        back into the output
+
+        :param kernel: The chunk kernel, called as kernel(chunk, output
+            chunk, *args, axes)
+        :type kernel: Callable
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param out: The C-contiguous output state tensor, which must not
+            overlap the state tensor
+        :type out: np.ndarray
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param workspace: The active workspace, which the worker threads do
+            not see, or None
+        :type workspace: Workspace
+        :param args: The gate arguments of the kernel
+        :type args: object
+        :return: The output state tensor
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        targets = tuple(range(len(axes)))
+        moved = np.moveaxis(state, axes, targets)
+        front = out.reshape(moved.shape)
+        np.copyto(front, moved)
+        scratch = np.empty(moved.shape, out.dtype) if workspace is None \
+            else workspace.buffer("scratch", moved.shape, out.dtype)
+        chunks = StateVectorKernels.chunks(moved.shape, targets)
+        if chunks is None:
+            kernel(front, scratch, *args, targets)
+        else:
+            StateVectorKernels.map_chunks(kernel, front, scratch, chunks,
+                                          *args, targets)
+        np.copyto(out, np.moveaxis(scratch, targets, axes))
+        return out
+
+    @staticmethod
+    def empty(state: np.ndarray, operand: np.ndarray,
+              workspace: Workspace = None):
+        """
+        Gets an uninitialized output state tensor for a gate, from the state
+        slots of a workspace if one is given
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param operand: The gate's matrix, diagonal, or phases
+        :type operand: np.ndarray
+        :param workspace: The active workspace, defaults to None
+        :type workspace: Workspace
+        :return: The output state tensor
+        :rtype: np.ndarray
+        """
+        dtype = np.result_type(state, operand.dtype)
+        if workspace is None:
+            return np.empty(state.shape, dtype)
+        return workspace.output(state.shape, dtype, state)
+
+    @staticmethod
+    def apply_jit(kernel: Callable, state: np.ndarray, axes: Iterable[int],
+                  *args: object, fixed: dict[int, int] = None):
+        """
+        Applies a JIT kernel to the given axes of a state tensor in place,
+        splitting its base indices across the threads if the state is large
+        enough, as the JIT kernels release the GIL
+
+        :param kernel: The JIT kernel, called as kernel(flat state, *args,
+            offsets, bases, inner)
+        :type kernel: Callable
+        :param state: The C-contiguous complex state tensor
+        :type state: np.ndarray
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param args: The gate arguments of the kernel
+        :type args: object
+        :param fixed: The dits of axes held fixed, e.g. control values,
+            defaults to None
+        :type fixed: dict[int, int]
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        offsets, bases, inner = JitKernels.indices(state.shape, axes, fixed)
+        flat = state.reshape(-1)
+        threads = StateVectorKernels.threads
+        if threads <= 1 or len(bases) < threads \
+                or state.size < 2 * StateVectorKernels.chunk_states:
+            kernel(flat, *args, offsets, bases, inner)
+            return state
+        pool = StateVectorKernels.thread_pool()
+        futures = [pool.submit(kernel, flat, *args, offsets, part, inner)
+                   for part in np.array_split(bases, threads)]
+        for future in futures:
+            future.result()
+        return state
+
+    @staticmethod
+    def block_shape(shape: tuple[int], axes: Iterable[int]):
+        """
+        Gets the shape (A, S, B) of a view of a state tensor which groups its
+        axes before, on, and after the axes of a gate
+
+        :param shape: The shape of the state tensor
+        :type shape: tuple[int]
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :return: The shape of the view, or None if the axes are not adjacent
+            and ascending
+        :rtype: tuple[int, int, int]
+        """
+        axes = tuple(axes)
+        if axes != tuple(range(axes[0], axes[0] + len(axes))):
+            return None
+        return (int(np.prod(shape[:axes[0]], dtype=np.int64)),
+                int(np.prod(shape[axes[0]:axes[-1] + 1], dtype=np.int64)),
+                int(np.prod(shape[axes[-1] + 1:], dtype=np.int64)))
+
+    @staticmethod
+    def block_view(array: np.ndarray, axes: Iterable[int]):
+        """
+        Gets a view of shape (A, S, B) of an array which groups its axes
+        before, on, and after the given axes, without copying it
+
+        :param array: The array, e.g. a chunk of a state tensor
+        :type array: np.ndarray
+        :param axes: The axes of the array a gate acts on
+        :type axes: Iterable[int]
+        :return: The view, or None if the axes are not adjacent and ascending
+            or the strides of the array do not allow grouping them
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        block = StateVectorKernels.block_shape(array.shape, axes)
+        if block is None:
+            return None
+        strides = list()
+        for group in (range(axes[0]), axes, range(axes[-1] + 1, array.ndim)):
+            group = [axis for axis in group if array.shape[axis] != 1]
+            for axis, next_axis in zip(group, group[1:]):
+                if array.strides[axis] != \
+                        array.shape[next_axis] * array.strides[next_axis]:
+                    return None
+            strides.append(array.strides[group[-1]] if group
+                           else array.itemsize)
+        return np.lib.stride_tricks.as_strided(array, block, strides)
+
+    @staticmethod
+    def multiply_block(source: np.ndarray, out: np.ndarray,
+                       matrix: np.ndarray):
+        """
+        Multiplies the middle axis of a view of shape (A, S, B) by a gate
+        matrix into an output view of the same shape
+
+        :param source: The view of the state tensor
+        :type source: np.ndarray
+        :param out: The view of the output state tensor
+        :type out: np.ndarray
+        :param matrix: The dense gate matrix of S rows
+        :type matrix: np.ndarray
+        """
+        a, s, b = source.shape
+        if b == 1:
+            np.matmul(source[:, :, 0], matrix.T, out=out[:, :, 0])
+            return
+        if s * b <= StateVectorKernels.expand_states:
+            rows = StateVectorKernels.block_view(source, (1, 2))
+            out_rows = StateVectorKernels.block_view(out, (1, 2))
+            if rows is not None and out_rows is not None:
+                expanded = np.kron(matrix, np.identity(b, dtype=matrix.dtype))
+                np.matmul(rows[:, :, 0], expanded.T, out=out_rows[:, :, 0])
+                return
+        np.matmul(matrix, source, out=out)
+
+    @staticmethod
+    def permute_block(source: np.ndarray, out: np.ndarray,
+                      permutation: np.ndarray, phases: np.ndarray):
+        """
+        Maps index j of the middle axis of a view of shape (A, S, B) to index
+        permutation[j] with phase phases[j] in an output view of the same
+        shape
+
+        :param source: The view of the state tensor
+        :type source: np.ndarray
+        :param out: The view of the output state tensor
+        :type out: np.ndarray
+        :param permutation: The permutation of the S standard basis states
+        :type permutation: np.ndarray
+        :param phases: The phase of each standard basis state
+        :type phases: np.ndarray
+        """
+        for j, (target, phase) in enumerate(zip(permutation, phases)):
+            np.multiply(source[:, j], phase, out=out[:, target])
+
+    @staticmethod
+    def multiply_chunk(source: np.ndarray, out: np.ndarray,
+                       matrix: np.ndarray, axes: tuple[int]):
+        """
+        Multiplies the given axes of a chunk of a state tensor by a gate
+        matrix into the same chunk of the output. Gates on adjacent ascending
+        axes, e.g. as moved by map_moved_chunks, multiply views of shape
+        (A, S, B) of the chunks, and other gates are contracted by einsum, so
+        no chunk is copied.
+
+        :param source: The chunk of the state tensor
+        :type source: np.ndarray
+        :param out: The chunk of the output state tensor
+        :type out: np.ndarray
+        :param matrix: The gate matrix
+        :type matrix: np.ndarray or sp.spmatrix
+        :param axes: The axes of the chunk the gate acts on
+        :type axes: tuple[int]
+        """
+        if Misc.is_sparse(matrix):
+            np.copyto(out, StateVectorKernels.apply_matrix(
+                source, matrix, axes, parallel=False))
+            return
+        source_block = StateVectorKernels.block_view(source, axes)
+        out_block = StateVectorKernels.block_view(out, axes)
+        if source_block is not None and out_block is not None:
+            StateVectorKernels.multiply_block(source_block, out_block, matrix)
+            return
+        dims = tuple(source.shape[axis] for axis in axes)
+        outputs = list(range(source.ndim, source.ndim + len(axes)))
+        subscripts = list(range(source.ndim))
+        for axis, output in zip(axes, outputs):
+            subscripts[axis] = output
+        np.einsum(matrix.reshape(dims + dims), outputs + list(axes), source,
+                  list(range(source.ndim)), subscripts, out=out)
+
+    @staticmethod
+    def permute_chunk(source: np.ndarray, out: np.ndarray,
+                      permutation: np.ndarray, phases: np.ndarray,
+                      axes: tuple[int]):
+        """
+        Maps standard basis state j of the given axes of a chunk of a state
+        tensor to state permutation[j] with phase phases[j] in the same chunk
+        of the output, one view of the chunk per state
+
+        :param source: The chunk of the state tensor
+        :type source: np.ndarray
+        :param out: The chunk of the output state tensor
+        :type out: np.ndarray
+        :param permutation: The permutation of the standard basis states
+        :type permutation: np.ndarray
+        :param phases: The phase of each standard basis state
+        :type phases: np.ndarray
+        :param axes: The axes of the chunk the gate acts on
+        :type axes: tuple[int]
+        """
+        dims = tuple(source.shape[axis] for axis in axes)
+        for j, (target, phase) in enumerate(zip(permutation, phases)):
+            source_index = [slice(None)] * source.ndim
+            out_index = [slice(None)] * source.ndim
+            for axis, dit, target_dit in zip(
+                    axes, np.unravel_index(j, dims),
+                    np.unravel_index(target, dims)):
+                source_index[axis] = dit
+                out_index[axis] = target_dit
+            np.multiply(source[tuple(source_index)], phase,
+                        out=out[tuple(out_index)])
+
+    @staticmethod
+    def apply_buffered(kernel: Callable, state: np.ndarray,
+                       axes: Iterable[int], dtype: np.dtype,
+                       workspace: Workspace, *args: object):
+        """
+        Applies a block kernel to the given axes of a state tensor, writing
+        the result into the workspace rather than a new array. Gates on
+        adjacent ascending axes of a C-contiguous state act on a view of it,
+        and other gates act on a copy with their axes moved to the front in
+        the workspace's scratch slot.
+
+        :param kernel: The block kernel, called as kernel(source view, output
+            view, *args) with views of shape (A, S, B)
+        :type kernel: Callable
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param dtype: The dtype of the result
+        :type dtype: np.dtype
+        :param workspace: The active workspace
+        :type workspace: Workspace
+        :param args: The gate arguments of the kernel
+        :type args: object
+        :return: The updated state tensor, valid until the workspace's slot
+            is reused
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        out = workspace.output(state.shape, dtype, state)
+        block = StateVectorKernels.block_shape(state.shape, axes)
+        if block is not None and state.flags.c_contiguous:
+            kernel(state.reshape(block), out.reshape(block), *args)
+            return out
+        targets = tuple(range(len(axes)))
+        moved = np.moveaxis(state, axes, targets)
+        block = StateVectorKernels.block_shape(moved.shape, targets)
+        front = out.reshape(moved.shape)
+        np.copyto(front, moved)
+        scratch = workspace.buffer("scratch", moved.shape, dtype)
+        kernel(front.reshape(block), scratch.reshape(block), *args)
+        np.copyto(out, np.moveaxis(scratch, targets, axes))
+        return out
+
+    @staticmethod
+    def apply_matrix(state: np.ndarray, matrix: np.ndarray,
+                     axes: Iterable[int], parallel: bool = True,
+                     inplace: bool = False):
+        """
+        Applies a gate matrix to the given axes of a state tensor, in chunks
+        across the threads if the state is large enough.\n
+        * Note: Small dense gates are applied by the JIT kernels when they are
+        enabled, in place if inplace and otherwise to a copy of the state.
+        Otherwise, if a Workspace is active, dense gates write the updated
+        state into its state slots.
+
+        :param state: The state tensor of shape (d_0, ..., d_{n-1})
+        :type state: np.ndarray
+        :param matrix: The gate matrix acting on len(axes) qudits
+        :type matrix: np.ndarray or sp.spmatrix
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param parallel: Whether to split the state into chunks for the
+            threads, defaults to True
+        :type parallel: bool
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        if not Misc.is_sparse(matrix) \
+                and JitKernels.supports(state, matrix.shape[0], dense=True):
+            if not inplace:
+                state = state.copy()
+            return StateVectorKernels.apply_jit(
+                JitKernels.dense, state, axes, np.ascontiguousarray(
+                    Precision.cast(matrix, state.dtype)), JitKernels.tile)
+        matrix = Precision.match(matrix, state)
+        workspace = Workspace.current()
+        chunks = StateVectorKernels.chunks(state.shape, axes) \
+            if parallel else None
+        if chunks is not None:
+            out = StateVectorKernels.empty(state, matrix, workspace)
+            if Misc.is_sparse(matrix) or \
+                    StateVectorKernels.block_view(state, axes) is not None:
+                return StateVectorKernels.map_chunks(
+                    StateVectorKernels.multiply_chunk, state, out, chunks,
+                    matrix, axes)
+            return StateVectorKernels.map_moved_chunks(
+                StateVectorKernels.multiply_chunk, state, out, axes,
+                workspace, matrix)
+        if workspace is not None and not Misc.is_sparse(matrix):
+            return StateVectorKernels.apply_buffered(
+                StateVectorKernels.multiply_block, state, axes,
+                np.result_type(state, matrix), workspace, matrix)
+        targets = tuple(range(len(axes)))
+        moved = np.moveaxis(state, axes, targets)
+        shape = moved.shape
+        result = Misc.dot(matrix, moved.reshape(matrix.shape[1], -1))
+        return np.moveaxis(
+            np.asarray(result).reshape(shape), targets, axes)
+
+    @staticmethod
+    def phase_tensor(diagonal: np.ndarray, axes: Iterable[int],
+                     num_axes: int, dim: int = 3):
+        """
+        Reshapes the diagonal of a diagonal gate so that it broadcasts along
+        the given axes of a state tensor
+
+        :param diagonal: The diagonal of the gate
+        :type diagonal: np.ndarray
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param num_axes: The number of axes of the state tensor
+        :type num_axes: int
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each of the gate's qudits, defaults to 3
+        :type dim: int or Iterable[int]
+        :return: The phase tensor with size 1 along all other axes
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        dims = (dim,) * len(axes) if isinstance(dim, (int, np.integer)) \
+            else tuple(dim)
+        order = np.argsort(axes)
+        phases = np.reshape(diagonal, dims).transpose(order)
+        shape = [1] * num_axes
+        for axis, d in zip(axes, dims):
+            shape[axis] = d
+        return phases.reshape(shape)
+
+    @staticmethod
+    def apply_diagonal(state: np.ndarray, diagonal: np.ndarray,
+                       axes: Iterable[int], dim: int = None,
+                       parallel: bool = True, inplace: bool = False):
+        """
+        Applies a diagonal gate to the given axes of a state tensor by
+        broadcasting its diagonal, with each thread multiplying its chunks
+        straight into the output.\n
+        * Note: The gate is applied by the JIT kernels when they are enabled,
+        in place if inplace and otherwise to a copy of the state. Otherwise,
+        if a Workspace is active, the updated state is written into its state
+        slots.
+
+        :param state: The state tensor of shape (d_0, ..., d_{n-1})
+        :type state: np.ndarray
+        :param diagonal: The diagonal of the gate
+        :type diagonal: np.ndarray
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param dim: The dimension of the qudits, or of each of the gate's
+            qudits, defaults to the sizes of the state's axes
+        :type dim: int or Iterable[int]
+        :param parallel: Whether to split the state into chunks for the
+            threads, defaults to True
+        :type parallel: bool
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        if JitKernels.supports(state, len(diagonal)):
+            if not inplace:
+                state = state.copy()
+            return StateVectorKernels.apply_jit(
+                JitKernels.diagonal, state, axes, np.ascontiguousarray(
+                    Precision.cast(diagonal, state.dtype)).reshape(-1))
+        diagonal = Precision.match(diagonal, state)
+        if dim is None:
+            dim = tuple(state.shape[axis] for axis in axes)
+        phases = StateVectorKernels.phase_tensor(diagonal, axes, state.ndim,
+                                                 dim)
+        workspace = Workspace.current()
+        chunks = StateVectorKernels.chunks(state.shape, axes) \
+            if parallel else None
+        if chunks is None and workspace is None:
+            return state * phases
+        out = StateVectorKernels.empty(state, phases, workspace)
+        if chunks is None:
+            return np.multiply(state, phases, out=out)
+        pool = StateVectorKernels.thread_pool()
+        futures = [pool.submit(np.multiply, state[index], phases,
+                               out=out[index]) for index in chunks]
+        for future in futures:
+            future.result()
+        return out
+
+    @staticmethod
+    def apply_monomial(state: np.ndarray, permutation: np.ndarray,
+                       phases: np.ndarray, axes: Iterable[int],
+                       parallel: bool = True, inplace: bool = False):
+        """
+        Applies a monomial gate, which maps |j⟩ to phases[j]|permutation[j]⟩,
+        to the given axes of a state tensor, in chunks across the threads if
+        the state is large enough.\n
+        * Note: The gate is applied by the JIT kernels when they are enabled,
+        in place if inplace and otherwise to a copy of the state. Otherwise,
+        if a Workspace is active, the updated state is written into its state
+        slots.
+
+        :param state: The state tensor of shape (d_0, ..., d_{n-1})
+        :type state: np.ndarray
+        :param permutation: The permutation of the standard basis states
+        :type permutation: np.ndarray
+        :param phases: The phase of each standard basis state
+        :type phases: np.ndarray
+        :param axes: The axes of the state tensor the gate acts on
+        :type axes: Iterable[int]
+        :param parallel: Whether to split the state into chunks for the
+            threads, defaults to True
+        :type parallel: bool
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        axes = tuple(axes)
+        if JitKernels.supports(state, len(permutation)):
+            if not inplace:
+                state = state.copy()
+            return StateVectorKernels.apply_jit(
+                JitKernels.monomial, state, axes,
+                np.asarray(permutation, dtype=np.int64), np.ascontiguousarray(
+                    Precision.cast(phases, state.dtype)), JitKernels.tile)
+        phases = Precision.match(phases, state)
+        workspace = Workspace.current()
+        chunks = StateVectorKernels.chunks(state.shape, axes) \
+            if parallel else None
+        if chunks is not None:
+            out = StateVectorKernels.empty(state, phases, workspace)
+            return StateVectorKernels.map_chunks(
+                StateVectorKernels.permute_chunk, state, out, chunks,
+                permutation, phases, axes)
+        if workspace is not None:
+            return StateVectorKernels.apply_buffered(
+                StateVectorKernels.permute_block, state, axes,
+                np.result_type(state, phases), workspace, permutation,
+                phases)
+        targets = tuple(range(len(axes)))
+        moved = np.moveaxis(state, axes, targets)
+        shape = moved.shape
+        moved = moved.reshape(len(permutation), -1)
+        result = np.empty(moved.shape, dtype=np.result_type(moved, phases))
+        result[permutation] = phases[:, np.newaxis] * moved
+        return np.moveaxis(result.reshape(shape), targets, axes)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def fourier_matrix(dims: tuple[int], powers: tuple[int]):
+        """
+        Gets the Kronecker product of powers of Hadamard gates.\n
+        * Note: The matrices are cached and must not be modified.
+
+        :param dims: The dimension of each qudit
+        :type dims: tuple[int]
+        :param powers: The power of the Hadamard gate of each qudit
+        :type powers: tuple[int]
+        :return: The Kronecker product of the powers of the Hadamard gates
+        :rtype: np.ndarray
+        """
+        return Misc.kron(*[np.linalg.matrix_power(QCM.H_gate(d), p % 4)
+                           for d, p in zip(dims, powers)])
+
+    @staticmethod
+    def apply_fourier(state: np.ndarray, powers: Iterable[int],
+                      axes: Iterable[int]):
+        """
+        Applies powers of the Hadamard gate
+        :math:`H|k⟩ = \\frac{1}{\\sqrt{d}}\\sum_j ω^{jk}|j⟩` to the given
+        axes of a state tensor. Since H is the unitary inverse DFT, H^2 maps
+        |k⟩ to |-k⟩ and H^3 = H^† is the unitary DFT, so axes of at least
+        fft_min_dim states are transformed by batched FFTs in O(N log N) time
+        for a state of N amplitudes. The Hadamard gates of adjacent axes of
+        smaller qudits are combined into dense matrices of at most
+        fourier_block_states states, each applied in one pass over the state.
+
+        :param state: The state tensor of shape (d_0, ..., d_{n-1})
+        :type state: np.ndarray
+        :param powers: The power of the Hadamard gate applied to each axis
+        :type powers: Iterable[int]
+        :param axes: The axes of the state tensor the gates act on
+        :type axes: Iterable[int]
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        fft_groups = dict()
+        small = dict()
+        for power, axis in zip(powers, axes):
+            power = int(power) % 4
+            if power == 0:
+                continue
+            if state.shape[axis] >= StateVectorKernels.fft_min_dim:
+                fft_groups.setdefault(power, list()).append(axis)
+            else:
+                small[axis] = power
+        if 1 in fft_groups:
+            state = np.fft.ifftn(state, axes=fft_groups[1], norm="ortho")
+        if 3 in fft_groups:
+            state = np.fft.fftn(state, axes=fft_groups[3], norm="ortho")
+        if 2 in fft_groups:
+            state = np.roll(np.flip(state, fft_groups[2]), 1, fft_groups[2])
+        if not small:
+            return state
+        shape = state.shape
+        flat = np.ascontiguousarray(state, dtype=np.result_type(
+            state, np.complex64)).reshape(-1)
+        blocks = list()
+        for axis in sorted(small):
+            if blocks and blocks[-1][-1] == axis - 1 \
+                    and np.prod([shape[a] for a in blocks[-1]]) \
+                    * shape[axis] <= StateVectorKernels.fourier_block_states:
+                blocks[-1].append(axis)
+            else:
+                blocks.append([axis])
+        workspace = Workspace.current()
+        for block in blocks:
+            size = int(np.prod([shape[a] for a in block]))
+            matrix = StateVectorKernels.fourier_matrix(
+                tuple(shape[a] for a in block), tuple(small[a] for a in block))
+            matrix = Precision.match(matrix, flat)
+            blocked = flat.reshape(int(np.prod(shape[:block[0]])), size, -1)
+            chunks = StateVectorKernels.chunks(blocked.shape, (1,))
+            if chunks is None and workspace is None:
+                flat = np.matmul(matrix, blocked).reshape(-1)
+                continue
+            out = StateVectorKernels.empty(blocked, matrix, workspace)
+            if chunks is None:
+                StateVectorKernels.multiply_block(blocked, out, matrix)
+                flat = out.reshape(-1)
+                continue
+            pool = StateVectorKernels.thread_pool()
+            futures = [pool.submit(np.matmul, matrix, blocked[index],
+                                   out=out[index]) for index in chunks]
+            for future in futures:
+                future.result()
+            flat = out.reshape(-1)
+        return flat.reshape(shape)
+
+    @staticmethod
+    def apply_controlled(state: np.ndarray, matrix: np.ndarray,
+                         controls: Iterable[tuple[int, int]],
+                         axes: Iterable[int], inplace: bool = False):
+        """
+        Applies a controlled gate matrix to a state tensor, on the slice of
+        the state where the control axes have their control values
+
+        :param state: The state tensor of shape (d_0, ..., d_{n-1})
+        :type state: np.ndarray
+        :param matrix: The gate matrix acting on the target axes
+        :type matrix: np.ndarray or sp.spmatrix
+        :param controls: The control axes and their control values as
+            (axis, value) pairs
+        :type controls: Iterable[tuple[int, int]]
+        :param axes: The target axes of the state tensor
+        :type axes: Iterable[int]
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        controls = dict(controls)
+        axes = tuple(axes)
+        if not Misc.is_sparse(matrix) \
+                and JitKernels.supports(state, matrix.shape[0], dense=True):
+            if not inplace:
+                state = state.copy()
+            return StateVectorKernels.apply_jit(
+                JitKernels.dense, state, axes, np.ascontiguousarray(
+                    Precision.cast(matrix, state.dtype)), JitKernels.tile,
+                fixed=controls)
+        index = [slice(None)] * state.ndim
+        for axis, value in controls.items():
+            index[axis] = value
+        index = tuple(index)
+        targets = tuple(axis - sum(c < axis for c in controls)
+                        for axis in axes)
+        updated = StateVectorKernels.apply_matrix(state[index], matrix,
+                                                  targets)
+        if not inplace or updated.dtype != state.dtype:
+            state = state.astype(np.result_type(state, updated))
+        state[index] = updated
+        return state
+
+    @staticmethod
+    def apply_layer(state: np.ndarray, matrices: Iterable[np.ndarray],
+                    axes: Iterable[int], block_axes: int = 2,
+                    inplace: bool = False):
+        """
+        Applies single-qudit gates on distinct axes of a state tensor, with
+        the gates of every block_axes axes combined by Kronecker product and
+        applied in one pass over the state
+
+        :param state: The state tensor of shape (d_0, ..., d_{n-1})
+        :type state: np.ndarray
+        :param matrices: The single-qudit gate matrices
+        :type matrices: Iterable[np.ndarray]
+        :param axes: The distinct axes of the state tensor each gate acts on
+        :type axes: Iterable[int]
+        :param block_axes: The number of gates combined into one pass,
+            defaults to 2
+        :type block_axes: int
+        :param inplace: Whether the state may be updated in place, e.g. by a
+            simulator which owns it, defaults to False (the state is never
+            modified)
+        :type inplace: bool
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        matrices = [Misc.to_dense(matrix) for matrix in matrices]
+        axes = tuple(axes)
+        for start in range(0, len(axes), block_axes):
+            block = slice(start, start + block_axes)
+            state = StateVectorKernels.apply_matrix(
+                state, Misc.kron(*matrices[block]), axes[block],
+                inplace=inplace)
+        return state
@@ -0,0 +1,186 @@
+"""
+Measurement
+
+Measures, samples, and computes the outcome probabilities of qudit states
+stored as tensors of shape (d_0, ..., d_{n-1})
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from src.QuditRegister import QuditRegister
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class Measurement(object):
+    """Measures qudit states in the standard basis. Probabilities of subsets
+    of qudits are reduced by summing over the other axes of the state, and
+    samples are drawn in bulk and decoded into dits with a QuditRegister."""
+    @staticmethod
+    def probabilities(state: np.ndarray, qudits: Iterable[int] = None):
+        """
+        Gets the probabilities of the measurement outcomes of qudits, i.e.
+        the marginal distribution of the qudits
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param qudits: The measured qudits in the order of the outcome axes,
+            defaults to all qudits
+        :type qudits: Iterable[int]
+        :return: The probabilities as a tensor with one axis per qudit
+        :rtype: np.ndarray
+        """
+        probabilities = state.real ** 2 + state.imag ** 2
+        if qudits is None:
+            return probabilities
+        qudits = tuple(qudits)
+        rest = tuple(q for q in range(state.ndim) if q not in qudits)
+        marginal = probabilities.sum(axis=rest) if rest else probabilities
+        return marginal.transpose(np.argsort(np.argsort(qudits)))
+
+    @staticmethod
+    def sample_indices(probabilities: np.ndarray, shots: int,
+                       rng: np.random.Generator = None):
+        """
+        Samples the indices of outcomes. Few shots are drawn by binary search
+        of the cumulative distribution, and many shots by drawing the counts
+        of every outcome at once and shuffling the repeated outcomes.
+
+        :param probabilities: The probabilities of the outcomes
+        :type probabilities: np.ndarray
+        :param shots: The number of samples
+        :type shots: int
+        :param rng: The random number generator, defaults to a new unseeded
+            generator
+        :type rng: np.random.Generator
+        :return: The sampled indices
+        :rtype: np.ndarray
+        """
+        rng = np.random.default_rng(rng)
+        probabilities = np.ravel(probabilities)
+        if shots < len(probabilities) // 4:
+            cdf = np.cumsum(probabilities)
+            indices = np.searchsorted(cdf, rng.random(shots) * cdf[-1],
+                                      side="right")
+            return np.minimum(indices, len(cdf) - 1)
+        counts = rng.multinomial(shots, probabilities / probabilities.sum())
+        indices = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+        rng.shuffle(indices)
+        return indices
+
+    @staticmethod
+    def sample(state: np.ndarray, shots: int, qudits: Iterable[int] = None,
+               rng: np.random.Generator = None):
+        """
+        Samples measurement outcomes of qudits without collapsing the state
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param shots: The number of samples
+        :type shots: int
+        :param qudits: The measured qudits, defaults to all qudits
+        :type qudits: Iterable[int]
+        :param rng: The random number generator or seed, defaults to a new
+            unseeded generator
+        :type rng: np.random.Generator or int
+        :return: The dits of each sample, with one row per sample and one
+            column per measured qudit
+        :rtype: np.ndarray
+        """
+        if qudits is None:
+            qudits = range(state.ndim)
+        qudits = tuple(qudits)
+        register = QuditRegister(state.shape[q] for q in qudits)
+        indices = Measurement.sample_indices(
+            Measurement.probabilities(state, qudits), shots, rng)
+        return register.decode(indices, register.dit_dtype())
+
+    @staticmethod
+    def counts(state: np.ndarray, shots: int, qudits: Iterable[int] = None,
+               rng: np.random.Generator = None):
+        """
+        Samples the number of times each measurement outcome of qudits occurs
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param shots: The number of samples
+        :type shots: int
+        :param qudits: The measured qudits, defaults to all qudits
+        :type qudits: Iterable[int]
+        :param rng: The random number generator or seed, defaults to a new
+            unseeded generator
+        :type rng: np.random.Generator or int
+        :return: The counts of the outcomes which occurred, by their labels,
+            e.g. "012"
+        :rtype: dict[str, int]
+        """
+        rng = np.random.default_rng(rng)
+        if qudits is None:
+            qudits = range(state.ndim)
+        qudits = tuple(qudits)
+        register = QuditRegister(state.shape[q] for q in qudits)
+        probabilities = np.ravel(Measurement.probabilities(state, qudits))
+        counts = rng.multinomial(shots, probabilities / probabilities.sum())
+        outcomes = np.flatnonzero(counts)
+        return {"".join(map(str, dits)): int(count) for dits, count in
+                zip(register.decode(outcomes).tolist(), counts[outcomes])}
+
+    @staticmethod
+    def measure(state: np.ndarray, qudits: Iterable[int] = None,
+                rng: np.random.Generator = None):
+        """
+        Measures qudits, collapsing the state onto the measured outcome
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param qudits: The measured qudits, defaults to all qudits
+        :type qudits: Iterable[int]
+        :param rng: The random number generator or seed, defaults to a new
+            unseeded generator
+        :type rng: np.random.Generator or int
+        :return: The measured dits and the collapsed, normalized state tensor
+        :rtype: tuple[tuple[int], np.ndarray]
+        """
+        if qudits is None:
+            qudits = range(state.ndim)
+        qudits = tuple(qudits)
+        outcome = tuple(Measurement.sample(state, 1, qudits, rng)[0].tolist())
+        return outcome, Measurement.collapse(state, qudits, outcome)
+
+    @staticmethod
+    def collapse(state: np.ndarray, qudits: Iterable[int],
+                 outcome: Iterable[int]):
+        """
+        Projects a state onto a measurement outcome of qudits and renormalizes
+        it
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param qudits: The measured qudits
+        :type qudits: Iterable[int]
+        :param outcome: The measured dit of each qudit
+        :type outcome: Iterable[int]
+        :raises ValueError: The outcome has probability zero
+        :return: The collapsed state tensor
+        :rtype: np.ndarray
+        """
+        index = [slice(None)] * state.ndim
+        for q, dit in zip(qudits, outcome):
+            index[q] = slice(dit, dit + 1)
+        index = tuple(index)
+        norm = np.linalg.norm(state[index])
+        if norm == 0:
+            raise ValueError("the outcome %s of qudits %s has probability 0"
+                             % (tuple(outcome), tuple(qudits)))
+        collapsed = np.zeros_like(state)
+        collapsed[index] = state[index] / norm
+        return collapsed
@@ -0,0 +1,121 @@
+"""
+Observables
+
+Computes expectation values of Pauli strings on qudit states stored as
+tensors of shape (d_0, ..., d_{n-1})
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from functools import lru_cache
+from typing import Iterable
+
+import numpy as np
+
+from src.PauliString import PauliString
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class Observables(object):
+    """Computes expectation values of Pauli strings without building their
+    matrices. Since :math:`X^a Z^b|j⟩ = ω^{b·j}|j+a⟩`,
+    :math:`⟨ψ|X^a Z^b|ψ⟩ = \\sum_j \\overline{ψ_{j+a}} ψ_j ω^{b·j}`, which is
+    the product of the state with a rolled copy of itself summed against a
+    product of phase vectors, in O(d^n) time for each string."""
+    fft_min_strings = 8
+    """The smallest number of Pauli strings with the same X exponents whose
+    expectation values are all read off one FFT of the rolled product"""
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def phase_vector(dim: int, power: int):
+        """
+        Gets the diagonal of a power of the Pauli-Z gate.\n
+        * Note: The vectors are cached and must not be modified.
+
+        :param dim: The dimension of the qudit (ie: qubit=2 and qutrit=3)
+        :type dim: int
+        :param power: The power of the Pauli-Z gate
+        :type power: int
+        :return: The diagonal :math:`(ω^{bj})_j`
+        :rtype: np.ndarray
+        """
+        return np.exp(2j * np.pi * (power * np.arange(dim) % dim) / dim)
+
+    @staticmethod
+    def rolled_product(state: np.ndarray, x: Iterable[int]):
+        """
+        Gets :math:`\\overline{ψ_{j+x}} ψ_j` for every standard basis state j
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param x: The exponent of X of each qudit
+        :type x: Iterable[int]
+        :return: The rolled product tensor
+        :rtype: np.ndarray
+        """
+        axes = [axis for axis, a in enumerate(x) if a]
+        if not axes:
+            return state.real ** 2 + state.imag ** 2
+        shifted = np.roll(state, [-x[axis] for axis in axes], axes)
+        return np.conj(shifted, out=shifted) * state
+
+    @staticmethod
+    def contract(product: np.ndarray, z: Iterable[int]):
+        """
+        Sums a rolled product against the phases of powers of Pauli-Z gates,
+        contracting the last axis at a time with its phase vector by a
+        matrix-vector product
+
+        :param product: The rolled product tensor
+        :type product: np.ndarray
+        :param z: The exponent of Z of each qudit
+        :type z: Iterable[int]
+        :return: :math:`\\sum_j product_j ω^{z·j}`
+        :rtype: complex
+        """
+        value = product.reshape(-1)
+        for dim, b in reversed(list(zip(product.shape, z))):
+            value = value.reshape(-1, dim) @ Observables.phase_vector(dim, b)
+        return complex(value[0])
+
+    @staticmethod
+    def expectation(state: np.ndarray, pauli_strings: Iterable[object]):
+        """
+        Computes the expectation values :math:`⟨ψ|P|ψ⟩` of Pauli strings.
+        Strings with the same X exponents share one rolled product of the
+        state, and groups of at least fft_min_strings of them are all read
+        off its inverse FFT. Pauli strings of qudits of dimension above 2 are
+        not Hermitian, so the expectation values are complex.
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param pauli_strings: The Pauli strings or their labels, e.g. "ZXI"
+        :type pauli_strings: Iterable[PauliString or str]
+        :raises ValueError: A Pauli string acts on a different number of
+            qudits than the state
+        :return: The expectation value of each Pauli string
+        :rtype: np.ndarray
+        """
+        groups = dict()
+        strings = [PauliString.from_any(p) for p in pauli_strings]
+        for i, pauli in enumerate(strings):
+            x, z = pauli.reduce(state.shape)
+            groups.setdefault(x, list()).append((i, z))
+        values = np.empty(len(strings), dtype=complex)
+        for x, members in groups.items():
+            product = Observables.rolled_product(state, x)
+            if len(members) >= Observables.fft_min_strings:
+                spectrum = np.fft.ifftn(product) * product.size
+                for i, z in members:
+                    values[i] = spectrum[z]
+            else:
+                for i, z in members:
+                    values[i] = Observables.contract(product, z)
+        return values
@@ -0,0 +1,107 @@
+"""
+Moment Scheduler
+
+Packs the gates of instructions into moments of gates which may be applied to
+the state together
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from src.instruction import Instruction
+from src.instruction.compiled import CompiledCircuit
+from src.instruction.diagonal_gate import DiagonalGate
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class MomentScheduler(object):
+    """Packs gates into moments as early as the DAG of qudit dependencies
+    allows. Within a moment every qudit is acted on by at most one gate,
+    except that diagonal gates commute with each other, so any number of
+    them may share qudits in a moment when commute_diagonals is set."""
+    def __init__(self, commute_diagonals: bool = True):
+        """
+        Creates a new moment scheduler
+
+        :param commute_diagonals: Whether diagonal gates may be moved past
+            each other, defaults to True
+        :type commute_diagonals: bool
+        """
+        self.commute_diagonals = commute_diagonals
+
+    def schedule(self, instruction: Instruction or CompiledCircuit,
+                 num_qudits: int = None):
+        """
+        Packs the gates of an instruction into moments
+
+        :param instruction: An instruction or compiled circuit
+        :type instruction: Instruction or CompiledCircuit
+        :param num_qudits: The number of qudits, defaults to the instruction's
+            number of qudits
+        :type num_qudits: int
+        :return: The moments in the order they act on the state, each a list
+            of gates and their qudit targets
+        :rtype: list[list[tuple[Instruction, tuple[int]]]]
+        """
+        if not isinstance(instruction, CompiledCircuit):
+            instruction = CompiledCircuit(instruction, num_qudits=num_qudits)
+        moments = list()
+        last = dict()
+        last_blocking = dict()
+        for gate, targets in reversed(instruction):
+            diagonal = self.commute_diagonals \
+                and isinstance(gate, DiagonalGate)
+            depends = last_blocking if diagonal else last
+            moment = 1 + max([depends.get(q, -1) for q in targets] + [-1])
+            if moment == len(moments):
+                moments.append(list())
+            moments[moment].append((gate, targets))
+            for q in targets:
+                last[q] = max(last.get(q, -1), moment)
+                if not diagonal:
+                    last_blocking[q] = moment
+        return moments
+
+    @staticmethod
+    def stats(moments: list[list[tuple[Instruction, tuple[int]]]]):
+        """
+        Gets the depth and width statistics of scheduled moments
+
+        :param moments: The moments
+        :type moments: list[list[tuple[Instruction, tuple[int]]]]
+        :return: The depth, gate count, and largest and mean number of gates
+            and of qudits acted on per moment
+        :rtype: dict[str, int or float]
+        """
+        widths = [len(moment) for moment in moments]
+        qudits = [len(MomentScheduler.moment_qudits(moment))
+                  for moment in moments]
+        return {
+            "depth": len(moments),
+            "gate_count": sum(widths),
+            "max_width": max(widths, default=0),
+            "mean_width": float(np.mean(widths)) if widths else 0.0,
+            "max_qudits": max(qudits, default=0),
+            "mean_qudits": float(np.mean(qudits)) if qudits else 0.0,
+        }
+
+    @staticmethod
+    def moment_qudits(moment: Iterable[tuple[Instruction, tuple[int]]]):
+        """
+        Gets the qudits acted on by a moment
+
+        :param moment: A moment
+        :type moment: Iterable[tuple[Instruction, tuple[int]]]
+        :return: The qudits
+        :rtype: set[int]
+        """
+        return set().union(*[targets for gate, targets in moment])
@@ -0,0 +1,513 @@
+"""
+Sharded State Vector Simulator
+
+Simulates instructions on pure qudit states split into shards along their
+leading qudit axes, which are stored in shared memory and updated by a pool
+of worker processes
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.Precision import Precision
+from src.instruction import Instruction
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.fourier_gate import FourierGate
+from src.simulator.kernels import StateVectorKernels
+from src.simulator.statevector import StateVectorSimulator
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class ShardedStateVectorSimulator(object):
+    """Simulates instructions on a state tensor split along its first
+    shard_qudits physical axes into one shard per index of those axes, each
+    in its own block of shared memory. Gates on local axes are applied to
+    every shard by the worker processes. Before a gate on a sharded axis,
+    that axis is swapped globally with a local axis the gate does not act
+    on, moving the qudit's amplitudes between shards into a second set of
+    shards. Diagonal gates never need a swap, as each shard applies the
+    slice of the diagonal for its own index, and Fourier gates are split
+    into a gate on their local qudits and a gate on each sharded qudit, so
+    that even a layer on every qudit fits in the local axes. The layout maps
+    each physical
+    axis to the logical qudit stored there, and the bytes moved between
+    shards by each gate are recorded in communication."""
+    def __init__(self, num_qudits: int, dim: int = 3, shard_qudits: int = 1,
+                 workers: int = None, fuse_max_qudits: int = 0,
+                 dtype: np.dtype = None):
+        """
+        Creates a new sharded state vector simulator
+
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit for qudits of mixed dimensions,
+            defaults to 3
+        :type dim: int or Iterable[int]
+        :param shard_qudits: The number of leading qudits whose indices
+            select the shard, defaults to 1
+        :type shard_qudits: int
+        :param workers: The number of processes, defaults to the smaller of
+            the number of shards and the number of CPUs
+        :type workers: int
+        :param fuse_max_qudits: The largest number of qudits of a subcircuit
+            that is applied as a single fused gate, at most the number of
+            local qudits, defaults to 0 (never fuse)
+        :type fuse_max_qudits: int
+        :param dtype: The dtype of the shards, complex64 or complex128,
+            defaults to Precision.dtype
+        :type dtype: np.dtype
+        :raises ValueError: There are no local qudits, or fused gates may
+            act on more qudits than there are local qudits
+        """
+        if not 0 < shard_qudits < num_qudits:
+            raise ValueError("shard_qudits must be between 1 and %s, not %s"
+                             % (num_qudits - 1, shard_qudits))
+        if fuse_max_qudits > num_qudits - shard_qudits:
+            raise ValueError("fused gates of up to %s qudits do not fit in "
+                             "the %s local qudits"
+                             % (fuse_max_qudits, num_qudits - shard_qudits))
+        self.simulator = StateVectorSimulator(
+            num_qudits, dim, merge_diagonals=False,
+            fuse_max_qudits=fuse_max_qudits, dtype=dtype)
+        self.shard_qudits = shard_qudits
+        self.workers = workers
+        self.layout = list(range(num_qudits))
+        self.communication = list()
+        self.shards = None
+        self.buffers = None
+        self.pool = None
+        self.last_used = dict()
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return self.simulator.num_qudits
+
+    @property
+    def dtype(self):
+        """
+        Gets the dtype of the shards
+
+        :return: The dtype of the shards
+        :rtype: np.dtype
+        """
+        return self.simulator.dtype
+
+    @property
+    def dims(self):
+        """
+        Gets the dimension of each physical axis, which swaps preserve
+
+        :return: The dimension of each physical axis
+        :rtype: tuple[int]
+        """
+        return self.simulator.shape
+
+    @property
+    def shard_dims(self):
+        """
+        Gets the dimensions of the sharded axes
+
+        :return: The dimensions of the sharded axes
+        :rtype: tuple[int]
+        """
+        return self.dims[:self.shard_qudits]
+
+    @property
+    def shard_shape(self):
+        """
+        Gets the shape of a shard, i.e. the dimensions of the local axes
+
+        :return: The shape of a shard
+        :rtype: tuple[int]
+        """
+        return self.dims[self.shard_qudits:]
+
+    @property
+    def num_shards(self):
+        """
+        Gets the number of shards
+
+        :return: The number of shards
+        :rtype: int
+        """
+        return int(np.prod(self.shard_dims, dtype=np.int64))
+
+    @property
+    def shard_bytes(self):
+        """
+        Gets the size of a shard in bytes
+
+        :return: The size of a shard
+        :rtype: int
+        """
+        return int(np.prod(self.shard_shape, dtype=np.int64)) \
+            * self.dtype.itemsize
+
+    @property
+    def communication_bytes(self):
+        """
+        Gets the total number of bytes moved between shards
+
+        :return: The number of bytes
+        :rtype: int
+        """
+        return sum(volume for _, _, volume in self.communication)
+
+    @staticmethod
+    def attach(name: str, shape: tuple[int], dtype: np.dtype = complex):
+        """
+        Attaches to a shard in shared memory
+
+        :param name: The name of the shared memory block
+        :type name: str
+        :param shape: The shape of the shard
+        :type shape: tuple[int]
+        :param dtype: The dtype of the shard, defaults to complex128
+        :type dtype: np.dtype
+        :return: The shared memory block and the shard array on it, which
+            must be deleted before the block is closed
+        :rtype: tuple[SharedMemory, np.ndarray]
+        """
+        memory = SharedMemory(name)
+        return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+    @staticmethod
+    def apply_shard(name: str, shape: tuple[int], gate: Instruction,
+                    axes: tuple[int], dtype: np.dtype = complex):
+        """
+        Applies a gate to the local axes of a shard in a worker process
+
+        :param name: The name of the shard's shared memory block
+        :type name: str
+        :param shape: The shape of the shard
+        :type shape: tuple[int]
+        :param gate: The gate
+        :type gate: Instruction
+        :param axes: The local axes the gate acts on
+        :type axes: tuple[int]
+        :param dtype: The dtype of the shard, defaults to complex128
+        :type dtype: np.dtype
+        """
+        memory, shard = ShardedStateVectorSimulator.attach(name, shape, dtype)
+        result = gate.apply(shard, axes, inplace=True)
+        if result is not shard:
+            shard[...] = result
+        del shard, result
+        memory.close()
+
+    @staticmethod
+    def phase_shard(name: str, shape: tuple[int], phases: np.ndarray,
+                    axes: tuple[int], dtype: np.dtype = complex):
+        """
+        Multiplies a shard by the slice of a diagonal gate for its index in
+        a worker process
+
+        :param name: The name of the shard's shared memory block
+        :type name: str
+        :param shape: The shape of the shard
+        :type shape: tuple[int]
+        :param phases: The diagonal of the gate on the local axes
+        :type phases: np.ndarray
+        :param axes: The local axes the phases act on
+        :type axes: tuple[int]
+        :param dtype: The dtype of the shard, defaults to complex128
+        :type dtype: np.dtype
+        """
+        memory, shard = ShardedStateVectorSimulator.attach(name, shape, dtype)
+        shard *= StateVectorKernels.phase_tensor(
+            Precision.match(phases, shard).reshape(-1), axes, shard.ndim,
+            phases.shape)
+        del shard
+        memory.close()
+
+    @staticmethod
+    def swap_shard(sources: list[str], name: str, shape: tuple[int],
+                   value: int, local_axis: int, dtype: np.dtype = complex):
+        """
+        Gathers a shard after swapping a sharded axis with a local axis, in
+        a worker process. If the shard has index value along the sharded
+        axis, its slice v of the local axis comes from slice value of the
+        local axis of the source shard with index v along the sharded axis.
+
+        :param sources: The names of the source shards with each index
+            along the sharded axis, with the other indices of this shard
+        :type sources: list[str]
+        :param name: The name of the shared memory block of this shard
+        :type name: str
+        :param shape: The shape of a shard
+        :type shape: tuple[int]
+        :param value: The index of this shard along the sharded axis
+        :type value: int
+        :param local_axis: The swapped local axis
+        :type local_axis: int
+        :param dtype: The dtype of the shards, defaults to complex128
+        :type dtype: np.dtype
+        """
+        memory, shard = ShardedStateVectorSimulator.attach(name, shape, dtype)
+        index = [slice(None)] * len(shape)
+        for v, source in enumerate(sources):
+            source_memory, source_shard = ShardedStateVectorSimulator.attach(
+                source, shape, dtype)
+            index[local_axis] = value
+            piece = source_shard[tuple(index)]
+            index[local_axis] = v
+            shard[tuple(index)] = piece
+            del source_shard, piece
+            source_memory.close()
+        del shard
+        memory.close()
+
+    def load(self, state: np.ndarray = None):
+        """
+        Allocates the shards in shared memory, starts the worker processes,
+        and writes a state into the shards
+
+        :param state: The ket or state tensor, defaults to |0...0⟩
+        :type state: np.ndarray
+        """
+        self.close()
+        self.layout = list(range(self.num_qudits))
+        self.communication = list()
+        self.last_used = dict()
+        self.shards = [SharedMemory(create=True, size=self.shard_bytes)
+                       for _ in range(self.num_shards)]
+        self.buffers = [SharedMemory(create=True, size=self.shard_bytes)
+                        for _ in range(self.num_shards)]
+        workers = self.workers or min(self.num_shards, os.cpu_count())
+        self.pool = ProcessPoolExecutor(workers)
+        if state is None:
+            state = self.simulator.initial_state()
+        state = Precision.cast(np.asarray(state), self.dtype).reshape(
+            self.num_shards, -1)
+        for memory, values in zip(self.shards, state):
+            np.ndarray(values.shape, dtype=self.dtype,
+                       buffer=memory.buf)[...] = values
+
+    def gather(self):
+        """
+        Gathers the shards into one state tensor in the order of the logical
+        qudits
+
+        :return: The state tensor
+        :rtype: np.ndarray
+        """
+        state = np.empty((self.num_shards,) + self.shard_shape,
+                         dtype=self.dtype)
+        for i, memory in enumerate(self.shards):
+            state[i] = np.ndarray(self.shard_shape, dtype=self.dtype,
+                                  buffer=memory.buf)
+        state = state.reshape(self.dims)
+        return np.ascontiguousarray(
+            state.transpose(np.argsort(self.layout)))
+
+    def close(self):
+        """
+        Stops the worker processes and frees the shared memory
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        for memory in (self.shards or list()) + (self.buffers or list()):
+            memory.close()
+            memory.unlink()
+        self.shards = None
+        self.buffers = None
+
+    def swap(self, physical: int, local: int):
+        """
+        Swaps a sharded physical axis with a local physical axis of the same
+        dimension across all shards
+
+        :param physical: The sharded physical axis
+        :type physical: int
+        :param local: The local physical axis
+        :type local: int
+        :return: The number of bytes moved between shards
+        :rtype: int
+        """
+        shard_dims = self.shard_dims
+        local_axis = local - self.shard_qudits
+        names = [memory.name for memory in self.shards]
+        futures = list()
+        for i, memory in enumerate(self.buffers):
+            index = list(np.unravel_index(i, shard_dims))
+            sources = list()
+            for v in range(shard_dims[physical]):
+                index[physical] = v
+                sources.append(names[np.ravel_multi_index(index, shard_dims)])
+            value = int(np.unravel_index(i, shard_dims)[physical])
+            futures.append(self.pool.submit(
+                ShardedStateVectorSimulator.swap_shard, sources, memory.name,
+                self.shard_shape, value, local_axis, self.dtype))
+        for future in futures:
+            future.result()
+        self.shards, self.buffers = self.buffers, self.shards
+        self.layout[physical], self.layout[local] = \
+            self.layout[local], self.layout[physical]
+        dim = shard_dims[physical]
+        return self.num_shards * self.shard_bytes * (dim - 1) // dim
+
+    def localize(self, qudits: tuple[int]):
+        """
+        Swaps the sharded qudits of a gate with the least recently used
+        local qudits the gate does not act on
+
+        :param qudits: The logical qudits of the gate
+        :type qudits: tuple[int]
+        :raises ValueError: The gate acts on more qudits than there are local
+            qudits, or there is no local qudit of the same dimension to swap
+            with
+        :return: The number of bytes moved between shards
+        :rtype: int
+        """
+        if len(qudits) > self.num_qudits - self.shard_qudits:
+            raise ValueError("a gate on %s qudits does not fit in the %s "
+                             "local qudits, so fewer qudits must be sharded"
+                             % (len(qudits), self.num_qudits
+                                - self.shard_qudits))
+        volume = 0
+        for qudit in qudits:
+            physical = self.layout.index(qudit)
+            if physical >= self.shard_qudits:
+                continue
+            candidates = [p for p in range(self.shard_qudits, self.num_qudits)
+                          if self.layout[p] not in qudits
+                          and self.dims[p] == self.dims[physical]]
+            if not candidates:
+                raise ValueError("no local qudit of dimension %s to swap with "
+                                 "qudit %s" % (self.dims[physical], qudit))
+            local = min(candidates, key=lambda p: self.last_used.get(
+                self.layout[p], -1))
+            volume += self.swap(physical, local)
+        return volume
+
+    def split(self, gate: Instruction, qudits: tuple[int]):
+        """
+        Splits a Fourier gate, a product of single-qudit gates, into a gate
+        on its local qudits followed by a gate on each of its sharded qudits
+
+        :param gate: The gate
+        :type gate: Instruction
+        :param qudits: The logical qudits the gate acts on
+        :type qudits: tuple[int]
+        :return: The gates and the logical qudits they act on
+        :rtype: list[tuple[Instruction, tuple[int]]]
+        """
+        if not isinstance(gate, FourierGate) or len(qudits) == 1:
+            return [(gate, qudits)]
+        local = [i for i, q in enumerate(qudits)
+                 if self.layout.index(q) >= self.shard_qudits]
+        groups = [local] if local else list()
+        groups.extend([i] for i in range(len(qudits)) if i not in local)
+        dims = gate.dims
+        return [(FourierGate(gate.name, gate.powers[group], len(group),
+                             tuple(dims[i] for i in group)),
+                 tuple(qudits[i] for i in group)) for group in groups]
+
+    def apply_gate(self, gate: Instruction, qudits: tuple[int]):
+        """
+        Applies a gate to every shard, swapping its qudits into local axes
+        first unless it is diagonal
+
+        :param gate: The gate
+        :type gate: Instruction
+        :param qudits: The logical qudits the gate acts on
+        :type qudits: tuple[int]
+        """
+        volume = 0
+        futures = list()
+        physical = [self.layout.index(q) for q in qudits]
+        if isinstance(gate, DiagonalGate) \
+                and min(physical) < self.shard_qudits:
+            phases = np.reshape(gate.diagonal, [self.dims[p] for p in physical])
+            local = tuple(i for i, p in enumerate(physical)
+                          if p >= self.shard_qudits)
+            axes = tuple(physical[i] - self.shard_qudits for i in local)
+            for i, memory in enumerate(self.shards):
+                index = np.unravel_index(i, self.shard_dims)
+                sliced = phases[tuple(
+                    slice(None) if p >= self.shard_qudits else index[p]
+                    for p in physical)]
+                futures.append(self.pool.submit(
+                    ShardedStateVectorSimulator.phase_shard, memory.name,
+                    self.shard_shape, sliced, axes, self.dtype))
+        else:
+            volume = self.localize(qudits)
+            axes = tuple(self.layout.index(q) - self.shard_qudits
+                         for q in qudits)
+            for memory in self.shards:
+                futures.append(self.pool.submit(
+                    ShardedStateVectorSimulator.apply_shard, memory.name,
+                    self.shard_shape, gate, axes, self.dtype))
+        for future in futures:
+            future.result()
+        for qudit in qudits:
+            self.last_used[qudit] = len(self.communication)
+        self.communication.append((gate.name, qudits, volume))
+
+    def apply(self, instruction: Instruction):
+        """
+        Applies an instruction to the loaded shards
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        """
+        for gate, qudits in self.simulator.leaves(instruction):
+            for part, targets in self.split(gate, qudits):
+                self.apply_gate(part, targets)
+
+    def evolve(self, instruction: Instruction, state: np.ndarray = None):
+        """
+        Applies an instruction to a state tensor, loading it into shards
+        and gathering the result
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param state: The ket or state tensor, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The final state tensor
+        :rtype: np.ndarray
+        """
+        try:
+            self.load(state)
+            self.apply(instruction)
+            return self.gather()
+        finally:
+            self.close()
+
+    def run(self, instruction: Instruction, state: np.ndarray = None):
+        """
+        Applies an instruction to a ket
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param state: The ket, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The final ket
+        :rtype: np.ndarray
+        """
+        return self.evolve(instruction, state).reshape(-1, 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,365 @@
+"""
+State Vector Simulator
+
+Simulates instructions on pure qudit states stored as tensors of shape
+(d_0, ..., d_{n-1})
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from src.Precision import Precision
+from src.QuditRegister import QuditRegister
+from src.Workspace import Workspace
+from src.instruction import Instruction
+from src.instruction.compiled import CompiledCircuit
+from src.instruction.diagonal_gate import DiagonalGate
+from src.instruction.fourier_gate import FourierGate
+from src.instruction.gate import Gate
+from src.simulator.kernels import StateVectorKernels
+from src.simulator.measurement import Measurement
+from src.simulator.observables import Observables
+from src.simulator.scheduler import MomentScheduler
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class StateVectorSimulator(object):
+    """Simulates instructions on pure qudit states. The intermediate states
+    of each evolution are written into the simulator's workspace, which is
+    sized for the state tensor before the first gate, so that evolving
+    makes no new large allocations per gate after the first evolution."""
+    def __init__(self, num_qudits: int, dim: int = 3,
+                 merge_diagonals: bool = True, fuse_max_qudits: int = 0,
+                 schedule: bool = False, block_axes: int = 2,
+                 dtype: np.dtype = None):
+        """
+        Creates a new state vector simulator
+
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit for qudits of mixed dimensions,
+            defaults to 3
+        :type dim: int or Iterable[int]
+        :param merge_diagonals: Whether to merge runs of diagonal gates into a
+            single phase tensor before applying them, defaults to True
+        :type merge_diagonals: bool
+        :param fuse_max_qudits: The largest number of qudits of a subcircuit
+            that is applied as a single fused gate, which is computed once for
+            all its occurrences, defaults to 0 (never fuse)
+        :type fuse_max_qudits: int
+        :param schedule: Whether to pack the gates into moments and apply each
+            moment together, defaults to False
+        :type schedule: bool
+        :param block_axes: The number of single-qudit gates of a moment that
+            are combined into one pass over the state, defaults to 2
+        :type block_axes: int
+        :param dtype: The dtype of the states, complex64 or complex128,
+            defaults to Precision.dtype
+        :type dtype: np.dtype
+        """
+        self.num_qudits = num_qudits
+        self.dim = Instruction.normalize_dim(dim)
+        self.register = QuditRegister(
+            Instruction.qudit_dims(self.dim, num_qudits))
+        self.merge_diagonals = merge_diagonals
+        self.fuse_max_qudits = fuse_max_qudits
+        self.schedule = schedule
+        self.block_axes = block_axes
+        self.dtype = Precision.state_dtype(dtype)
+        self.workspace = Workspace()
+
+    @property
+    def shape(self):
+        """
+        Gets the shape of the state tensor
+
+        :return: The shape of the state tensor
+        :rtype: tuple[int]
+        """
+        return self.register.shape
+
+    def initial_state(self):
+        """
+        Gets the state tensor of |0...0⟩
+
+        :return: The state tensor of |0...0⟩
+        :rtype: np.ndarray
+        """
+        state = np.zeros(self.shape, dtype=self.dtype)
+        state[(0,) * self.num_qudits] = 1
+        return state
+
+    def to_tensor(self, state: np.ndarray):
+        """
+        Copies a ket (e.g. from QuantumCircuitMatrix.get_ket) into a state
+        tensor of the simulator's dtype, so that instructions may update the
+        state tensor in place
+
+        :param state: A ket or state tensor
+        :type state: np.ndarray
+        :return: The state tensor
+        :rtype: np.ndarray
+        """
+        state = np.asarray(state)
+        tensor = Precision.cast(state, self.dtype)
+        if tensor is state:
+            tensor = tensor.copy()
+        return tensor.reshape(self.shape)
+
+    def to_ket(self, state: np.ndarray):
+        """
+        Converts a state tensor into a ket column vector
+
+        :param state: A state tensor
+        :type state: np.ndarray
+        :return: The ket
+        :rtype: np.ndarray
+        """
+        return state.reshape(-1, 1)
+
+    def leaves(self, instruction: Instruction, axes: Iterable[int] = None):
+        """
+        Gets the gates of an instruction in the order they act on the state,
+        with their matrices cast once to the simulator's dtype, together with
+        the state axes they act on
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param axes: The state axes of the instruction's qudits, defaults to
+            all axes
+        :type axes: Iterable[int]
+        :return: The gates and their state axes
+        :rtype: Iterable[tuple[Instruction, tuple[int]]]
+        """
+        if axes is None:
+            axes = tuple(range(self.num_qudits))
+        axes = tuple(axes)
+        for gate, qudits in reversed(CompiledCircuit(
+                instruction, self.fuse_max_qudits, len(axes), self.dtype)):
+            yield gate, tuple(axes[q] for q in qudits)
+
+    def evolve(self, instruction: Instruction, state: np.ndarray = None):
+        """
+        Applies an instruction to a state tensor
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param state: The state tensor or ket, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The final state tensor
+        :rtype: np.ndarray
+        """
+        if state is None:
+            state = self.initial_state()
+        else:
+            state = self.to_tensor(state)
+        initial = state
+        self.workspace.reserve(self.shape, self.dtype)
+        with self.workspace:
+            if self.schedule:
+                for moment in self.moments(instruction):
+                    state = self.apply_moment(state, moment)
+            else:
+                state = self.apply_leaves(state, instruction)
+        return self.workspace.detach(state, initial)
+
+    def apply_leaves(self, state: np.ndarray, instruction: Instruction):
+        """
+        Applies the gates of an instruction to a state tensor one at a time,
+        with runs of diagonal gates merged into one phase tensor
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        phases = None
+        for gate, axes in self.leaves(instruction):
+            if self.merge_diagonals and isinstance(gate, DiagonalGate):
+                phase = StateVectorKernels.phase_tensor(
+                    Precision.match(gate.diagonal, state), axes,
+                    self.num_qudits, [self.shape[axis] for axis in axes])
+                phases = phase if phases is None else phases * phase
+                continue
+            if phases is not None:
+                state = self.multiply(state, phases)
+                phases = None
+            state = gate.apply(state, axes, inplace=True)
+        if phases is not None:
+            state = self.multiply(state, phases)
+        return state
+
+    def multiply(self, state: np.ndarray, phases: np.ndarray):
+        """
+        Multiplies a state tensor by a phase tensor, into the workspace if it
+        is active
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param phases: The phase tensor, which broadcasts to the state tensor
+        :type phases: np.ndarray
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        return np.multiply(state, phases, out=StateVectorKernels.empty(
+            state, phases, Workspace.current()))
+
+    def moments(self, instruction: Instruction):
+        """
+        Packs the gates of an instruction into moments
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :return: The moments in the order they act on the state
+        :rtype: list[list[tuple[Instruction, tuple[int]]]]
+        """
+        return MomentScheduler(self.merge_diagonals).schedule(CompiledCircuit(
+            instruction, self.fuse_max_qudits, self.num_qudits, self.dtype))
+
+    def apply_moment(self, state: np.ndarray,
+                     moment: Iterable[tuple[Instruction, tuple[int]]]):
+        """
+        Applies a moment of gates to a state tensor, with all its diagonal
+        gates merged into one phase tensor, all its Fourier gates applied as
+        one batch of FFTs, and its single-qudit gates combined into blocks of
+        block_axes qudits
+
+        :param state: The state tensor
+        :type state: np.ndarray
+        :param moment: The gates of the moment and their state axes
+        :type moment: Iterable[tuple[Instruction, tuple[int]]]
+        :return: The updated state tensor
+        :rtype: np.ndarray
+        """
+        phases = None
+        matrices, axes = list(), list()
+        powers, fourier_axes = list(), list()
+        for gate, targets in moment:
+            if isinstance(gate, FourierGate):
+                powers.extend(gate.powers)
+                fourier_axes.extend(targets)
+            elif self.merge_diagonals and isinstance(gate, DiagonalGate):
+                phase = StateVectorKernels.phase_tensor(
+                    Precision.match(gate.diagonal, state), targets,
+                    self.num_qudits, [self.shape[axis] for axis in targets])
+                phases = phase if phases is None else phases * phase
+            elif isinstance(gate, Gate) and len(targets) == 1:
+                matrices.append(gate.matrix)
+                axes.append(targets[0])
+            else:
+                state = gate.apply(state, targets, inplace=True)
+        if phases is not None:
+            state = self.multiply(state, phases)
+        if powers:
+            state = StateVectorKernels.apply_fourier(state, powers,
+                                                     fourier_axes)
+        if matrices:
+            state = StateVectorKernels.apply_layer(state, matrices, axes,
+                                                   self.block_axes, True)
+        return state
+
+    def run(self, instruction: Instruction, state: np.ndarray = None):
+        """
+        Applies an instruction to a ket
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param state: The ket, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The final ket
+        :rtype: np.ndarray
+        """
+        return self.to_ket(self.evolve(instruction, state))
+
+    def probabilities(self, instruction: Instruction,
+                      qudits: Iterable[int] = None, state: np.ndarray = None):
+        """
+        Gets the probabilities of the measurement outcomes of qudits after an
+        instruction
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param qudits: The measured qudits, defaults to all qudits
+        :type qudits: Iterable[int]
+        :param state: The initial state tensor or ket, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The probabilities as a tensor with one axis per qudit
+        :rtype: np.ndarray
+        """
+        return Measurement.probabilities(self.evolve(instruction, state),
+                                         qudits)
+
+    def sample(self, instruction: Instruction, shots: int,
+               qudits: Iterable[int] = None, seed: int = None,
+               state: np.ndarray = None):
+        """
+        Samples measurement outcomes of qudits after an instruction. The
+        state is evolved once and every shot is drawn from it.
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param shots: The number of samples
+        :type shots: int
+        :param qudits: The measured qudits, defaults to all qudits
+        :type qudits: Iterable[int]
+        :param seed: The seed of the random number generator, defaults to
+            None (unseeded)
+        :type seed: int
+        :param state: The initial state tensor or ket, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The dits of each sample, with one row per sample and one
+            column per measured qudit
+        :rtype: np.ndarray
+        """
+        return Measurement.sample(self.evolve(instruction, state), shots,
+                                  qudits, np.random.default_rng(seed))
+
+    def measure(self, instruction: Instruction, qudits: Iterable[int] = None,
+                seed: int = None, state: np.ndarray = None):
+        """
+        Applies an instruction and then measures qudits, collapsing the state,
+        e.g. for a mid-circuit measurement before the rest of the circuit
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param qudits: The measured qudits, defaults to all qudits
+        :type qudits: Iterable[int]
+        :param seed: The seed of the random number generator, defaults to
+            None (unseeded)
+        :type seed: int
+        :param state: The initial state tensor or ket, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The measured dits and the collapsed state tensor
+        :rtype: tuple[tuple[int], np.ndarray]
+        """
+        return Measurement.measure(self.evolve(instruction, state), qudits,
+                                   np.random.default_rng(seed))
+
+    def expectation(self, instruction: Instruction,
+                    pauli_strings: Iterable[object], state: np.ndarray = None):
+        """
+        Computes the expectation values of Pauli strings after an instruction
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param pauli_strings: The Pauli strings or their labels, e.g. "ZXI"
+        :type pauli_strings: Iterable[PauliString or str]
+        :param state: The initial state tensor or ket, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The expectation value of each Pauli string
+        :rtype: np.ndarray
+        """
+        return Observables.expectation(self.evolve(instruction, state),
+                                       pauli_strings)
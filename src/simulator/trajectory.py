@@ -0,0 +1,446 @@
+"""
+Trajectory Simulator
+
+Simulates noisy instructions by sampling quantum trajectories of pure qudit
+states, in batches of state tensors of shape (B, d_0, ..., d_{n-1}) spread
+across a pool of processes
+
+Author: Alex Lim
+
+Date of Initial Creation: October 19, 2026
+
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Callable, Iterable
+
+import numpy as np
+
+from src.instruction import Instruction
+from src.simulator.channels import KrausChannel
+from src.simulator.kernels import StateVectorKernels
+from src.simulator.statevector import StateVectorSimulator
+
+__author__      = "Alex Lim"
+__credits__     = "Alex Lim"
+__maintainer__  = "Alex Lim"
+
+
+class TrajectoryResult(object):
+    """The running mean of a real observable over sampled trajectories,
+    aggregated batch by batch from the sums of its values and their squares,
+    with normal confidence intervals from the standard error"""
+    __slots__ = ("_total", "_squares", "_trajectories")
+
+    def __init__(self):
+        """
+        Creates a new empty trajectory result
+        """
+        self._total = 0.0
+        self._squares = 0.0
+        self._trajectories = 0
+
+    def update(self, total: np.ndarray, squares: np.ndarray,
+               trajectories: int):
+        """
+        Adds the values of a batch of trajectories to the result
+
+        :param total: The sum of the observable over the batch
+        :type total: np.ndarray
+        :param squares: The sum of the squares of the observable over the
+            batch
+        :type squares: np.ndarray
+        :param trajectories: The number of trajectories of the batch
+        :type trajectories: int
+        """
+        self._total = self._total + total
+        self._squares = self._squares + squares
+        self._trajectories += trajectories
+
+    @property
+    def trajectories(self):
+        """
+        Gets the number of trajectories sampled
+
+        :return: The number of trajectories
+        :rtype: int
+        """
+        return self._trajectories
+
+    @property
+    def mean(self):
+        """
+        Gets the mean of the observable
+
+        :return: The mean
+        :rtype: np.ndarray or float
+        """
+        return self._total / max(self._trajectories, 1)
+
+    @property
+    def stderr(self):
+        """
+        Gets the standard error of the mean of the observable
+
+        :return: The standard error
+        :rtype: np.ndarray or float
+        """
+        if self._trajectories < 2:
+            return np.inf * np.ones_like(self.mean)
+        n = self._trajectories
+        variance = (self._squares - self._total ** 2 / n) / (n - 1)
+        return np.sqrt(np.maximum(variance, 0) / n)
+
+    def halfwidth(self, confidence: float = 0.95):
+        """
+        Gets the half width of the confidence interval of the mean
+
+        :param confidence: The confidence level, defaults to 0.95
+        :type confidence: float
+        :return: The half width
+        :rtype: np.ndarray or float
+        """
+        return NormalDist().inv_cdf((1 + confidence) / 2) * self.stderr
+
+    def interval(self, confidence: float = 0.95):
+        """
+        Gets the confidence interval of the mean
+
+        :param confidence: The confidence level, defaults to 0.95
+        :type confidence: float
+        :return: The lower and upper bounds
+        :rtype: tuple[np.ndarray or float, np.ndarray or float]
+        """
+        halfwidth = self.halfwidth(confidence)
+        return self.mean - halfwidth, self.mean + halfwidth
+
+    def converged(self, tolerance: float = None, confidence: float = 0.95):
+        """
+        Checks if every confidence interval is narrower than a tolerance
+
+        :param tolerance: The largest half width of the confidence intervals,
+            defaults to None (never converged)
+        :type tolerance: float
+        :param confidence: The confidence level, defaults to 0.95
+        :type confidence: float
+        :return: If the result has converged
+        :rtype: bool
+        """
+        return tolerance is not None and self._trajectories > 1 \
+            and bool(np.all(self.halfwidth(confidence) <= tolerance))
+
+    def __repr__(self):
+        return "TrajectoryResult(%s trajectories)" % self._trajectories
+
+
+class TrajectorySimulator(object):
+    """Simulates noisy instructions with quantum trajectories. After each
+    gate a Kraus operator of each noise channel is sampled per trajectory
+    with the probability :math:`‖K_kψ‖^2`, which is read off the reduced
+    density matrix of the channel's qudits, so that the average over
+    trajectories of an observable converges to its value for the density
+    matrix. Batches of trajectories are evolved together as one array with a
+    leading batch axis, each batch drawing from its own child of a
+    SeedSequence so that results do not depend on the number of
+    processes."""
+    def __init__(self, num_qudits: int, dim: int = 3,
+                 noise: KrausChannel = None, batch_size: int = 64,
+                 workers: int = None, fuse_max_qudits: int = 0,
+                 dtype: np.dtype = None):
+        """
+        Creates a new trajectory simulator
+
+        :param num_qudits: The number of qudits
+        :type num_qudits: int
+        :param dim: The dimension of the qudits (ie: qubit=2 and qutrit=3),
+            or the dimension of each qudit for qudits of mixed dimensions,
+            defaults to 3
+        :type dim: int or Iterable[int]
+        :param noise: The single-qudit channel applied after every gate to
+            each of its qudits of the channel's dimension, defaults to None
+            (noiseless)
+        :type noise: KrausChannel
+        :param batch_size: The number of trajectories evolved together,
+            defaults to 64
+        :type batch_size: int
+        :param workers: The number of processes, defaults to the number of
+            CPUs, or 1 to simulate in this process
+        :type workers: int
+        :param fuse_max_qudits: The largest number of qudits of a subcircuit
+            that is applied as a single fused gate, defaults to 0 (never fuse)
+        :type fuse_max_qudits: int
+        :param dtype: The dtype of the states, complex64 or complex128,
+            defaults to Precision.dtype
+        :type dtype: np.dtype
+        :raises ValueError: The noise channel is not a single-qudit channel
+            on qudits of one of the dimensions of the qudits
+        """
+        self.simulator = StateVectorSimulator(
+            num_qudits, dim, merge_diagonals=False,
+            fuse_max_qudits=fuse_max_qudits, dtype=dtype)
+        dims = tuple(sorted(set(self.simulator.register.dims)))
+        if noise is not None \
+                and (len(noise.dims) != 1 or noise.dims[0] not in dims):
+            raise ValueError("the noise channel acts on qudits of dimensions "
+                             "%s, but it must act on a single qudit of one "
+                             "of the dimensions %s" % (noise.dims, dims))
+        self.noise = noise
+        self.batch_size = batch_size
+        self.workers = workers
+
+    @property
+    def num_qudits(self):
+        """
+        Gets the number of qudits
+
+        :return: The number of qudits
+        :rtype: int
+        """
+        return self.simulator.num_qudits
+
+    @property
+    def shape(self):
+        """
+        Gets the shape of the state tensor of a trajectory
+
+        :return: The shape of the state tensor
+        :rtype: tuple[int]
+        """
+        return self.simulator.shape
+
+    @staticmethod
+    def probabilities(states: np.ndarray):
+        """
+        Gets the probabilities of the measurement outcomes of all qudits of
+        each trajectory, the default observable
+
+        :param states: The batch of state tensors
+        :type states: np.ndarray
+        :return: The probabilities, with one row per trajectory
+        :rtype: np.ndarray
+        """
+        return (states.real ** 2 + states.imag ** 2).reshape(len(states), -1)
+
+    @staticmethod
+    def fidelity(states: np.ndarray, ket: np.ndarray = None):
+        """
+        Gets the fidelity :math:`|⟨φ|ψ⟩|^2` of each trajectory with a pure
+        state, e.g. as the observable functools.partial(
+        TrajectorySimulator.fidelity, ket=ideal)
+
+        :param states: The batch of state tensors
+        :type states: np.ndarray
+        :param ket: The pure state as a ket or state tensor
+        :type ket: np.ndarray
+        :return: The fidelity of each trajectory
+        :rtype: np.ndarray
+        """
+        overlaps = states.reshape(len(states), -1) @ np.conj(
+            np.asarray(ket).reshape(-1))
+        return overlaps.real ** 2 + overlaps.imag ** 2
+
+    def gate_noise(self, gate: Instruction, axes: tuple[int]):
+        """
+        Gets the noise channels which follow a gate, i.e. the noise channel
+        on each of the gate's qudits of the channel's dimension. Override to
+        model noise which depends on the gate.
+
+        :param gate: The gate
+        :type gate: Instruction
+        :param axes: The qudits the gate acts on
+        :type axes: tuple[int]
+        :return: The channels and the qudits they act on
+        :rtype: Iterable[tuple[KrausChannel, tuple[int]]]
+        """
+        if self.noise is None:
+            return ()
+        return ((self.noise, (axis,)) for axis in axes
+                if self.simulator.register.dims[axis] == self.noise.dims[0])
+
+    def initial_states(self, batch_size: int, state: np.ndarray = None):
+        """
+        Gets a batch of copies of the initial state
+
+        :param batch_size: The number of trajectories
+        :type batch_size: int
+        :param state: The ket or state tensor, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The batch of state tensors
+        :rtype: np.ndarray
+        """
+        if state is None:
+            state = self.simulator.initial_state()
+        return np.repeat(self.simulator.to_tensor(state)[np.newaxis],
+                         batch_size, axis=0)
+
+    def apply_channel(self, states: np.ndarray, channel: KrausChannel,
+                      axes: Iterable[int], rng: np.random.Generator):
+        """
+        Applies a randomly sampled Kraus operator of a channel to each
+        trajectory of a batch and renormalizes it
+
+        :param states: The batch of state tensors
+        :type states: np.ndarray
+        :param channel: The channel
+        :type channel: KrausChannel
+        :param axes: The qudits the channel acts on
+        :type axes: Iterable[int]
+        :param rng: The random number generator
+        :type rng: np.random.Generator
+        :return: The updated batch of state tensors
+        :rtype: np.ndarray
+        """
+        axes = tuple(axis + 1 for axis in axes)
+        operators = channel.operators
+        if len(operators) == 1:
+            return StateVectorKernels.apply_matrix(states, operators[0], axes)
+        targets = tuple(range(1, len(axes) + 1))
+        size = operators[0].shape[0]
+        moved = np.moveaxis(states, axes, targets).reshape(
+            len(states), size, -1)
+        reduced = np.matmul(moved, np.conj(moved).transpose(0, 2, 1))
+        effects = np.array([k.conj().T @ k for k in operators])
+        weights = np.einsum("kji,bij->bk", effects, reduced).real
+        cumulative = np.cumsum(weights, axis=1)
+        draws = rng.random(len(states)) * cumulative[:, -1]
+        choices = np.minimum((cumulative <= draws[:, np.newaxis]).sum(axis=1),
+                             len(operators) - 1)
+        for k in np.unique(choices):
+            members = np.flatnonzero(choices == k)
+            scale = 1 / np.sqrt(weights[members, k])
+            scale = scale.reshape((-1,) + (1,) * (states.ndim - 1))
+            states[members] = StateVectorKernels.apply_matrix(
+                states[members], operators[k], axes) * scale
+        return states
+
+    def evolve(self, instruction: Instruction, batch_size: int,
+               rng: np.random.Generator, state: np.ndarray = None):
+        """
+        Samples a batch of trajectories of an instruction and its noise
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param batch_size: The number of trajectories
+        :type batch_size: int
+        :param rng: The random number generator or seed
+        :type rng: np.random.Generator or np.random.SeedSequence or int
+        :param state: The initial ket or state tensor, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The batch of final state tensors
+        :rtype: np.ndarray
+        """
+        rng = np.random.default_rng(rng)
+        states = self.initial_states(batch_size, state)
+        pending = dict()
+        for gate, axes in self.simulator.leaves(instruction):
+            for queued in [key for key in pending if set(key) & set(axes)]:
+                states = self.apply_channel(states, pending.pop(queued),
+                                            queued, rng)
+            states = gate.apply(states, tuple(axis + 1 for axis in axes),
+                                inplace=True)
+            for channel, targets in self.gate_noise(gate, axes):
+                targets = tuple(targets)
+                if targets in pending:
+                    pending[targets] = channel.compose(pending[targets])
+                    continue
+                for queued in [key for key in pending
+                               if set(key) & set(targets)]:
+                    states = self.apply_channel(states, pending.pop(queued),
+                                                queued, rng)
+                pending[targets] = channel
+        for axes, channel in pending.items():
+            states = self.apply_channel(states, channel, axes, rng)
+        return states
+
+    def run_batch(self, instruction: Instruction, batch_size: int,
+                  seed: np.random.SeedSequence,
+                  observable: Callable[[np.ndarray], np.ndarray] = None,
+                  state: np.ndarray = None):
+        """
+        Samples a batch of trajectories and sums an observable over them
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param batch_size: The number of trajectories
+        :type batch_size: int
+        :param seed: The seed of the batch
+        :type seed: np.random.SeedSequence
+        :param observable: The real observable of a batch of state tensors,
+            with one row per trajectory, defaults to the probabilities
+        :type observable: Callable[[np.ndarray], np.ndarray]
+        :param state: The initial ket or state tensor, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The sum of the observable and of its square, and the number
+            of trajectories
+        :rtype: tuple[np.ndarray, np.ndarray, int]
+        """
+        if observable is None:
+            observable = TrajectorySimulator.probabilities
+        values = np.asarray(observable(self.evolve(
+            instruction, batch_size, seed, state)), dtype=float)
+        return values.sum(axis=0), (values ** 2).sum(axis=0), batch_size
+
+    def run(self, instruction: Instruction, trajectories: int,
+            observable: Callable[[np.ndarray], np.ndarray] = None,
+            seed: int = None, tolerance: float = None,
+            confidence: float = 0.95, state: np.ndarray = None):
+        """
+        Estimates the mean of an observable over trajectories of an
+        instruction and its noise. Batches are submitted to the process pool
+        a few at a time and aggregated in order, so the run stops early once
+        every confidence interval is narrower than the tolerance, and a
+        seeded run gives the same result for any number of processes.
+
+        :param instruction: An instruction
+        :type instruction: Instruction
+        :param trajectories: The largest number of trajectories
+        :type trajectories: int
+        :param observable: The real observable of a batch of state tensors,
+            with one row per trajectory, which must be picklable, e.g. a
+            module-level function, defaults to the probabilities
+        :type observable: Callable[[np.ndarray], np.ndarray]
+        :param seed: The seed of the random number generators, defaults to
+            None (unseeded)
+        :type seed: int
+        :param tolerance: The largest half width of the confidence intervals
+            at which to stop early, defaults to None (never stop early)
+        :type tolerance: float
+        :param confidence: The confidence level of the intervals, defaults
+            to 0.95
+        :type confidence: float
+        :param state: The initial ket or state tensor, defaults to |0...0⟩
+        :type state: np.ndarray
+        :return: The aggregated result
+        :rtype: TrajectoryResult
+        """
+        sizes = [self.batch_size] * (trajectories // self.batch_size)
+        if trajectories % self.batch_size:
+            sizes.append(trajectories % self.batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        result = TrajectoryResult()
+        if self.workers == 1:
+            for size, child in zip(sizes, seeds):
+                result.update(*self.run_batch(instruction, size, child,
+                                              observable, state))
+                if result.converged(tolerance, confidence):
+                    break
+            return result
+        workers = self.workers or os.cpu_count()
+        with ProcessPoolExecutor(workers) as pool:
+            futures = list()
+            for size, child in zip(sizes, seeds):
+                futures.append(pool.submit(self.run_batch, instruction, size,
+                                           child, observable, state))
+                if len(futures) < 2 * workers:
+                    continue
+                result.update(*futures.pop(0).result())
+                if result.converged(tolerance, confidence):
+                    break
+            else:
+                while futures and not result.converged(tolerance, confidence):
+                    result.update(*futures.pop(0).result())
+            for future in futures:
+                future.cancel()
+        return result